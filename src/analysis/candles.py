@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+ماسح أنماط الشموع اليابانية المتجه
+يحسب الجسم والظلال والنطاق مرة واحدة كمصفوفات وينتج قناعاً منطقياً لكل نمط على كامل السلسلة
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.analysis.codes import PatternCode
+from src.analysis.ohlcv import OHLCV
+
+# ترتيب الأنماط المدعومة (يحدد ترتيب ظهورها في النتائج)
+CANDLESTICK_PATTERNS = (
+    PatternCode.HAMMER,
+    PatternCode.INVERTED_HAMMER,
+    PatternCode.DOJI,
+    PatternCode.SHOOTING_STAR,
+    PatternCode.BULLISH_ENGULFING,
+    PatternCode.BEARISH_ENGULFING,
+    PatternCode.MORNING_STAR,
+    PatternCode.EVENING_STAR,
+)
+
+
+def _shift(values: np.ndarray, periods: int, fill) -> np.ndarray:
+    """إزاحة المصفوفة للأمام بعدد من الشموع مع ملء البداية"""
+    out = np.empty_like(values)
+    out[:periods] = fill
+    out[periods:] = values[:-periods] if periods else values
+    return out
+
+
+class CandleFeatures:
+    """
+    الخصائص المشتقة لكل شمعة (الجسم، الظلال، النطاق، الاتجاه) محسوبة مرة واحدة
+    وأقنعة الأنماط المبنية عليها عند الطلب
+    """
+
+    __slots__ = ('body', 'total_range', 'body_top', 'body_bottom', 'upper_shadow',
+                 'lower_shadow', 'bullish', 'bearish', 'open', 'close', '_patterns')
+
+    def __init__(self, data: OHLCV):
+        """
+        Parameters:
+            data: حاوية OHLCV
+        """
+        self.open = data.open
+        self.close = data.close
+        self.body = np.abs(data.close - data.open)
+        self.total_range = data.high - data.low
+        self.body_top = np.maximum(data.open, data.close)
+        self.body_bottom = np.minimum(data.open, data.close)
+        self.upper_shadow = data.high - self.body_top
+        self.lower_shadow = self.body_bottom - data.low
+        self.bullish = data.close > data.open
+        self.bearish = data.close < data.open
+        self._patterns: Optional[Dict[PatternCode, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self.body)
+
+    @property
+    def patterns(self) -> Dict[PatternCode, np.ndarray]:
+        """أقنعة أنماط الشموع (تُحسب مرة واحدة عند أول طلب)"""
+        if self._patterns is None:
+            self._patterns = _scan(self)
+        return self._patterns
+
+    def last_patterns(self) -> List[PatternCode]:
+        """
+        الأنماط الظاهرة في آخر شمعة
+
+        Returns:
+            List[PatternCode]: رموز الأنماط بترتيب CANDLESTICK_PATTERNS
+        """
+        if not len(self):
+            return []
+        masks = self.patterns
+        return [code for code in CANDLESTICK_PATTERNS if masks[code][-1]]
+
+
+class CandleFeatureCache:
+    """
+    تخزين مؤقت للخصائص المشتقة لكل (زوج، إطار زمني)
+    يُعاد الحساب فقط عند إغلاق شمعة جديدة، ويشارك المحلل الفني ومحلل الأنماط نفس النتيجة
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str], Tuple[tuple, CandleFeatures]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, data: OHLCV, symbol: Optional[str] = None,
+            timeframe: Optional[str] = None) -> CandleFeatures:
+        """
+        الحصول على خصائص الشموع للسلسلة (من التخزين المؤقت إن أمكن)
+
+        Parameters:
+            data: حاوية OHLCV
+            symbol: رمز الزوج (اختياري)
+            timeframe: الإطار الزمني (اختياري)
+
+        Returns:
+            CandleFeatures: الخصائص المشتقة
+        """
+        if not symbol or not timeframe or data.timestamp is None or not len(data):
+            return CandleFeatures(data)
+
+        key = (symbol, timeframe)
+        stamp = (data.timestamp[-1], len(data))
+
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None and entry[0] == stamp:
+            return entry[1]
+
+        features = CandleFeatures(data)
+        with self._lock:
+            self._entries[key] = (stamp, features)
+        return features
+
+    def clear(self):
+        """حذف جميع الخصائص المخزنة"""
+        with self._lock:
+            self._entries.clear()
+
+
+def scan_candlestick_patterns(data: OHLCV) -> Dict[PatternCode, np.ndarray]:
+    """
+    التعرف على جميع أنماط الشموع على كامل السلسلة في تمريرة واحدة
+
+    Parameters:
+        data: حاوية OHLCV
+
+    Returns:
+        Dict[PatternCode, np.ndarray]: قناع منطقي بطول السلسلة لكل نمط في CANDLESTICK_PATTERNS
+    """
+    return CandleFeatures(data).patterns
+
+
+def _scan(features: CandleFeatures) -> Dict[PatternCode, np.ndarray]:
+    """بناء أقنعة الأنماط من الخصائص المشتقة"""
+    open_ = features.open
+    close = features.close
+    body = features.body
+    total_range = features.total_range
+    body_top = features.body_top
+    body_bottom = features.body_bottom
+    upper_shadow = features.upper_shadow
+    lower_shadow = features.lower_shadow
+    bullish = features.bullish
+    bearish = features.bearish
+
+    has_range = total_range > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        small_body = has_range & (body / np.where(has_range, total_range, 1.0) < 0.3)
+
+    masks = {}
+
+    masks[PatternCode.HAMMER] = small_body & (lower_shadow > 2 * body) & (upper_shadow < 0.1 * total_range)
+    masks[PatternCode.DOJI] = has_range & (body <= 0.05 * total_range)
+
+    # الشكل نفسه (ظل علوي طويل) يكون نجمة طلاق بعد اتجاه صاعد (آخر ثلاثة إغلاقات متصاعدة)
+    # ومطرقة مقلوبة فيما عدا ذلك، فلا يظهر النمطان المتعاكسان على نفس الشمعة
+    long_upper = small_body & (upper_shadow > 2 * body) & (lower_shadow < 0.1 * total_range)
+    prior_uptrend = (_shift(close, 1, np.nan) > _shift(close, 2, np.nan)) & \
+                    (_shift(close, 2, np.nan) > _shift(close, 3, np.nan))
+    masks[PatternCode.SHOOTING_STAR] = long_upper & prior_uptrend
+    masks[PatternCode.INVERTED_HAMMER] = long_upper & ~prior_uptrend
+
+    # أنماط الشمعتين
+    prev_open = _shift(open_, 1, np.nan)
+    prev_close = _shift(close, 1, np.nan)
+    prev_bullish = _shift(bullish, 1, False)
+    prev_bearish = _shift(bearish, 1, False)
+
+    masks[PatternCode.BULLISH_ENGULFING] = (prev_bearish & bullish &
+                                            (open_ <= prev_close) & (close >= prev_open))
+    masks[PatternCode.BEARISH_ENGULFING] = (prev_bullish & bearish &
+                                            (open_ >= prev_close) & (close <= prev_open))
+
+    # أنماط الثلاث شموع: الشمعة الأولى (i-2) والوسطى (i-1) والأخيرة (i)
+    first_close = _shift(close, 2, np.nan)
+    first_body = _shift(body, 2, np.nan)
+    first_bullish = _shift(bullish, 2, False)
+    first_bearish = _shift(bearish, 2, False)
+    middle_body = _shift(body, 1, np.nan)
+    middle_top = _shift(body_top, 1, np.nan)
+    middle_bottom = _shift(body_bottom, 1, np.nan)
+    small_middle = middle_body < 0.5 * first_body
+
+    masks[PatternCode.MORNING_STAR] = (first_bearish & small_middle & bullish &
+                                       ((middle_top < first_close) | (middle_bottom > open_)))
+    masks[PatternCode.EVENING_STAR] = (first_bullish & small_middle & bearish &
+                                       ((middle_bottom > first_close) | (middle_top < open_)))
+
+    return masks
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+رموز الإشارات والأنماط المهيكلة
+تُمرر عبر مسار التحليل كقيم رقمية ذات اتجاه ووزن، ويُترك تحويلها إلى نص لمرحلة العرض
+"""
+
+from enum import IntEnum
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+
+
+class Direction(IntEnum):
+    """اتجاه الإشارة أو النمط أو الاتجاه العام"""
+    BEARISH = -1
+    NEUTRAL = 0
+    BULLISH = 1
+
+
+class TrendStrength(IntEnum):
+    """درجة قوة الاتجاه العام"""
+    WEAK = 0
+    MEDIUM = 1
+    STRONG = 2
+
+
+class PatternCode(IntEnum):
+    """رموز الأنماط السعرية المدعومة"""
+    # أنماط الشموع
+    HAMMER = 1
+    INVERTED_HAMMER = 2
+    DOJI = 3
+    SHOOTING_STAR = 4
+    BULLISH_ENGULFING = 5
+    BEARISH_ENGULFING = 6
+    MORNING_STAR = 7
+    EVENING_STAR = 8
+
+    # أنماط الانعكاس
+    HEAD_AND_SHOULDERS = 20
+    INVERSE_HEAD_AND_SHOULDERS = 21
+    DOUBLE_BOTTOM = 22
+    DOUBLE_TOP = 23
+    TRIPLE_BOTTOM = 24
+    TRIPLE_TOP = 25
+
+    # أنماط الاستمرارية
+    FLAG = 40
+    WEDGE = 41
+    ASCENDING_TRIANGLE = 42
+    DESCENDING_TRIANGLE = 43
+    SYMMETRICAL_TRIANGLE = 44
+    RECTANGLE = 45
+
+    @property
+    def direction(self) -> Direction:
+        return _PATTERN_INFO[self][0]
+
+    @property
+    def weight(self) -> int:
+        return _PATTERN_INFO[self][1]
+
+
+class SignalCode(IntEnum):
+    """رموز الإشارات الفنية"""
+    RSI_OVERBOUGHT = 1
+    RSI_OVERSOLD = 2
+    MACD_BULLISH_CROSS_RECENT = 3
+    MACD_BULLISH_CROSS = 4
+    MACD_BEARISH_CROSS_RECENT = 5
+    MACD_BEARISH_CROSS = 6
+    STOCH_OVERSOLD = 7
+    STOCH_OVERBOUGHT = 8
+    STOCH_BULLISH_CROSS = 9
+    STOCH_BEARISH_CROSS = 10
+    BB_ABOVE_UPPER = 11
+    BB_BELOW_LOWER = 12
+    PATTERN_BULLISH = 13
+    PATTERN_BEARISH = 14
+
+    @property
+    def direction(self) -> Direction:
+        return _SIGNAL_INFO[self][0]
+
+    @property
+    def weight(self) -> int:
+        return _SIGNAL_INFO[self][1]
+
+
+# (الاتجاه، الوزن) لكل نمط
+_PATTERN_INFO = {
+    PatternCode.HAMMER: (Direction.BULLISH, 1),
+    PatternCode.INVERTED_HAMMER: (Direction.BULLISH, 1),
+    PatternCode.DOJI: (Direction.NEUTRAL, 1),
+    PatternCode.SHOOTING_STAR: (Direction.BEARISH, 1),
+    PatternCode.BULLISH_ENGULFING: (Direction.BULLISH, 1),
+    PatternCode.BEARISH_ENGULFING: (Direction.BEARISH, 1),
+    PatternCode.MORNING_STAR: (Direction.BULLISH, 1),
+    PatternCode.EVENING_STAR: (Direction.BEARISH, 1),
+    PatternCode.HEAD_AND_SHOULDERS: (Direction.BEARISH, 1),
+    PatternCode.INVERSE_HEAD_AND_SHOULDERS: (Direction.BULLISH, 1),
+    PatternCode.DOUBLE_BOTTOM: (Direction.BULLISH, 1),
+    PatternCode.DOUBLE_TOP: (Direction.BEARISH, 1),
+    PatternCode.TRIPLE_BOTTOM: (Direction.BULLISH, 1),
+    PatternCode.TRIPLE_TOP: (Direction.BEARISH, 1),
+    PatternCode.FLAG: (Direction.NEUTRAL, 1),
+    PatternCode.WEDGE: (Direction.NEUTRAL, 1),
+    PatternCode.ASCENDING_TRIANGLE: (Direction.BULLISH, 1),
+    PatternCode.DESCENDING_TRIANGLE: (Direction.BEARISH, 1),
+    PatternCode.SYMMETRICAL_TRIANGLE: (Direction.NEUTRAL, 1),
+    PatternCode.RECTANGLE: (Direction.NEUTRAL, 1),
+}
+
+# (الاتجاه، الوزن) لكل إشارة
+_SIGNAL_INFO = {
+    SignalCode.RSI_OVERBOUGHT: (Direction.BEARISH, 1),
+    SignalCode.RSI_OVERSOLD: (Direction.BULLISH, 1),
+    SignalCode.MACD_BULLISH_CROSS_RECENT: (Direction.BULLISH, 1),
+    SignalCode.MACD_BULLISH_CROSS: (Direction.BULLISH, 1),
+    SignalCode.MACD_BEARISH_CROSS_RECENT: (Direction.BEARISH, 1),
+    SignalCode.MACD_BEARISH_CROSS: (Direction.BEARISH, 1),
+    SignalCode.STOCH_OVERSOLD: (Direction.BULLISH, 1),
+    SignalCode.STOCH_OVERBOUGHT: (Direction.BEARISH, 1),
+    SignalCode.STOCH_BULLISH_CROSS: (Direction.BULLISH, 1),
+    SignalCode.STOCH_BEARISH_CROSS: (Direction.BEARISH, 1),
+    SignalCode.BB_ABOVE_UPPER: (Direction.NEUTRAL, 1),
+    SignalCode.BB_BELOW_LOWER: (Direction.NEUTRAL, 1),
+    SignalCode.PATTERN_BULLISH: (Direction.BULLISH, 1),
+    SignalCode.PATTERN_BEARISH: (Direction.BEARISH, 1),
+}
+
+
+class Signal(NamedTuple):
+    """إشارة فنية: رمز الإشارة والنمط المصدر (لإشارات الأنماط فقط)"""
+    code: SignalCode
+    pattern: Optional[PatternCode] = None
+
+    @property
+    def direction(self) -> Direction:
+        return self.code.direction
+
+    @property
+    def weight(self) -> int:
+        return self.code.weight
+
+
+class AnalysisSummary(NamedTuple):
+    """
+    ملخص التحليل المحفوظ مع الإشارة: رموز وقيم حالية فقط دون سلاسل المؤشرات،
+    وتُولد منه نصوص المؤشرات والأنماط والتحليل عند العرض
+    """
+    symbol: str
+    timeframe: str
+    candle_stamp: Optional[Tuple[Any, int]]  # (وقت آخر شمعة، عدد الشموع) لمفتاح النصوص المحفوظة
+    trend_direction: Optional[Direction]
+    trend_level: TrendStrength
+    support_levels: Tuple[float, ...]
+    resistance_levels: Tuple[float, ...]
+    pattern_codes: Tuple[PatternCode, ...]  # أنماط الشموع في التحليل الفني
+    detected_patterns: Tuple[PatternCode, ...]  # جميع الأنماط من محلل الأنماط (بما فيها أنماط الرسم)
+    signal_codes: Tuple[Signal, ...]
+    indicators: Dict[str, float]  # القيم الحالية المعروضة (rsi, macd, macd_signal, macd_hist, sma_20, sma_50)
+
+
+def directional_score(items: Iterable, direction: Direction) -> int:
+    """
+    مجموع أوزان العناصر (إشارات أو أنماط) ذات الاتجاه المحدد
+
+    Parameters:
+        items: إشارات أو رموز أنماط
+        direction: الاتجاه المطلوب
+
+    Returns:
+        int: مجموع الأوزان
+    """
+    return sum(item.weight for item in items if item.direction == direction)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+تعريفات مشتركة لقاموس المؤشرات الفنية وسجل المؤشرات وفترات إحمائها
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# أسماء السلاسل الداخلية لكل مؤشر
+SERIES_KEYS = (
+    'sma_20', 'sma_50', 'sma_200', 'ema_20', 'ema_50', 'ema_200',
+    'rsi', 'macd', 'macd_signal', 'macd_hist', 'stoch_k', 'stoch_d',
+    'bb_upper', 'bb_middle', 'bb_lower', 'adx'
+)
+
+
+class IndicatorSpec(NamedTuple):
+    """وصف مؤشر مسجل: السلاسل التي ينتجها وعدد الشموع اللازم لأول قيمة صحيحة"""
+    name: str
+    series: Tuple[str, ...]
+    lookback: int
+
+
+# سجل المؤشرات المدعومة بترتيب الحساب
+INDICATOR_REGISTRY: Dict[str, IndicatorSpec] = {}
+
+
+def register_indicator(name: str, series: Tuple[str, ...], lookback: int) -> IndicatorSpec:
+    """
+    تسجيل مؤشر وفترة إحمائه
+
+    Parameters:
+        name: اسم المؤشر (مثل SMA_200)
+        series: مفاتيح السلاسل التي ينتجها من SERIES_KEYS
+        lookback: عدد الشموع اللازم لأول قيمة صحيحة
+
+    Returns:
+        IndicatorSpec: وصف المؤشر
+    """
+    spec = IndicatorSpec(name, tuple(series), lookback)
+    INDICATOR_REGISTRY[name] = spec
+    return spec
+
+
+for _length in (20, 50, 200):
+    register_indicator(f'SMA_{_length}', (f'sma_{_length}',), _length)
+    register_indicator(f'EMA_{_length}', (f'ema_{_length}',), _length)
+
+# RSI و ADX يعتمدان على الفروقات بين الشموع فيحتاجان شمعة إضافية
+register_indicator('RSI', ('rsi',), 14 + 1)
+# خط الإشارة متوسط أسي لـ 9 قيم من MACD الذي يبدأ عند الشمعة 26
+register_indicator('MACD', ('macd', 'macd_signal', 'macd_hist'), 26 + 9 - 1)
+register_indicator('Stochastic', ('stoch_k', 'stoch_d'), 14 + 3 - 1 + 3 - 1)
+register_indicator('Bollinger', ('bb_upper', 'bb_middle', 'bb_lower'), 20)
+register_indicator('ADX', ('adx',), 14 + 1 + 14 - 1)
+
+
+def resolve_indicators(names: Optional[Iterable[str]] = None) -> List[IndicatorSpec]:
+    """
+    أوصاف المؤشرات المطلوبة (جميع المؤشرات المسجلة افتراضياً)
+
+    Raises:
+        KeyError: إذا كان أحد الأسماء غير مسجل
+    """
+    if names is None:
+        return list(INDICATOR_REGISTRY.values())
+    return [INDICATOR_REGISTRY[name] for name in names]
+
+
+def required_lookback(names: Optional[Iterable[str]] = None) -> int:
+    """
+    أقل عدد من الشموع يكفي لإحماء جميع المؤشرات المطلوبة
+
+    Parameters:
+        names: أسماء المؤشرات النشطة (الافتراضي جميع المؤشرات)
+
+    Returns:
+        int: عدد الشموع
+    """
+    specs = resolve_indicators(names)
+    return max((spec.lookback for spec in specs), default=0)
+
+
+def missing_indicators(length: int, names: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    المؤشرات التي لا تكفي لها الشموع المتاحة (قيمها افتراضية وليست محسوبة)
+
+    Parameters:
+        length: عدد الشموع المتاحة
+        names: أسماء المؤشرات النشطة (الافتراضي جميع المؤشرات)
+
+    Returns:
+        List[str]: أسماء المؤشرات غير الجاهزة
+    """
+    return [spec.name for spec in resolve_indicators(names) if spec.lookback > length]
+
+
+def active_series(names: Optional[Iterable[str]] = None) -> set:
+    """مفاتيح السلاسل التي تنتجها المؤشرات النشطة"""
+    return {key for spec in resolve_indicators(names) for key in spec.series}
+
+
+def build_indicators_dict(series: Dict, current: Dict) -> Dict:
+    """
+    بناء قاموس المؤشرات بالشكل الذي يستهلكه TechnicalAnalyzer
+
+    Parameters:
+        series: قاموس السلاسل الكاملة لكل مفتاح من SERIES_KEYS
+        current: قاموس القيم الأخيرة لكل مفتاح من SERIES_KEYS
+
+    Returns:
+        Dict: قاموس المؤشرات
+    """
+    return {
+        'SMA': {
+            '20': series['sma_20'],
+            '50': series['sma_50'],
+            '200': series['sma_200'],
+            'current': {'20': current['sma_20'], '50': current['sma_50'], '200': current['sma_200']}
+        },
+        'EMA': {
+            '20': series['ema_20'],
+            '50': series['ema_50'],
+            '200': series['ema_200'],
+            'current': {'20': current['ema_20'], '50': current['ema_50'], '200': current['ema_200']}
+        },
+        'RSI': {
+            'values': series['rsi'],
+            'current': current['rsi']
+        },
+        'MACD': {
+            'line': series['macd'],
+            'signal': series['macd_signal'],
+            'histogram': series['macd_hist'],
+            'current': {
+                'line': current['macd'],
+                'signal': current['macd_signal'],
+                'histogram': current['macd_hist']
+            }
+        },
+        'Stochastic': {
+            'k': series['stoch_k'],
+            'd': series['stoch_d'],
+            'current': {'k': current['stoch_k'], 'd': current['stoch_d']}
+        },
+        'Bollinger': {
+            'upper': series['bb_upper'],
+            'middle': series['bb_middle'],
+            'lower': series['bb_lower'],
+            'current': {
+                'upper': current['bb_upper'],
+                'middle': current['bb_middle'],
+                'lower': current['bb_lower']
+            }
+        },
+        'ADX': {
+            'values': series['adx'],
+            'current': current['adx']
+        }
+    }
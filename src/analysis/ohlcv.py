@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+حاوية OHLCV خفيفة للقراءة فقط تعتمد على مصفوفات NumPy
+تمرر عبر مسار التحليل بالكامل دون نسخ البيانات
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# ربط أسماء أعمدة إطار البيانات بخصائص الحاوية
+COLUMN_ATTRS = {
+    'Open': 'open',
+    'High': 'high',
+    'Low': 'low',
+    'Close': 'close',
+    'Volume': 'volume',
+    'Date': 'timestamp',
+}
+
+
+def find_new_rows(timestamps: Optional[np.ndarray], last_timestamp) -> Optional[int]:
+    """
+    تحديد موضع أول شمعة لم تتم معالجتها بعد في سلسلة تمت معالجتها حتى last_timestamp
+
+    البحث يبدأ من النهاية، فالتكلفة تتناسب مع عدد الشموع الجديدة فقط
+
+    Parameters:
+        timestamps: أوقات الشموع في البيانات الحالية (أو None)
+        last_timestamp: وقت آخر شمعة تمت معالجتها (أو None)
+
+    Returns:
+        Optional[int]: موضع البداية (0 يعني إعادة البناء من البداية)، أو None إذا لم تكن هناك شموع جديدة
+    """
+    if timestamps is None or last_timestamp is None or not len(timestamps):
+        return 0
+
+    if timestamps[-1] == last_timestamp:
+        return None
+
+    i = len(timestamps) - 1
+    while i >= 0 and timestamps[i] > last_timestamp:
+        i -= 1
+
+    if i < 0 or timestamps[i] != last_timestamp:
+        return 0
+    return i + 1
+
+
+def _readonly(values: np.ndarray) -> np.ndarray:
+    """إرجاع عرض (view) للقراءة فقط من المصفوفة دون نسخها"""
+    view = values.view()
+    view.flags.writeable = False
+    return view
+
+
+class OHLCV:
+    """
+    حاوية أعمدة OHLCV للقراءة فقط
+
+    جميع الأعمدة مصفوفات NumPy بنفس الطول، والتقطيع (tail، الفهرسة بشرائح)
+    يرجع حاوية جديدة تشير إلى نفس الذاكرة
+    """
+
+    __slots__ = ('open', 'high', 'low', 'close', 'volume', 'timestamp')
+
+    def __init__(self, open: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                 volume: Optional[np.ndarray] = None, timestamp: Optional[np.ndarray] = None):
+        """
+        Parameters:
+            open: أسعار الافتتاح
+            high: أعلى الأسعار
+            low: أدنى الأسعار
+            close: أسعار الإغلاق
+            volume: الأحجام (اختياري، أصفار افتراضياً)
+            timestamp: أوقات الشموع (اختياري)
+        """
+        self.open = _readonly(np.asarray(open, dtype=float))
+        self.high = _readonly(np.asarray(high, dtype=float))
+        self.low = _readonly(np.asarray(low, dtype=float))
+        self.close = _readonly(np.asarray(close, dtype=float))
+        if volume is None:
+            volume = np.zeros(len(self.close))
+        self.volume = _readonly(np.asarray(volume, dtype=float))
+        self.timestamp = _readonly(np.asarray(timestamp)) if timestamp is not None else None
+
+    @classmethod
+    def from_dataframe(cls, data: pd.DataFrame) -> 'OHLCV':
+        """
+        إنشاء حاوية من إطار بيانات OHLCV
+
+        الأعمدة الرقمية من نوع float64 تُقرأ كعروض على ذاكرة الإطار دون نسخ
+
+        Parameters:
+            data: إطار بيانات يحتوي على Open/High/Low/Close وربما Volume و Date
+
+        Returns:
+            OHLCV: الحاوية
+        """
+        for col in ('Open', 'High', 'Low', 'Close'):
+            if col not in data.columns:
+                raise KeyError(f"عمود {col} غير موجود في البيانات")
+
+        return cls(
+            data['Open'].to_numpy(dtype=float),
+            data['High'].to_numpy(dtype=float),
+            data['Low'].to_numpy(dtype=float),
+            data['Close'].to_numpy(dtype=float),
+            data['Volume'].to_numpy(dtype=float) if 'Volume' in data.columns else None,
+            data['Date'].to_numpy() if 'Date' in data.columns else None,
+        )
+
+    @classmethod
+    def from_any(cls, data) -> 'OHLCV':
+        """
+        تحويل البيانات إلى حاوية OHLCV (بدون تكلفة إذا كانت حاوية مسبقاً)
+
+        Parameters:
+            data: حاوية OHLCV أو إطار بيانات
+
+        Returns:
+            OHLCV: الحاوية
+        """
+        if isinstance(data, cls):
+            return data
+        return cls.from_dataframe(data)
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def __getitem__(self, key):
+        """
+        الوصول إلى عمود بالاسم (مثل data['Close']) أو تقطيع الشموع بشريحة
+        """
+        if isinstance(key, slice):
+            return OHLCV(
+                self.open[key], self.high[key], self.low[key], self.close[key], self.volume[key],
+                self.timestamp[key] if self.timestamp is not None else None
+            )
+        return getattr(self, COLUMN_ATTRS[key])
+
+    @property
+    def columns(self):
+        """أسماء الأعمدة المتاحة"""
+        return [name for name, attr in COLUMN_ATTRS.items() if getattr(self, attr) is not None]
+
+    def tail(self, n: int) -> 'OHLCV':
+        """آخر n شمعة كعرض على نفس الذاكرة"""
+        if n <= 0:
+            return self[0:0]
+        return self[-n:]
+
+    def row(self, i: int) -> Dict[str, float]:
+        """
+        قراءة شمعة واحدة كقاموس قيم عادية (بدون إنشاء كائنات Series)
+
+        Parameters:
+            i: موضع الشمعة (يدعم الفهرسة السالبة)
+
+        Returns:
+            Dict[str, float]: قاموس Open/High/Low/Close/Volume
+        """
+        return {
+            'Open': float(self.open[i]),
+            'High': float(self.high[i]),
+            'Low': float(self.low[i]),
+            'Close': float(self.close[i]),
+            'Volume': float(self.volume[i]),
+        }
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """تحويل الحاوية إلى إطار بيانات (ينسخ البيانات)"""
+        data = {name: getattr(self, attr) for name, attr in COLUMN_ATTRS.items()
+                if getattr(self, attr) is not None}
+        return pd.DataFrame(data)
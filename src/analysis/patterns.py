@@ -1,332 +1,348 @@
-#!/usr/bin/env python
-# -*- coding: utf-8 -*-
-"""
-وحدة متخصصة للتعرف على الأنماط السعرية
-"""
-
-import logging
-import numpy as np
-import pandas as pd
-from typing import List, Dict, Optional, Tuple
-
-logger = logging.getLogger(__name__)
-
-class PatternRecognizer:
-    """فئة متخصصة للتعرف على الأنماط السعرية"""
-    
-    def __init__(self):
-        """تهيئة محلل الأنماط"""
-        logger.info("تهيئة محلل الأنماط السعرية")
-    
-    def identify_all_patterns(self, data: pd.DataFrame) -> List[str]:
-        """
-        التعرف على جميع الأنماط المدعومة في البيانات
-        
-        Parameters:
-            data: إطار بيانات OHLCV
-        
-        Returns:
-            List[str]: قائمة بالأنماط المكتشفة
-        """
-        if data is None or len(data) < 5:
-            logger.warning("بيانات غير كافية للتعرف على الأنماط")
-            return []
-        
-        patterns = []
-        
-        try:
-            # أنماط الشموع الفردية
-            patterns.extend(self.identify_candlestick_patterns(data))
-            
-            # أنماط الانعكاس
-            patterns.extend(self.identify_reversal_patterns(data))
-            
-            # أنماط الاستمرارية
-            patterns.extend(self.identify_continuation_patterns(data))
-            
-            return patterns
-            
-        except Exception as e:
-            logger.error(f"خطأ أثناء التعرف على الأنماط: {str(e)}")
-            return []
-    
-    def identify_candlestick_patterns(self, data: pd.DataFrame) -> List[str]:
-        """
-        التعرف على أنماط الشموع الفردية
-        
-        Parameters:
-            data: إطار بيانات OHLCV
-        
-        Returns:
-            List[str]: قائمة بأنماط الشموع المكتشفة
-        """
-        patterns = []
-        
-        try:
-            # استخدام آخر 5 شموع للتحليل
-            recent_data = data.tail(5).copy()
-            
-            # نمط المطرقة
-            if self._is_hammer(recent_data.iloc[-1]):
-                patterns.append("نمط المطرقة")
-            
-            # نمط المطرقة المقلوبة
-            if self._is_inverted_hammer(recent_data.iloc[-1]):
-                patterns.append("نمط المطرقة المقلوبة")
-            
-            # نمط دوجي
-            if self._is_doji(recent_data.iloc[-1]):
-                patterns.append("نمط دوجي")
-            
-            # نمط نجمة الطلاق
-            if len(recent_data) >= 3 and self._is_shooting_star(recent_data.iloc[-1]):
-                patterns.append("نمط نجمة الطلاق")
-            
-            # نمط ابتلاع
-            if len(recent_data) >= 2:
-                if self._is_bullish_engulfing(recent_data.iloc[-2], recent_data.iloc[-1]):
-                    patterns.append("نمط ابتلاع صاعد")
-                elif self._is_bearish_engulfing(recent_data.iloc[-2], recent_data.iloc[-1]):
-                    patterns.append("نمط ابتلاع هابط")
-            
-            # نمط النجمة
-            if len(recent_data) >= 3:
-                if self._is_morning_star(recent_data.iloc[-3], recent_data.iloc[-2], recent_data.iloc[-1]):
-                    patterns.append("نمط نجمة الصباح")
-                elif self._is_evening_star(recent_data.iloc[-3], recent_data.iloc[-2], recent_data.iloc[-1]):
-                    patterns.append("نمط نجمة المساء")
-            
-            return patterns
-            
-        except Exception as e:
-            logger.error(f"خطأ أثناء التعرف على أنماط الشموع: {str(e)}")
-            return []
-    
-    def identify_reversal_patterns(self, data: pd.DataFrame) -> List[str]:
-        """
-        التعرف على أنماط الانعكاس
-        
-        Parameters:
-            data: إطار بيانات OHLCV
-        
-        Returns:
-            List[str]: قائمة بأنماط الانعكاس المكتشفة
-        """
-        patterns = []
-        
-        try:
-            # نحتاج إلى عدد كافي من البيانات للتعرف على الأنماط
-            if len(data) < 20:
-                return []
-            
-            # نمط الرأس والكتفين
-            if self._is_head_and_shoulders(data):
-                patterns.append("نمط الرأس والكتفين")
-            
-            # نمط الرأس والكتفين المقلوب
-            if self._is_inverse_head_and_shoulders(data):
-                patterns.append("نمط الرأس والكتفين المقلوب")
-            
-            # نمط القاع المزدوج
-            if self._is_double_bottom(data):
-                patterns.append("نمط القاع المزدوج")
-            
-            # نمط القمة المزدوجة
-            if self._is_double_top(data):
-                patterns.append("نمط القمة المزدوجة")
-            
-            # نمط القاع الثلاثي
-            if self._is_triple_bottom(data):
-                patterns.append("نمط القاع الثلاثي")
-            
-            # نمط القمة الثلاثية
-            if self._is_triple_top(data):
-                patterns.append("نمط القمة الثلاثية")
-            
-            return patterns
-            
-        except Exception as e:
-            logger.error(f"خطأ أثناء التعرف على أنماط الانعكاس: {str(e)}")
-            return []
-    
-    def identify_continuation_patterns(self, data: pd.DataFrame) -> List[str]:
-        """
-        التعرف على أنماط الاستمرارية
-        
-        Parameters:
-            data: إطار بيانات OHLCV
-        
-        Returns:
-            List[str]: قائمة بأنماط الاستمرارية المكتشفة
-        """
-        patterns = []
-        
-        try:
-            # نحتاج إلى عدد كافي من البيانات للتعرف على الأنماط
-            if len(data) < 20:
-                return []
-            
-            # نمط العلم
-            if self._is_flag(data):
-                patterns.append("نمط العلم")
-            
-            # نمط الوتد
-            if self._is_wedge(data):
-                patterns.append("نمط الوتد")
-            
-            # نمط المثلث
-            triangle_type = self._identify_triangle(data)
-            if triangle_type:
-                patterns.append(f"نمط المثلث {triangle_type}")
-            
-            # نمط المستطيل
-            if self._is_rectangle(data):
-                patterns.append("نمط المستطيل")
-            
-            return patterns
-            
-        except Exception as e:
-            logger.error(f"خطأ أثناء التعرف على أنماط الاستمرارية: {str(e)}")
-            return []
-    
-    # طرق مساعدة للتعرف على أنماط الشموع الفردية
-    
-    def _is_hammer(self, candle):
-        """التحقق من نمط المطرقة"""
-        body_size = abs(candle['Close'] - candle['Open'])
-        total_range = candle['High'] - candle['Low']
-        
-        if total_range == 0:
-            return False
-            
-        body_to_range_ratio = body_size / total_range if total_range > 0 else 0
-        
-        lower_shadow = min(candle['Open'], candle['Close']) - candle['Low']
-        upper_shadow = candle['High'] - max(candle['Open'], candle['Close'])
-        
-        return (body_to_range_ratio < 0.3 and 
-                lower_shadow > 2 * body_size and 
-                upper_shadow < 0.1 * total_range)
-    
-    def _is_inverted_hammer(self, candle):
-        """التحقق من نمط المطرقة المقلوبة"""
-        body_size = abs(candle['Close'] - candle['Open'])
-        total_range = candle['High'] - candle['Low']
-        
-        if total_range == 0:
-            return False
-            
-        body_to_range_ratio = body_size / total_range
-        
-        lower_shadow = min(candle['Open'], candle['Close']) - candle['Low']
-        upper_shadow = candle['High'] - max(candle['Open'], candle['Close'])
-        
-        return (body_to_range_ratio < 0.3 and 
-                upper_shadow > 2 * body_size and 
-                lower_shadow < 0.1 * total_range)
-    
-    def _is_doji(self, candle):
-        """التحقق من نمط دوجي"""
-        body_size = abs(candle['Close'] - candle['Open'])
-        total_range = candle['High'] - candle['Low']
-        
-        if total_range == 0:
-            return False
-            
-        return body_size <= 0.05 * total_range
-    
-    def _is_shooting_star(self, candle):
-        """التحقق من نمط نجمة الطلاق"""
-        body_size = abs(candle['Close'] - candle['Open'])
-        total_range = candle['High'] - candle['Low']
-        
-        if total_range == 0:
-            return False
-            
-        body_to_range_ratio = body_size / total_range
-        
-        lower_shadow = min(candle['Open'], candle['Close']) - candle['Low']
-        upper_shadow = candle['High'] - max(candle['Open'], candle['Close'])
-        
-        return (candle['Close'] < candle['Open'] and  # هابطة
-                body_to_range_ratio < 0.3 and 
-                upper_shadow > 2 * body_size and 
-                lower_shadow < 0.1 * total_range)
-    
-    def _is_bullish_engulfing(self, candle1, candle2):
-        """التحقق من نمط الابتلاع الصاعد"""
-        return (candle1['Close'] < candle1['Open'] and  # الشمعة الأولى هابطة
-                candle2['Close'] > candle2['Open'] and  # الشمعة الثانية صاعدة
-                candle2['Open'] <= candle1['Close'] and 
-                candle2['Close'] >= candle1['Open'])
-    
-    def _is_bearish_engulfing(self, candle1, candle2):
-        """التحقق من نمط الابتلاع الهابط"""
-        return (candle1['Close'] > candle1['Open'] and  # الشمعة الأولى صاعدة
-                candle2['Close'] < candle2['Open'] and  # الشمعة الثانية هابطة
-                candle2['Open'] >= candle1['Close'] and 
-                candle2['Close'] <= candle1['Open'])
-    
-    def _is_morning_star(self, candle1, candle2, candle3):
-        """التحقق من نمط نجمة الصباح"""
-        # تنفيذ منطق التحقق من نمط نجمة الصباح
-        # (تفاصيل التنفيذ مماثلة لما في ملف technical.py)
-        return False
-    
-    def _is_evening_star(self, candle1, candle2, candle3):
-        """التحقق من نمط نجمة المساء"""
-        # تنفيذ منطق التحقق من نمط نجمة المساء
-        # (تفاصيل التنفيذ مماثلة لما في ملف technical.py)
-        return False
-    
-    # طرق مساعدة للتعرف على أنماط الانعكاس والاستمرارية
-    
-    def _is_head_and_shoulders(self, data):
-        """التحقق من نمط الرأس والكتفين"""
-        # (تنفيذ مبسط للتوضيح)
-        return False
-    
-    def _is_inverse_head_and_shoulders(self, data):
-        """التحقق من نمط الرأس والكتفين المقلوب"""
-        # (تنفيذ مبسط للتوضيح)
-        return False
-    
-    def _is_double_bottom(self, data):
-        """التحقق من نمط القاع المزدوج"""
-        # (تنفيذ مبسط للتوضيح)
-        return False
-    
-    def _is_double_top(self, data):
-        """التحقق من نمط القمة المزدوجة"""
-        # (تنفيذ مبسط للتوضيح)
-        return False
-    
-    def _is_triple_bottom(self, data):
-        """التحقق من نمط القاع الثلاثي"""
-        # (تنفيذ مبسط للتوضيح)
-        return False
-    
-    def _is_triple_top(self, data):
-        """التحقق من نمط القمة الثلاثية"""
-        # (تنفيذ مبسط للتوضيح)
-        return False
-    
-    def _is_flag(self, data):
-        """التحقق من نمط العلم"""
-        # (تنفيذ مبسط للتوضيح)
-        return False
-    
-    def _is_wedge(self, data):
-        """التحقق من نمط الوتد"""
-        # (تنفيذ مبسط للتوضيح)
-        return False
-    
-    def _identify_triangle(self, data):
-        """التعرف على نوع المثلث (صاعد، هابط، متماثل)"""
-        # (تنفيذ مبسط للتوضيح)
-        return None
-    
-    def _is_rectangle(self, data):
-        """التحقق من نمط المستطيل"""
-        # (تنفيذ مبسط للتوضيح)
-        return False
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+وحدة متخصصة للتعرف على الأنماط السعرية
+"""
+
+import logging
+import numpy as np
+import pandas as pd
+from typing import List, Dict, Optional, Tuple, Union
+
+from src.analysis.candles import CANDLESTICK_PATTERNS, CandleFeatureCache
+from src.analysis.codes import PatternCode
+from src.analysis.ohlcv import OHLCV
+from src.analysis.swings import SWING_HIGH, SWING_LOW, SwingIndex, SwingIndexStore, SwingPoint
+
+logger = logging.getLogger(__name__)
+
+class PatternRecognizer:
+    """فئة متخصصة للتعرف على الأنماط السعرية"""
+    
+    def __init__(self, feature_cache: Optional[CandleFeatureCache] = None):
+        """
+        تهيئة محلل الأنماط
+        
+        Parameters:
+            feature_cache: تخزين مؤقت لخصائص الشموع مشترك مع المحلل الفني (اختياري)
+        """
+        logger.info("تهيئة محلل الأنماط السعرية")
+        self.feature_cache = feature_cache or CandleFeatureCache()
+        
+        # فهارس نقاط التأرجح لكل سلسلة لأنماط الانعكاس والاستمرارية
+        self.swing_indexes = SwingIndexStore()
+    
+    def identify_all_patterns(self, data: Union[pd.DataFrame, OHLCV], symbol: Optional[str] = None,
+                              timeframe: Optional[str] = None) -> List[PatternCode]:
+        """
+        التعرف على جميع الأنماط المدعومة في البيانات
+        
+        Parameters:
+            data: حاوية OHLCV أو إطار بيانات
+            symbol: رمز الزوج (اختياري، لمشاركة خصائص الشموع المخزنة)
+            timeframe: الإطار الزمني (اختياري)
+        
+        Returns:
+            List[PatternCode]: رموز الأنماط المكتشفة
+        """
+        if data is None or len(data) < 5:
+            logger.warning("بيانات غير كافية للتعرف على الأنماط")
+            return []
+        
+        patterns = []
+        
+        try:
+            # عرض البيانات مرة واحدة دون نسخ وتمريره لجميع المراحل
+            data = OHLCV.from_any(data)
+            
+            # أنماط الشموع الفردية
+            patterns.extend(self.identify_candlestick_patterns(data, symbol, timeframe))
+            
+            # أنماط الانعكاس
+            patterns.extend(self.identify_reversal_patterns(data, symbol, timeframe))
+            
+            # أنماط الاستمرارية
+            patterns.extend(self.identify_continuation_patterns(data, symbol, timeframe))
+            
+            return patterns
+            
+        except Exception as e:
+            logger.error(f"خطأ أثناء التعرف على الأنماط: {str(e)}")
+            return []
+    
+    def identify_candlestick_patterns(self, data: Union[pd.DataFrame, OHLCV], symbol: Optional[str] = None,
+                                      timeframe: Optional[str] = None) -> List[PatternCode]:
+        """
+        التعرف على أنماط الشموع الفردية في آخر شمعة
+        
+        Parameters:
+            data: حاوية OHLCV أو إطار بيانات
+            symbol: رمز الزوج (اختياري)
+            timeframe: الإطار الزمني (اختياري)
+        
+        Returns:
+            List[PatternCode]: رموز أنماط الشموع المكتشفة
+        """
+        try:
+            features = self.feature_cache.get(OHLCV.from_any(data), symbol, timeframe)
+            return features.last_patterns()
+            
+        except Exception as e:
+            logger.error(f"خطأ أثناء التعرف على أنماط الشموع: {str(e)}")
+            return []
+    
+    def scan_candlestick_history(self, data: Union[pd.DataFrame, OHLCV], symbol: Optional[str] = None,
+                                 timeframe: Optional[str] = None) -> Dict[PatternCode, np.ndarray]:
+        """
+        التعرف على أنماط الشموع على كامل السلسلة (للإحصائيات والاختبار الرجعي)
+        
+        Parameters:
+            data: حاوية OHLCV أو إطار بيانات
+            symbol: رمز الزوج (اختياري)
+            timeframe: الإطار الزمني (اختياري)
+        
+        Returns:
+            Dict[PatternCode, np.ndarray]: قناع منطقي بطول السلسلة لكل نمط
+        """
+        try:
+            return self.feature_cache.get(OHLCV.from_any(data), symbol, timeframe).patterns
+        except Exception as e:
+            logger.error(f"خطأ أثناء مسح أنماط الشموع التاريخية: {str(e)}")
+            return {}
+    
+    def find_candlestick_occurrences(self, data: Union[pd.DataFrame, OHLCV]) -> List[Tuple[int, PatternCode]]:
+        """
+        قائمة مواضع ظهور أنماط الشموع في السلسلة بالترتيب الزمني
+        
+        Parameters:
+            data: حاوية OHLCV أو إطار بيانات
+        
+        Returns:
+            List[Tuple[int, PatternCode]]: قائمة (موضع الشمعة، رمز النمط)
+        """
+        masks = self.scan_candlestick_history(data)
+        occurrences = []
+        for code in CANDLESTICK_PATTERNS:
+            if code in masks:
+                for index in np.flatnonzero(masks[code]):
+                    occurrences.append((int(index), code))
+        occurrences.sort(key=lambda item: item[0])
+        return occurrences
+    
+    def identify_reversal_patterns(self, data: Union[pd.DataFrame, OHLCV], symbol: Optional[str] = None,
+                                 timeframe: Optional[str] = None) -> List[PatternCode]:
+        """
+        التعرف على أنماط الانعكاس من آخر نقاط التأرجح
+        
+        Parameters:
+            data: حاوية OHLCV أو إطار بيانات
+            symbol: رمز الزوج (اختياري، لتحديث فهرس التأرجح تدريجياً)
+            timeframe: الإطار الزمني (اختياري)
+        
+        Returns:
+            List[PatternCode]: رموز أنماط الانعكاس المكتشفة
+        """
+        patterns = []
+        
+        try:
+            # نحتاج إلى عدد كافي من البيانات للتعرف على الأنماط
+            if len(data) < 20:
+                return []
+            
+            swings = self.swing_indexes.get(OHLCV.from_any(data), symbol, timeframe)
+            
+            # نمط الرأس والكتفين
+            if self._is_head_and_shoulders(swings):
+                patterns.append(PatternCode.HEAD_AND_SHOULDERS)
+            
+            # نمط الرأس والكتفين المقلوب
+            if self._is_inverse_head_and_shoulders(swings):
+                patterns.append(PatternCode.INVERSE_HEAD_AND_SHOULDERS)
+            
+            # نمط القاع المزدوج
+            if self._is_double_bottom(swings):
+                patterns.append(PatternCode.DOUBLE_BOTTOM)
+            
+            # نمط القمة المزدوجة
+            if self._is_double_top(swings):
+                patterns.append(PatternCode.DOUBLE_TOP)
+            
+            # نمط القاع الثلاثي
+            if self._is_triple_bottom(swings):
+                patterns.append(PatternCode.TRIPLE_BOTTOM)
+            
+            # نمط القمة الثلاثية
+            if self._is_triple_top(swings):
+                patterns.append(PatternCode.TRIPLE_TOP)
+            
+            return patterns
+            
+        except Exception as e:
+            logger.error(f"خطأ أثناء التعرف على أنماط الانعكاس: {str(e)}")
+            return []
+    
+    def identify_continuation_patterns(self, data: Union[pd.DataFrame, OHLCV], symbol: Optional[str] = None,
+                                       timeframe: Optional[str] = None) -> List[PatternCode]:
+        """
+        التعرف على أنماط الاستمرارية من آخر نقاط التأرجح
+        
+        Parameters:
+            data: حاوية OHLCV أو إطار بيانات
+            symbol: رمز الزوج (اختياري، لتحديث فهرس التأرجح تدريجياً)
+            timeframe: الإطار الزمني (اختياري)
+        
+        Returns:
+            List[PatternCode]: رموز أنماط الاستمرارية المكتشفة
+        """
+        patterns = []
+        
+        try:
+            # نحتاج إلى عدد كافي من البيانات للتعرف على الأنماط
+            if len(data) < 20:
+                return []
+            
+            swings = self.swing_indexes.get(OHLCV.from_any(data), symbol, timeframe)
+            
+            # نمط العلم
+            if self._is_flag(swings):
+                patterns.append(PatternCode.FLAG)
+            
+            # نمط الوتد
+            if self._is_wedge(swings):
+                patterns.append(PatternCode.WEDGE)
+            
+            # نمط المثلث
+            triangle = self._identify_triangle(swings)
+            if triangle is not None:
+                patterns.append(triangle)
+            
+            # نمط المستطيل
+            if self._is_rectangle(swings):
+                patterns.append(PatternCode.RECTANGLE)
+            
+            return patterns
+            
+        except Exception as e:
+            logger.error(f"خطأ أثناء التعرف على أنماط الاستمرارية: {str(e)}")
+            return []
+    
+    # طرق مساعدة للتعرف على أنماط الانعكاس والاستمرارية
+    # جميعها استعلامات على آخر بضع نقاط تأرجح، فلا تعتمد تكلفتها على طول النافذة
+    
+    def _recent_pivots(self, swings: SwingIndex, kinds: Tuple[int, ...]) -> Optional[List[SwingPoint]]:
+        """آخر نقاط التأرجح إذا طابقت تسلسل الأنواع المطلوب (قمة/قاع)"""
+        points = swings.last(len(kinds))
+        if len(points) < len(kinds) or tuple(p.kind for p in points) != kinds:
+            return None
+        return points
+    
+    def _similar(self, swings: SwingIndex, *prices: float, factor: float = 1.0) -> bool:
+        """هل الأسعار متقاربة ضمن نصف عتبة التأرجح (مضروبة في factor)؟"""
+        mean = sum(prices) / len(prices)
+        return (max(prices) - min(prices)) <= 0.5 * swings.threshold * factor * abs(mean)
+    
+    def _is_head_and_shoulders(self, swings):
+        """التحقق من نمط الرأس والكتفين"""
+        points = self._recent_pivots(swings, (SWING_HIGH, SWING_LOW, SWING_HIGH, SWING_LOW, SWING_HIGH))
+        if not points:
+            return False
+        left, neck1, head, neck2, right = (p.price for p in points)
+        return (head > max(left, right) * (1 + 0.5 * swings.threshold) and
+                self._similar(swings, left, right, factor=2) and
+                self._similar(swings, neck1, neck2, factor=2))
+    
+    def _is_inverse_head_and_shoulders(self, swings):
+        """التحقق من نمط الرأس والكتفين المقلوب"""
+        points = self._recent_pivots(swings, (SWING_LOW, SWING_HIGH, SWING_LOW, SWING_HIGH, SWING_LOW))
+        if not points:
+            return False
+        left, neck1, head, neck2, right = (p.price for p in points)
+        return (head < min(left, right) * (1 - 0.5 * swings.threshold) and
+                self._similar(swings, left, right, factor=2) and
+                self._similar(swings, neck1, neck2, factor=2))
+    
+    def _is_double_bottom(self, swings):
+        """التحقق من نمط القاع المزدوج"""
+        points = self._recent_pivots(swings, (SWING_LOW, SWING_HIGH, SWING_LOW))
+        if not points or self._is_triple_bottom(swings):
+            return False
+        return self._similar(swings, points[0].price, points[2].price)
+    
+    def _is_double_top(self, swings):
+        """التحقق من نمط القمة المزدوجة"""
+        points = self._recent_pivots(swings, (SWING_HIGH, SWING_LOW, SWING_HIGH))
+        if not points or self._is_triple_top(swings):
+            return False
+        return self._similar(swings, points[0].price, points[2].price)
+    
+    def _is_triple_bottom(self, swings):
+        """التحقق من نمط القاع الثلاثي"""
+        points = self._recent_pivots(swings, (SWING_LOW, SWING_HIGH, SWING_LOW, SWING_HIGH, SWING_LOW))
+        if not points:
+            return False
+        return self._similar(swings, points[0].price, points[2].price, points[4].price)
+    
+    def _is_triple_top(self, swings):
+        """التحقق من نمط القمة الثلاثية"""
+        points = self._recent_pivots(swings, (SWING_HIGH, SWING_LOW, SWING_HIGH, SWING_LOW, SWING_HIGH))
+        if not points:
+            return False
+        return self._similar(swings, points[0].price, points[2].price, points[4].price)
+    
+    def _last_highs_lows(self, swings):
+        """آخر قمتين وآخر قاعين من آخر أربع نقاط تأرجح"""
+        points = swings.last(4)
+        if len(points) < 4:
+            return None
+        highs = [p.price for p in points if p.is_high]
+        lows = [p.price for p in points if not p.is_high]
+        return highs, lows
+    
+    def _is_flag(self, swings):
+        """التحقق من نمط العلم: حركة قوية (السارية) يليها تماسك ضيق عكس الاتجاه"""
+        points = swings.last(4)
+        if len(points) < 4:
+            return False
+        start, pole_end, pullback, last = (p.price for p in points)
+        pole = abs(pole_end - start)
+        consolidation = max(abs(pullback - pole_end), abs(last - pullback))
+        return (pole >= 2 * swings.threshold * abs(start) and
+                consolidation <= 0.5 * pole)
+    
+    def _is_wedge(self, swings):
+        """التحقق من نمط الوتد: قمم وقيعان في نفس الاتجاه مع تضيق النطاق"""
+        pairs = self._last_highs_lows(swings)
+        if pairs is None:
+            return False
+        (h1, h2), (l1, l2) = pairs
+        if self._similar(swings, h1, h2) or self._similar(swings, l1, l2):
+            return False
+        rising = h2 > h1 and l2 > l1
+        falling = h2 < h1 and l2 < l1
+        converging = (h2 - l2) < (h1 - l1)
+        return (rising or falling) and converging
+    
+    def _identify_triangle(self, swings):
+        """التعرف على نوع المثلث (صاعد، هابط، متماثل) كرمز نمط"""
+        pairs = self._last_highs_lows(swings)
+        if pairs is None:
+            return None
+        (h1, h2), (l1, l2) = pairs
+        highs_flat = self._similar(swings, h1, h2)
+        lows_flat = self._similar(swings, l1, l2)
+        
+        if highs_flat and not lows_flat and l2 > l1:
+            return PatternCode.ASCENDING_TRIANGLE
+        if lows_flat and not highs_flat and h2 < h1:
+            return PatternCode.DESCENDING_TRIANGLE
+        if not highs_flat and not lows_flat and h2 < h1 and l2 > l1:
+            return PatternCode.SYMMETRICAL_TRIANGLE
+        return None
+    
+    def _is_rectangle(self, swings):
+        """التحقق من نمط المستطيل: قمم متساوية وقيعان متساوية"""
+        pairs = self._last_highs_lows(swings)
+        if pairs is None:
+            return False
+        (h1, h2), (l1, l2) = pairs
+        return self._similar(swings, h1, h2) and self._similar(swings, l1, l2)
@@ -0,0 +1,296 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+تحويل رموز الاتجاه والأنماط والإشارات إلى نصوص عربية للعرض
+النصوص تُولد عند الحاجة فقط وتُحفظ لكل (زوج، إطار زمني، شمعة)
+"""
+
+import logging
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+
+from src.analysis.codes import (
+    AnalysisSummary, Direction, PatternCode, Signal, SignalCode, TrendStrength, directional_score
+)
+from src.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# الحد الأقصى لعدد النصوص المحفوظة (يُحذف الأقدم استخداماً)
+MAX_RENDERED_TEXTS = 1024
+
+# أسماء الأنماط المعروضة للمستخدم
+PATTERN_TEXTS = {
+    PatternCode.HAMMER: "نمط المطرقة (Hammer)",
+    PatternCode.INVERTED_HAMMER: "نمط المطرقة المقلوبة (Inverted Hammer)",
+    PatternCode.DOJI: "نمط دوجي (Doji)",
+    PatternCode.SHOOTING_STAR: "نمط نجمة الطلاق (Shooting Star)",
+    PatternCode.BULLISH_ENGULFING: "نمط الابتلاع الصاعد (Bullish Engulfing)",
+    PatternCode.BEARISH_ENGULFING: "نمط الابتلاع الهابط (Bearish Engulfing)",
+    PatternCode.MORNING_STAR: "نمط نجمة الصباح (Morning Star)",
+    PatternCode.EVENING_STAR: "نمط نجمة المساء (Evening Star)",
+    PatternCode.HEAD_AND_SHOULDERS: "نمط الرأس والكتفين",
+    PatternCode.INVERSE_HEAD_AND_SHOULDERS: "نمط الرأس والكتفين المقلوب",
+    PatternCode.DOUBLE_BOTTOM: "نمط القاع المزدوج",
+    PatternCode.DOUBLE_TOP: "نمط القمة المزدوجة",
+    PatternCode.TRIPLE_BOTTOM: "نمط القاع الثلاثي",
+    PatternCode.TRIPLE_TOP: "نمط القمة الثلاثية",
+    PatternCode.FLAG: "نمط العلم",
+    PatternCode.WEDGE: "نمط الوتد",
+    PatternCode.ASCENDING_TRIANGLE: "نمط المثلث صاعد",
+    PatternCode.DESCENDING_TRIANGLE: "نمط المثلث هابط",
+    PatternCode.SYMMETRICAL_TRIANGLE: "نمط المثلث متماثل",
+    PatternCode.RECTANGLE: "نمط المستطيل",
+}
+
+# نصوص الإشارات الفنية
+SIGNAL_TEXTS = {
+    SignalCode.RSI_OVERBOUGHT: "تشبع شرائي في مؤشر القوة النسبية RSI",
+    SignalCode.RSI_OVERSOLD: "تشبع بيعي في مؤشر القوة النسبية RSI",
+    SignalCode.MACD_BULLISH_CROSS_RECENT: "تقاطع إيجابي حديث في مؤشر MACD",
+    SignalCode.MACD_BULLISH_CROSS: "تقاطع إيجابي في مؤشر MACD",
+    SignalCode.MACD_BEARISH_CROSS_RECENT: "تقاطع سلبي حديث في مؤشر MACD",
+    SignalCode.MACD_BEARISH_CROSS: "تقاطع سلبي في مؤشر MACD",
+    SignalCode.STOCH_OVERSOLD: "تشبع بيعي في مؤشر Stochastic",
+    SignalCode.STOCH_OVERBOUGHT: "تشبع شرائي في مؤشر Stochastic",
+    SignalCode.STOCH_BULLISH_CROSS: "تقاطع إيجابي في مؤشر Stochastic",
+    SignalCode.STOCH_BEARISH_CROSS: "تقاطع سلبي في مؤشر Stochastic",
+    SignalCode.BB_ABOVE_UPPER: "السعر فوق الحد العلوي لمؤشر Bollinger Bands",
+    SignalCode.BB_BELOW_LOWER: "السعر تحت الحد السفلي لمؤشر Bollinger Bands",
+    SignalCode.PATTERN_BULLISH: "إشارة صعود من {pattern}",
+    SignalCode.PATTERN_BEARISH: "إشارة هبوط من {pattern}",
+}
+
+TREND_TEXTS = {
+    Direction.BULLISH: "صاعد",
+    Direction.BEARISH: "هابط",
+    Direction.NEUTRAL: "متذبذب",
+}
+
+TREND_STRENGTH_TEXTS = {
+    TrendStrength.STRONG: "قوي",
+    TrendStrength.MEDIUM: "متوسط القوة",
+    TrendStrength.WEAK: "ضعيف",
+}
+
+# نص الأنماط عند عدم اكتشاف أي نمط
+NO_PATTERNS_TEXT = "لا توجد أنماط مميزة"
+
+# مفتاح ملخص التحليل في الإشارة المخزنة (تُولد منه النصوص عند العرض)
+SIGNAL_SUMMARY_KEY = "الملخص"
+
+# نوع الإشارة المعروض بحسب الاتجاه
+SIGNAL_TYPE_TEXTS = {
+    Direction.BULLISH: "شراء",
+    Direction.BEARISH: "بيع",
+    Direction.NEUTRAL: "انتظار",
+}
+
+
+def render_pattern(code: PatternCode) -> str:
+    """اسم النمط المعروض للمستخدم"""
+    return PATTERN_TEXTS[code]
+
+
+def render_patterns(codes: Iterable[PatternCode]) -> List[str]:
+    """أسماء قائمة من الأنماط بنفس الترتيب"""
+    return [PATTERN_TEXTS[code] for code in codes]
+
+
+def render_signal(signal: Signal) -> str:
+    """نص الإشارة الفنية المعروض للمستخدم"""
+    text = SIGNAL_TEXTS[signal.code]
+    if signal.pattern is not None:
+        return text.format(pattern=PATTERN_TEXTS[signal.pattern])
+    return text
+
+
+def render_signals(signals: Iterable[Signal]) -> List[str]:
+    """نصوص قائمة من الإشارات بنفس الترتيب"""
+    return [render_signal(signal) for signal in signals]
+
+
+def render_trend(direction: Optional[Direction], level: TrendStrength) -> str:
+    """
+    وصف الاتجاه العام وقوته
+
+    Parameters:
+        direction: اتجاه السوق (None إذا تعذر تحديده)
+        level: درجة قوة الاتجاه
+
+    Returns:
+        str: وصف مثل "صاعد قوي" أو "غير محدد"
+    """
+    if direction is None:
+        return "غير محدد"
+    return f"{TREND_TEXTS[direction]} {TREND_STRENGTH_TEXTS[level]}"
+
+
+def render_indicators(values: Dict[str, float]) -> str:
+    """
+    وصف مختصر للمؤشرات الرئيسية
+
+    Parameters:
+        values: القيم الحالية للمؤشرات (rsi, macd, macd_signal, sma_20, sma_50)
+
+    Returns:
+        str: وصف نصي للمؤشرات
+    """
+    indicator_texts = []
+
+    rsi = values['rsi']
+    rsi_text = f"RSI = {rsi:.1f}"
+    if rsi > 70:
+        rsi_text += " (تشبع شرائي)"
+    elif rsi < 30:
+        rsi_text += " (تشبع بيعي)"
+    indicator_texts.append(rsi_text)
+
+    if values['macd'] > values['macd_signal']:
+        indicator_texts.append("تقاطع MACD إيجابي")
+    else:
+        indicator_texts.append("تقاطع MACD سلبي")
+
+    if values['sma_20'] > values['sma_50']:
+        indicator_texts.append("المتوسط 20 فوق المتوسط 50")
+    else:
+        indicator_texts.append("المتوسط 20 تحت المتوسط 50")
+
+    return "، ".join(indicator_texts)
+
+
+def render_analysis(summary: AnalysisSummary) -> str:
+    """
+    إنشاء نص التحليل الفني بصيغة مفهومة
+
+    Parameters:
+        summary: ملخص التحليل
+
+    Returns:
+        str: نص التحليل الفني
+    """
+    direction, level = summary.trend_direction, summary.trend_level
+    patterns, signals, values = summary.pattern_codes, summary.signal_codes, summary.indicators
+
+    try:
+        # بداية التحليل
+        analysis = []
+        analysis.append(f"التحليل الفني لـ {summary.symbol} على الإطار الزمني {summary.timeframe}:")
+        analysis.append("")
+
+        # وصف الاتجاه
+        analysis.append(f"الاتجاه العام: {render_trend(direction, level)}")
+
+        # وصف المؤشرات الرئيسية
+        analysis.append("")
+        analysis.append("المؤشرات الفنية:")
+
+        rsi = values['rsi']
+        analysis.append(f"- مؤشر القوة النسبية (RSI): {rsi:.2f}")
+        if rsi > 70:
+            analysis.append("  (تشبع شرائي، احتمالية هبوط)")
+        elif rsi < 30:
+            analysis.append("  (تشبع بيعي، احتمالية صعود)")
+        else:
+            analysis.append(f"  (في المنطقة المحايدة)")
+
+        macd, macd_signal, macd_hist = values['macd'], values['macd_signal'], values['macd_hist']
+        analysis.append(f"- مؤشر MACD: {macd:.4f}, خط الإشارة: {macd_signal:.4f}, الهيستوجرام: {macd_hist:.4f}")
+        if macd > macd_signal:
+            analysis.append("  (تقاطع إيجابي، إشارة صعود)")
+        else:
+            analysis.append("  (تقاطع سلبي، إشارة هبوط)")
+
+        # وصف مستويات الدعم والمقاومة
+        analysis.append("")
+        analysis.append("مستويات الدعم:")
+        for i, price in enumerate(summary.support_levels):
+            analysis.append(f"- الدعم {i+1}: {price:.4f}")
+
+        analysis.append("")
+        analysis.append("مستويات المقاومة:")
+        for i, price in enumerate(summary.resistance_levels):
+            analysis.append(f"- المقاومة {i+1}: {price:.4f}")
+
+        # وصف الأنماط المكتشفة
+        if patterns:
+            analysis.append("")
+            analysis.append("الأنماط السعرية المكتشفة:")
+            for pattern in render_patterns(patterns):
+                analysis.append(f"- {pattern}")
+
+        # الإشارات والتوصيات
+        if signals:
+            analysis.append("")
+            analysis.append("الإشارات والتوصيات:")
+            for signal in render_signals(signals):
+                analysis.append(f"- {signal}")
+
+        # استنتاج نهائي
+        analysis.append("")
+        analysis.append("الاستنتاج:")
+
+        buy_signals = directional_score(signals, Direction.BULLISH)
+        sell_signals = directional_score(signals, Direction.BEARISH)
+
+        if buy_signals > sell_signals and direction == Direction.BULLISH:
+            analysis.append("التحليل يشير إلى اتجاه صاعد قوي مع تأكيد من عدة مؤشرات.")
+            analysis.append("توصية: فرصة شراء محتملة مع وضع وقف خسارة تحت أقرب مستوى دعم.")
+        elif sell_signals > buy_signals and direction == Direction.BEARISH:
+            analysis.append("التحليل يشير إلى اتجاه هابط قوي مع تأكيد من عدة مؤشرات.")
+            analysis.append("توصية: فرصة بيع محتملة مع وضع وقف خسارة فوق أقرب مستوى مقاومة.")
+        else:
+            analysis.append("المؤشرات مختلطة، الاتجاه العام غير واضح.")
+            analysis.append("توصية: الانتظار حتى ظهور إشارات أكثر وضوحًا.")
+
+        return "\n".join(analysis)
+
+    except Exception as e:
+        logger.error(f"خطأ في إنشاء نص التحليل: {str(e)}")
+        return f"حدث خطأ أثناء إنشاء التحليل: {str(e)}"
+
+
+def render_signal_fields(signal: Optional[Dict[str, Any]], cache: Optional[TTLCache] = None) -> Optional[Dict[str, Any]]:
+    """
+    الإشارة بشكلها المعروض: يُستبدل ملخص التحليل بنصوص المؤشرات والأنماط والتحليل
+
+    الإشارة المخزنة تحمل الملخص فقط، والنصوص تُولد هنا عند الإرسال أو التصدير
+    وتُحفظ في cache لكل (زوج، إطار زمني، شمعة)
+
+    Parameters:
+        signal: الإشارة كما يخزنها SignalGenerator (أو None)
+        cache: تخزين مؤقت للنصوص المولدة (اختياري)
+
+    Returns:
+        Dict: نسخة من الإشارة بنفس ترتيب الحقول مع النصوص بدلاً من الملخص
+    """
+    if signal is None or SIGNAL_SUMMARY_KEY not in signal:
+        return signal
+
+    fields = {}
+    for key, value in signal.items():
+        if key != SIGNAL_SUMMARY_KEY:
+            fields[key] = value
+            continue
+
+        summary = value
+        stamp = None
+        if summary.candle_stamp is not None:
+            stamp = (summary.symbol, summary.timeframe, summary.candle_stamp)
+        patterns = render_patterns(summary.detected_patterns)
+        fields["المؤشرات"] = _rendered(cache, stamp, 'indicators', lambda: render_indicators(summary.indicators))
+        fields["الأنماط"] = ", ".join(patterns) if patterns else NO_PATTERNS_TEXT
+        fields["التحليل"] = _rendered(cache, stamp, 'analysis', lambda: render_analysis(summary))
+    return fields
+
+
+def _rendered(cache: Optional[TTLCache], stamp: Optional[Hashable], kind: str, build: Callable[[], str]) -> str:
+    """النص المحفوظ للشمعة أو توليده وحفظه (دون حفظ إذا لم يتوفر وقت الشمعة)"""
+    if cache is None or stamp is None:
+        return build()
+
+    key = stamp + (kind,)
+    text = cache.get(key)
+    if text is None:
+        text = build()
+        cache.set(key, text)
+    return text
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+جدولة إعادة حساب الإشارات بعد إغلاق كل شمعة
+
+بعد كل إغلاق شمعة (مع تأخير قصير لوصول الشمعة من المصدر) تُعاد حساب إشارات جميع
+الأزواج للأطر التي أُغلقت شموعها عبر مجمع خيوط، وتُنشر النتائج في التخزين المؤقت
+لمولد الإشارات، فتصبح طلبات المستخدمين إصابات في التخزين المؤقت غالباً
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional
+
+from src.utils.helpers import timeframe_to_seconds
+
+logger = logging.getLogger(__name__)
+
+# التأخير بعد إغلاق الشمعة بالثواني قبل إعادة الحساب
+DEFAULT_DELAY = 2.0
+
+# عدد خيوط إعادة الحساب
+DEFAULT_WORKERS = 4
+
+
+class SignalScheduler:
+    """
+    خيط خلفي ينتظر إغلاق الشمعة التالية لأي إطار ثم يوزع إعادة حساب الإشارات على مجمع خيوط
+
+    إعادة الحساب تمر عبر generate_signal(refresh=True) دون توليد النصوص، فتندمج مع طلبات المستخدمين
+    المتزامنة لنفس الزوج والإطار
+    """
+
+    def __init__(self, signal_generator, symbols: Optional[Iterable[str]] = None,
+                 timeframes: Optional[Iterable[str]] = None, delay: float = DEFAULT_DELAY,
+                 workers: int = DEFAULT_WORKERS):
+        """
+        Parameters:
+            signal_generator: مولد الإشارات
+            symbols: الأزواج (الافتراضي جميع الأزواج المدعومة)
+            timeframes: الأطر الزمنية (الافتراضي جميع الأطر المدعومة)
+            delay: التأخير بعد إغلاق الشمعة بالثواني
+            workers: عدد خيوط إعادة الحساب
+        """
+        config = signal_generator.config
+        self.signal_generator = signal_generator
+        self.symbols = list(symbols or config.SUPPORTED_PAIRS)
+        self.timeframes = list(timeframes or config.SUPPORTED_TIMEFRAMES)
+        self.intervals = {timeframe: timeframe_to_seconds(timeframe) for timeframe in self.timeframes}
+        self.delay = delay
+        self.workers = workers
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self.runs = 0
+        self.failures = 0
+
+    def next_run(self, now: Optional[float] = None) -> float:
+        """وقت التشغيل التالي: أقرب إغلاق شمعة لأي إطار مضافاً إليه التأخير"""
+        now = time.time() if now is None else now
+        base = now - self.delay
+        return min((base // interval + 1) * interval for interval in self.intervals.values()) + self.delay
+
+    def due_timeframes(self, run_at: float) -> List[str]:
+        """الأطر التي أُغلقت شمعتها عند وقت التشغيل (الأطر الأعلى تُغلق مع الأدنى عند الحدود المشتركة)"""
+        boundary = round(run_at - self.delay)
+        return [timeframe for timeframe, interval in self.intervals.items() if boundary % interval == 0]
+
+    def start(self):
+        """بدء الجدولة في خيط خلفي"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='qx-signals')
+        self._thread = threading.Thread(target=self._run, name='qx-signal-scheduler', daemon=True)
+        self._thread.start()
+        logger.info(f"تم بدء جدولة الإشارات لـ {len(self.symbols)} زوج على {len(self.timeframes)} إطار زمني")
+
+    def stop(self, timeout: Optional[float] = 5):
+        """إيقاف الجدولة (العمليات الجارية تكتمل)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def run_once(self, timeframes: Optional[Iterable[str]] = None):
+        """
+        إعادة حساب إشارات جميع الأزواج للأطر المحددة عبر مجمع الخيوط وانتظار اكتمالها
+
+        Parameters:
+            timeframes: الأطر الزمنية (الافتراضي جميع أطر الجدولة)
+        """
+        timeframes = self.timeframes if timeframes is None else list(timeframes)
+        if not timeframes:
+            return
+        executor = self._executor or ThreadPoolExecutor(max_workers=self.workers)
+        started = time.perf_counter()
+        try:
+            # الأطر الأدنى أولاً لأن شموعها الجديدة تنتهي صلاحيتها أسرع
+            jobs = [
+                executor.submit(self._refresh, symbol, timeframe)
+                for timeframe in sorted(timeframes, key=timeframe_to_seconds)
+                for symbol in self.symbols
+            ]
+            for job in jobs:
+                job.result()
+        finally:
+            if executor is not self._executor:
+                executor.shutdown(wait=False)
+
+        self.runs += 1
+        logger.info(
+            f"تم تحديث إشارات {len(self.symbols)} زوج للأطر {', '.join(timeframes)} "
+            f"خلال {time.perf_counter() - started:.2f} ثانية"
+        )
+
+    def _refresh(self, symbol: str, timeframe: str):
+        """إعادة حساب إشارة واحدة ونشرها في التخزين المؤقت"""
+        try:
+            self.signal_generator.generate_signal(symbol, timeframe, refresh=True, render=False)
+        except Exception as e:
+            self.failures += 1
+            logger.error(f"خطأ أثناء تحديث إشارة {symbol} ({timeframe}): {str(e)}")
+
+    def _run(self):
+        """حلقة الجدولة: انتظار الإغلاق التالي ثم تحديث الأطر المستحقة"""
+        while not self._stop.is_set():
+            run_at = self.next_run()
+            if self._stop.wait(max(0.0, run_at - time.time())):
+                break
+            try:
+                self.run_once(self.due_timeframes(run_at))
+            except Exception as e:
+                logger.error(f"خطأ أثناء تحديث الإشارات المجدول: {str(e)}")
@@ -1,317 +1,442 @@
-#!/usr/bin/env python
-# -*- coding: utf-8 -*-
-"""
-مولد الإشارات المتكامل
-"""
-
-import logging
-import uuid
-from datetime import datetime
-from typing import Dict, List, Optional, Any
-
-import pandas as pd
-
-from src.analysis.technical import TechnicalAnalyzer
-from src.analysis.patterns import PatternRecognizer
-from src.utils.config import load_config
-
-logger = logging.getLogger(__name__)
-
-class SignalGenerator:
-    """
-    فئة مولد الإشارات
-    توفر إشارات تداول دقيقة بناءً على التحليل الفني وتحليل الأنماط
-    """
-    
-    def __init__(self, qx_client):
-        """
-        تهيئة مولد الإشارات
-        
-        Parameters:
-            qx_client: مثيل من QXClient للحصول على البيانات
-        """
-        self.qx_client = qx_client
-        self.config = load_config()
-        self.technical_analyzer = TechnicalAnalyzer()
-        self.pattern_recognizer = PatternRecognizer()
-        self.signals_cache = {}  # تخزين مؤقت للإشارات
-        
-        logger.info("تم تهيئة مولد الإشارات")
-    
-    def generate_signal(self, symbol: str, timeframe: str) -> Optional[Dict[str, Any]]:
-        """
-        توليد إشارة تداول للزوج والإطار الزمني المحدد
-        
-        Parameters:
-            symbol: رمز الزوج
-            timeframe: الإطار الزمني
-        
-        Returns:
-            Dict: قاموس يحتوي على معلومات الإشارة أو None في حالة الفشل
-        """
-        # التحقق من التخزين المؤقت
-        cache_key = f"{symbol}_{timeframe}"
-        if cache_key in self.signals_cache:
-            cache_time = self.signals_cache[cache_key]['timestamp']
-            current_time = datetime.now().timestamp()
-            
-            # استخدام الإشارة المخزنة إذا كانت حديثة (أقل من 5 دقائق)
-            if current_time - cache_time < 300:
-                logger.info(f"استخدام إشارة مخزنة لـ {symbol} ({timeframe})")
-                return self.signals_cache[cache_key]['signal']
-        
-        try:
-            logger.info(f"توليد إشارة تداول لـ {symbol} على الإطار الزمني {timeframe}")
-            
-            # الحصول على البيانات التاريخية
-            historical_data = self.qx_client.get_historical_data(symbol, timeframe, 50)
-            if historical_data is None or len(historical_data) < 20:
-                logger.error(f"بيانات غير كافية لتوليد إشارة لـ {symbol}")
-                return None
-            
-            # الحصول على السعر الحالي
-            current_price = self.qx_client.get_current_price(symbol)
-            if current_price is None:
-                logger.error(f"فشل الحصول على السعر الحالي لـ {symbol}")
-                return None
-            
-            # إجراء التحليل الفني
-            technical_result = self.technical_analyzer.analyze(historical_data, symbol, timeframe)
-            if technical_result is None:
-                logger.error(f"فشل التحليل الفني لـ {symbol}")
-                return None
-            
-            # تحليل الأنماط السعرية
-            patterns = self.pattern_recognizer.identify_all_patterns(historical_data)
-            
-            # دمج المؤشرات لتوليد الإشارة
-            signal = self._generate_signal_from_analysis(
-                symbol, timeframe, current_price, technical_result, patterns
-            )
-            
-            # تخزين الإشارة في التخزين المؤقت
-            if signal:
-                self.signals_cache[cache_key] = {
-                    'signal': signal,
-                    'timestamp': datetime.now().timestamp()
-                }
-            
-            return signal
-            
-        except Exception as e:
-            logger.error(f"خطأ أثناء توليد إشارة لـ {symbol}: {str(e)}")
-            return None
-    
-    def _generate_signal_from_analysis(self, symbol, timeframe, current_price, technical_result, patterns):
-        """
-        توليد إشارة بناءً على نتائج التحليل
-        
-        Parameters:
-            symbol: رمز الزوج
-            timeframe: الإطار الزمني
-            current_price: السعر الحالي
-            technical_result: نتيجة التحليل الفني
-            patterns: الأنماط المكتشفة
-        
-        Returns:
-            Dict: قاموس يحتوي على معلومات الإشارة أو None إذا لم تكن هناك إشارة قوية
-        """
-        # تحديد نوع الإشارة (شراء/بيع/انتظار) بناءً على التحليل
-        signal_type = "انتظار"  # القيمة الافتراضية هي انتظار
-        
-        if "صاعد قوي" in technical_result.trend:
-            signal_type = "شراء"
-        elif "هابط قوي" in technical_result.trend:
-            signal_type = "بيع"
-        elif "صاعد متوسط" in technical_result.trend:
-            # التحقق من وجود أنماط مؤكدة للاتجاه الصاعد
-            buy_patterns = sum(1 for pattern in patterns if "صاعد" in pattern or "المطرقة" in pattern or "القاع" in pattern)
-            if buy_patterns > 0:
-                signal_type = "شراء"
-        elif "هابط متوسط" in technical_result.trend:
-            # التحقق من وجود أنماط مؤكدة للاتجاه الهابط
-            sell_patterns = sum(1 for pattern in patterns if "هابط" in pattern or "نجمة المساء" in pattern or "القمة" in pattern)
-            if sell_patterns > 0:
-                signal_type = "بيع"
-        
-        # إذا كانت الإشارة هي انتظار، نرجع None
-        if signal_type == "انتظار":
-            return None
-        
-        # حساب نقاط الدخول والخروج
-        entry_price = current_price
-        
-        # تحديد وقف الخسارة والأهداف
-        if signal_type == "شراء":
-            # وقف الخسارة تحت أقرب مستوى دعم
-            stop_loss = min(technical_result.support_levels) if technical_result.support_levels else current_price * 0.97
-            
-            # الأهداف فوق مستويات المقاومة
-            targets = []
-            for level in sorted(technical_result.resistance_levels):
-                if level > current_price:
-                    targets.append(level)
-            
-            if not targets:
-                # إذا لم تكن هناك مستويات مقاومة أعلى من السعر الحالي
-                target1 = current_price * 1.02
-                target2 = current_price * 1.03
-                targets = [target1, target2]
-            
-        else:  # بيع
-            # وقف الخسارة فوق أقرب مستوى مقاومة
-            stop_loss = max(technical_result.resistance_levels) if technical_result.resistance_levels else current_price * 1.03
-            
-            # الأهداف تحت مستويات الدعم
-            targets = []
-            for level in sorted(technical_result.support_levels, reverse=True):
-                if level < current_price:
-                    targets.append(level)
-            
-            if not targets:
-                # إذا لم تكن هناك مستويات دعم أقل من السعر الحالي
-                target1 = current_price * 0.98
-                target2 = current_price * 0.97
-                targets = [target1, target2]
-        
-        # حساب نسبة الثقة
-        confidence = self._calculate_confidence(
-            technical_result, patterns, signal_type
-        )
-        
-        # إذا كانت نسبة الثقة منخفضة، لا نصدر إشارة
-        if confidence < self.config.MIN_CONFIDENCE:
-            return None
-        
-        # تجميع الإشارة في قاموس
-        signal = {
-            "id": str(uuid.uuid4()),
-            "الزوج": symbol,
-            "الإطار_الزمني": timeframe,
-            "نوع": signal_type,
-            "الاتجاه": technical_result.trend,
-            "نقطة_الدخول": self._format_price(entry_price),
-            "وقف_الخسارة": self._format_price(stop_loss),
-            "الهدف": self._format_price(targets[0] if targets else (entry_price * 1.02 if signal_type == "شراء" else entry_price * 0.98)),
-            "الهدف_الثاني": self._format_price(targets[1] if len(targets) > 1 else (entry_price * 1.04 if signal_type == "شراء" else entry_price * 0.96)),
-            "نسبة_الثقة": int(confidence),
-            "المؤشرات": self._format_indicators(technical_result.indicators),
-            "الأنماط": ", ".join(patterns) if patterns else "لا توجد أنماط مميزة",
-            "التحليل": technical_result.analysis_text,
-            "الوقت": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
-        
-        logger.info(f"تم توليد إشارة {signal_type} لـ {symbol} بنسبة ثقة {confidence:.1f}%")
-        return signal
-    
-    def _calculate_confidence(self, technical_result, patterns, signal_type) -> float:
-        """
-        حساب نسبة الثقة في الإشارة
-        
-        Parameters:
-            technical_result: نتيجة التحليل الفني
-            patterns: الأنماط المكتشفة
-            signal_type: نوع الإشارة (شراء/بيع)
-        
-        Returns:
-            float: نسبة الثقة من 0 إلى 100
-        """
-        # بداية النتيجة بقيمة متوسطة
-        confidence = 50.0
-        
-        # زيادة الثقة بناءً على قوة الاتجاه الفني
-        confidence += technical_result.strength * 20
-        
-        # زيادة الثقة بناءً على عدد الإشارات المؤكدة
-        buy_signals = sum(1 for signal in technical_result.signals if "صعود" in signal or "إيجابي" in signal or "تشبع بيعي" in signal)
-        sell_signals = sum(1 for signal in technical_result.signals if "هبوط" in signal or "سلبي" in signal or "تشبع شرائي" in signal)
-        
-        if signal_type == "شراء" and buy_signals > 0:
-            confidence += min(buy_signals * 5, 20)
-        elif signal_type == "بيع" and sell_signals > 0:
-            confidence += min(sell_signals * 5, 20)
-        
-        # خفض الثقة إذا كانت هناك إشارات متضاربة
-        if signal_type == "شراء" and sell_signals > 0:
-            confidence -= min(sell_signals * 3, 15)
-        elif signal_type == "بيع" and buy_signals > 0:
-            confidence -= min(buy_signals * 3, 15)
-        
-        # زيادة الثقة بناءً على وجود أنماط سعرية مؤكدة
-        confirming_patterns = 0
-        
-        if signal_type == "شراء":
-            confirming_patterns = sum(1 for pattern in patterns 
-                                   if "صاعد" in pattern 
-                                   or "المطرقة" in pattern 
-                                   or "القاع" in pattern)
-        else:  # بيع
-            confirming_patterns = sum(1 for pattern in patterns 
-                                   if "هابط" in pattern 
-                                   or "نجمة المساء" in pattern 
-                                   or "القمة" in pattern)
-        
-        confidence += min(confirming_patterns * 5, 15)
-        
-        # تحديد الحد الأقصى والأدنى للثقة
-        confidence = max(min(confidence, 98), 0)
-        
-        return confidence
-    
-    def _format_indicators(self, indicators):
-        """
-        تنسيق المؤشرات المستخدمة في صيغة نصية
-        
-        Returns:
-            str: وصف نصي للمؤشرات
-        """
-        indicator_texts = []
-        
-        # إضافة مؤشر RSI
-        rsi = indicators['RSI']['current']
-        rsi_text = f"RSI = {rsi:.1f}"
-        if rsi > 70:
-            rsi_text += " (تشبع شرائي)"
-        elif rsi < 30:
-            rsi_text += " (تشبع بيعي)"
-        indicator_texts.append(rsi_text)
-        
-        # إضافة مؤشر MACD
-        macd = indicators['MACD']['current']['line']
-        macd_signal = indicators['MACD']['current']['signal']
-        if macd > macd_signal:
-            indicator_texts.append("تقاطع MACD إيجابي")
-        else:
-            indicator_texts.append("تقاطع MACD سلبي")
-        
-        # إضافة مؤشر المتوسطات المتحركة
-        if indicators['SMA']['current']['20'] > indicators['SMA']['current']['50']:
-            indicator_texts.append("المتوسط 20 فوق المتوسط 50")
-        else:
-            indicator_texts.append("المتوسط 20 تحت المتوسط 50")
-        
-        return "، ".join(indicator_texts)
-    
-    def _format_price(self, price):
-        """
-        تنسيق السعر بالدقة المناسبة
-        
-        Parameters:
-            price: السعر
-        
-        Returns:
-            float: السعر المنسق
-        """
-        # تحديد الدقة بناءً على قيمة السعر
-        if price < 0.1:
-            return round(price, 6)
-        elif price < 1:
-            return round(price, 5)
-        elif price < 10:
-            return round(price, 4)
-        elif price < 100:
-            return round(price, 3)
-        elif price < 1000:
-            return round(price, 2)
-        else:
-            return round(price, 1)
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+مولد الإشارات المتكامل
+"""
+
+import logging
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+
+import pandas as pd
+
+from src.analysis.candles import CandleFeatureCache
+from src.analysis.codes import Direction, TrendStrength, directional_score
+from src.analysis.indicators import missing_indicators, required_lookback
+from src.analysis.ohlcv import OHLCV
+from src.analysis.rendering import MAX_RENDERED_TEXTS, SIGNAL_SUMMARY_KEY, SIGNAL_TYPE_TEXTS, render_signal_fields
+from src.analysis.signal_log import SignalLog
+from src.analysis.technical import TechnicalAnalyzer
+from src.analysis.patterns import PatternRecognizer
+from src.analysis.vectorized import stack_panel
+from src.qxbroker.datasets import write_signals
+from src.utils.cache import TTLCache
+from src.utils.config import load_config
+from src.utils.helpers import seconds_until_candle_close
+from src.utils.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# أقل عدد من الشموع يحتاجه التحليل الفني وتحليل الأنماط
+MIN_HISTORY_CANDLES = 20
+
+# الحد الأقصى لعدد النتائج المخزنة (يُحذف الأقدم استخداماً)، والصلاحية للأطر غير المعروفة بالثواني
+MAX_CACHED_SIGNALS = 1024
+DEFAULT_SIGNAL_TTL = 300
+
+# تمييز "غير مخزن" عن None المخزن (لا توجد إشارة)
+_NOT_CACHED = object()
+
+class SignalGenerator:
+    """
+    فئة مولد الإشارات
+    توفر إشارات تداول دقيقة بناءً على التحليل الفني وتحليل الأنماط
+    """
+    
+    def __init__(self, qx_client):
+        """
+        تهيئة مولد الإشارات
+        
+        Parameters:
+            qx_client: مثيل من QXClient للحصول على البيانات
+        """
+        self.qx_client = qx_client
+        self.config = load_config()
+        
+        # خصائص الشموع تُحسب مرة واحدة لكل شمعة ويشاركها المحللان
+        self.candle_features = CandleFeatureCache()
+        
+        # النصوص المعروضة تُولد عند إرسال الإشارة فقط وتُشارك لنفس الشمعة
+        self.render_cache = TTLCache(max_entries=MAX_RENDERED_TEXTS)
+        
+        # عدد الشموع المطلوب جلبه هو أقل نافذة تكفي لإحماء المؤشرات النشطة
+        self.active_indicators = list(self.config.ACTIVE_INDICATORS)
+        self.history_length = max(required_lookback(self.active_indicators), MIN_HISTORY_CANDLES)
+        
+        self.technical_analyzer = TechnicalAnalyzer(self.candle_features, indicators=self.active_indicators)
+        self.pattern_recognizer = PatternRecognizer(self.candle_features)
+        # الإشارات المخزنة (ونتائج "لا إشارة") بملخص التحليل دون نصوص، صالحة حتى إغلاق الشمعة الحالية للإطار
+        self.signals_cache = TTLCache(max_entries=MAX_CACHED_SIGNALS)
+        self.flights = SingleFlight()  # تحليل واحد للطلبات المتزامنة لنفس الزوج والإطار
+        self.signal_log = SignalLog()  # الإشارات الصادرة للتصدير والتحليل لاحقاً
+        
+        logger.info("تم تهيئة مولد الإشارات")
+    
+    def generate_signal(self, symbol: str, timeframe: str, refresh: bool = False,
+                        render: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        توليد إشارة تداول للزوج والإطار الزمني المحدد
+        
+        Parameters:
+            symbol: رمز الزوج
+            timeframe: الإطار الزمني
+            refresh: إعادة التحليل وتحديث التخزين المؤقت حتى لو كانت الإشارة المخزنة حديثة
+            render: توليد نصوص المؤشرات والأنماط والتحليل (False لتحديث التخزين المؤقت فقط)
+        
+        Returns:
+            Dict: قاموس يحتوي على معلومات الإشارة أو None في حالة الفشل
+        """
+        # التحقق من التخزين المؤقت (None المخزن يعني لا توجد إشارة لهذه الشمعة)
+        signal = _NOT_CACHED
+        if not refresh:
+            signal = self.signals_cache.get((symbol, timeframe), _NOT_CACHED)
+            if signal is not _NOT_CACHED:
+                logger.info(f"استخدام إشارة مخزنة لـ {symbol} ({timeframe})")
+        
+        if signal is _NOT_CACHED:
+            # الطلبات المتزامنة لنفس الزوج والإطار تنتظر تحليلاً واحداً
+            signal = self.flights.do((symbol, timeframe), lambda: self._compute_signal(symbol, timeframe, refresh))
+        
+        return self.render_signal(signal) if render else signal
+    
+    def render_signal(self, signal: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        الإشارة بشكلها المعروض مع نصوص المؤشرات والأنماط والتحليل (محفوظة لكل شمعة)
+        
+        Parameters:
+            signal: الإشارة المخزنة بملخص التحليل
+        
+        Returns:
+            Dict: الإشارة مع نصوصها أو None
+        """
+        return render_signal_fields(signal, self.render_cache)
+    
+    def _cache_signal(self, symbol: str, timeframe: str, signal: Optional[Dict[str, Any]]):
+        """
+        تخزين نتيجة التحليل (إشارة أو None) حتى إغلاق الشمعة الحالية للإطار الزمني
+        
+        Parameters:
+            symbol: رمز الزوج
+            timeframe: الإطار الزمني
+            signal: الإشارة أو None إذا لم تكن هناك إشارة
+        """
+        try:
+            ttl = seconds_until_candle_close(timeframe)
+        except ValueError:
+            ttl = DEFAULT_SIGNAL_TTL
+        self.signals_cache.set((symbol, timeframe), signal, ttl=ttl)
+    
+    def _compute_signal(self, symbol: str, timeframe: str, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        تحليل الزوج والإطار الزمني وتخزين الإشارة الناتجة
+        
+        Returns:
+            Dict: قاموس يحتوي على معلومات الإشارة أو None في حالة الفشل
+        """
+        # قد يكون طلب متزامن سابق قد خزّن النتيجة
+        if not refresh:
+            cached = self.signals_cache.get((symbol, timeframe), _NOT_CACHED)
+            if cached is not _NOT_CACHED:
+                return cached
+        
+        try:
+            logger.info(f"توليد إشارة تداول لـ {symbol} على الإطار الزمني {timeframe}")
+            
+            # الحصول على البيانات التاريخية
+            historical_data = self._fetch_history(symbol, timeframe)
+            if historical_data is None or len(historical_data) < MIN_HISTORY_CANDLES:
+                logger.error(f"بيانات غير كافية لتوليد إشارة لـ {symbol}")
+                return None
+            
+            # عرض البيانات مرة واحدة دون نسخ ومشاركته بين التحليل الفني وتحليل الأنماط
+            ohlcv = OHLCV.from_any(historical_data)
+            
+            # الحصول على السعر الحالي
+            current_price = self.qx_client.get_current_price(symbol)
+            if current_price is None:
+                logger.error(f"فشل الحصول على السعر الحالي لـ {symbol}")
+                return None
+            
+            # إجراء التحليل الفني
+            technical_result = self.technical_analyzer.analyze(ohlcv, symbol, timeframe)
+            if technical_result is None:
+                logger.error(f"فشل التحليل الفني لـ {symbol}")
+                return None
+            
+            # تحليل الأنماط السعرية
+            patterns = self.pattern_recognizer.identify_all_patterns(ohlcv, symbol, timeframe)
+            
+            # دمج المؤشرات لتوليد الإشارة
+            signal = self._generate_signal_from_analysis(
+                symbol, timeframe, current_price, technical_result, patterns
+            )
+            
+            # تخزين النتيجة في التخزين المؤقت (بما في ذلك عدم وجود إشارة)
+            if signal:
+                self.signal_log.record(signal)
+            self._cache_signal(symbol, timeframe, signal)
+            
+            return signal
+            
+        except Exception as e:
+            logger.error(f"خطأ أثناء توليد إشارة لـ {symbol}: {str(e)}")
+            return None
+    
+    def scan_signals(self, symbols: Optional[List[str]] = None,
+                     timeframes: Optional[List[str]] = None) -> Dict[tuple, Dict[str, Any]]:
+        """
+        توليد الإشارات لعدة أزواج وأطر زمنية في تمريرة متجهة واحدة
+        
+        Parameters:
+            symbols: قائمة الأزواج (الافتراضي جميع الأزواج المدعومة)
+            timeframes: قائمة الأطر الزمنية (الافتراضي جميع الأطر المدعومة)
+        
+        Returns:
+            Dict: قاموس (الزوج، الإطار الزمني) -> الإشارة، للإشارات الصادرة فقط
+        """
+        symbols = symbols or self.config.SUPPORTED_PAIRS
+        timeframes = timeframes or self.config.SUPPORTED_TIMEFRAMES
+        signals = {}
+        
+        try:
+            logger.info(f"مسح {len(symbols)} زوج على {len(timeframes)} إطار زمني")
+            
+            # جمع البيانات التاريخية لجميع السلاسل
+            frames = {}
+            for symbol in symbols:
+                for timeframe in timeframes:
+                    data = self._fetch_history(symbol, timeframe)
+                    if data is None or len(data) < MIN_HISTORY_CANDLES:
+                        logger.warning(f"بيانات غير كافية لـ {symbol} ({timeframe})")
+                        continue
+                    frames[(symbol, timeframe)] = data
+            
+            # التحليل الفني لجميع السلاسل دفعة واحدة
+            panel, keys = stack_panel(frames)
+            if not keys:
+                logger.warning("لا توجد سلاسل ببيانات كافية للمسح")
+                return signals
+            results = self.technical_analyzer.analyze_batch(panel, keys)
+            
+            # أسعار جميع الأزواج من لقطة واحدة
+            prices = self.qx_client.get_current_prices(symbols) or {}
+            
+            for (symbol, timeframe), technical_result in results.items():
+                current_price = prices.get(symbol)
+                if current_price is None:
+                    continue
+                
+                patterns = self.pattern_recognizer.identify_all_patterns(
+                    frames[(symbol, timeframe)], symbol, timeframe
+                )
+                signal = self._generate_signal_from_analysis(
+                    symbol, timeframe, current_price, technical_result, patterns
+                )
+                
+                self._cache_signal(symbol, timeframe, signal)
+                if signal:
+                    self.signal_log.record(signal)
+                    signals[(symbol, timeframe)] = self.render_signal(signal)
+            
+            return signals
+            
+        except Exception as e:
+            logger.error(f"خطأ أثناء مسح الإشارات: {str(e)}")
+            return signals
+    
+    def export_signals(self, path: str) -> int:
+        """
+        تصدير الإشارات الصادرة إلى ملف Parquet/Arrow مع نصوصها
+        
+        Parameters:
+            path: مسار الملف (.parquet أو .arrow)
+        
+        Returns:
+            int: عدد الإشارات المصدرة
+        """
+        return write_signals((self.render_signal(signal) for signal in self.signal_log.snapshot()), path)
+    
+    def _fetch_history(self, symbol: str, timeframe: str) -> Optional[OHLCV]:
+        """
+        جلب أقل عدد من الشموع يكفي للمؤشرات النشطة من مخزن الشموع دون نسخ
+        
+        Parameters:
+            symbol: رمز الزوج
+            timeframe: الإطار الزمني
+        
+        Returns:
+            OHLCV: البيانات التاريخية أو None في حالة الفشل
+        """
+        data = self.qx_client.get_candles(symbol, timeframe, self.history_length)
+        if data is None:
+            return None
+        
+        missing = missing_indicators(len(data), self.active_indicators)
+        if missing:
+            logger.warning(
+                f"تم جلب {len(data)} من {self.history_length} شمعة لـ {symbol} ({timeframe})، "
+                f"مؤشرات بدون بيانات كافية: {', '.join(missing)}"
+            )
+        return data
+    
+    def _generate_signal_from_analysis(self, symbol, timeframe, current_price, technical_result, patterns):
+        """
+        توليد إشارة بناءً على نتائج التحليل
+        
+        Parameters:
+            symbol: رمز الزوج
+            timeframe: الإطار الزمني
+            current_price: السعر الحالي
+            technical_result: نتيجة التحليل الفني
+            patterns: رموز الأنماط المكتشفة
+        
+        Returns:
+            Dict: قاموس يحتوي على معلومات الإشارة (بملخص التحليل بدلاً من النصوص) أو None إذا لم تكن هناك إشارة قوية
+        """
+        # تحديد نوع الإشارة (شراء/بيع/انتظار) بناءً على التحليل
+        signal_type = Direction.NEUTRAL  # القيمة الافتراضية هي انتظار
+        trend = technical_result.trend_direction
+        level = technical_result.trend_level
+        
+        if trend in (Direction.BULLISH, Direction.BEARISH):
+            if level == TrendStrength.STRONG:
+                signal_type = trend
+            elif level == TrendStrength.MEDIUM and directional_score(patterns, trend) > 0:
+                # الاتجاه متوسط القوة يحتاج إلى نمط واحد على الأقل يؤكده
+                signal_type = trend
+        
+        # إذا كانت الإشارة هي انتظار، نرجع None
+        if signal_type == Direction.NEUTRAL:
+            return None
+        
+        # حساب نقاط الدخول والخروج
+        entry_price = current_price
+        
+        # تحديد وقف الخسارة والأهداف
+        if signal_type == Direction.BULLISH:
+            # وقف الخسارة تحت أقرب مستوى دعم
+            stop_loss = min(technical_result.support_levels) if technical_result.support_levels else current_price * 0.97
+            
+            # الأهداف فوق مستويات المقاومة
+            targets = []
+            for level in sorted(technical_result.resistance_levels):
+                if level > current_price:
+                    targets.append(level)
+            
+            if not targets:
+                # إذا لم تكن هناك مستويات مقاومة أعلى من السعر الحالي
+                target1 = current_price * 1.02
+                target2 = current_price * 1.03
+                targets = [target1, target2]
+            
+        else:  # بيع
+            # وقف الخسارة فوق أقرب مستوى مقاومة
+            stop_loss = max(technical_result.resistance_levels) if technical_result.resistance_levels else current_price * 1.03
+            
+            # الأهداف تحت مستويات الدعم
+            targets = []
+            for level in sorted(technical_result.support_levels, reverse=True):
+                if level < current_price:
+                    targets.append(level)
+            
+            if not targets:
+                # إذا لم تكن هناك مستويات دعم أقل من السعر الحالي
+                target1 = current_price * 0.98
+                target2 = current_price * 0.97
+                targets = [target1, target2]
+        
+        # حساب نسبة الثقة
+        confidence = self._calculate_confidence(
+            technical_result, patterns, signal_type
+        )
+        
+        # إذا كانت نسبة الثقة منخفضة، لا نصدر إشارة
+        if confidence < self.config.MIN_CONFIDENCE:
+            return None
+        
+        # تجميع الإشارة في قاموس
+        signal = {
+            "id": str(uuid.uuid4()),
+            "الزوج": symbol,
+            "الإطار_الزمني": timeframe,
+            "نوع": SIGNAL_TYPE_TEXTS[signal_type],
+            "الاتجاه": technical_result.trend,
+            "نقطة_الدخول": self._format_price(entry_price),
+            "وقف_الخسارة": self._format_price(stop_loss),
+            "الهدف": self._format_price(targets[0] if targets else (entry_price * 1.02 if signal_type == Direction.BULLISH else entry_price * 0.98)),
+            "الهدف_الثاني": self._format_price(targets[1] if len(targets) > 1 else (entry_price * 1.04 if signal_type == Direction.BULLISH else entry_price * 0.96)),
+            "نسبة_الثقة": int(confidence),
+            SIGNAL_SUMMARY_KEY: technical_result.summarize(patterns),  # المؤشرات والأنماط والتحليل تُولد عند الإرسال
+            "الوقت": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+        
+        logger.info(f"تم توليد إشارة {SIGNAL_TYPE_TEXTS[signal_type]} لـ {symbol} بنسبة ثقة {confidence:.1f}%")
+        return signal
+    
+    def _calculate_confidence(self, technical_result, patterns, signal_type) -> float:
+        """
+        حساب نسبة الثقة في الإشارة
+        
+        Parameters:
+            technical_result: نتيجة التحليل الفني
+            patterns: رموز الأنماط المكتشفة
+            signal_type: اتجاه الإشارة (شراء/بيع)
+        
+        Returns:
+            float: نسبة الثقة من 0 إلى 100
+        """
+        # بداية النتيجة بقيمة متوسطة
+        confidence = 50.0
+        
+        # زيادة الثقة بناءً على قوة الاتجاه الفني
+        confidence += technical_result.strength * 20
+        
+        # زيادة الثقة بناءً على عدد الإشارات المؤكدة
+        buy_signals = directional_score(technical_result.signal_codes, Direction.BULLISH)
+        sell_signals = directional_score(technical_result.signal_codes, Direction.BEARISH)
+        
+        if signal_type == Direction.BULLISH and buy_signals > 0:
+            confidence += min(buy_signals * 5, 20)
+        elif signal_type == Direction.BEARISH and sell_signals > 0:
+            confidence += min(sell_signals * 5, 20)
+        
+        # خفض الثقة إذا كانت هناك إشارات متضاربة
+        if signal_type == Direction.BULLISH and sell_signals > 0:
+            confidence -= min(sell_signals * 3, 15)
+        elif signal_type == Direction.BEARISH and buy_signals > 0:
+            confidence -= min(buy_signals * 3, 15)
+        
+        # زيادة الثقة بناءً على وجود أنماط سعرية مؤكدة لاتجاه الإشارة
+        confirming_patterns = directional_score(patterns, signal_type)
+        
+        confidence += min(confirming_patterns * 5, 15)
+        
+        # تحديد الحد الأقصى والأدنى للثقة
+        confidence = max(min(confidence, 98), 0)
+        
+        return confidence
+    
+    def _format_price(self, price):
+        """
+        تنسيق السعر بالدقة المناسبة
+        
+        Parameters:
+            price: السعر
+        
+        Returns:
+            float: السعر المنسق
+        """
+        # تحديد الدقة بناءً على قيمة السعر
+        if price < 0.1:
+            return round(price, 6)
+        elif price < 1:
+            return round(price, 5)
+        elif price < 10:
+            return round(price, 4)
+        elif price < 100:
+            return round(price, 3)
+        elif price < 1000:
+            return round(price, 2)
+        else:
+            return round(price, 1)
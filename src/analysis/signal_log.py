@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+سجل الإشارات الصادرة (محدود الحجم) للتصدير والتحليل لاحقاً
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# الحد الأقصى لعدد الإشارات المحفوظة في الذاكرة
+DEFAULT_MAX_SIGNALS = 10000
+
+
+class SignalLog:
+    """سجل الإشارات الصادرة بالترتيب، ويُحذف الأقدم عند تجاوز الحد"""
+
+    def __init__(self, max_signals: int = DEFAULT_MAX_SIGNALS):
+        """
+        Parameters:
+            max_signals: الحد الأقصى لعدد الإشارات المحفوظة
+        """
+        self._signals = deque(maxlen=max_signals)
+        self._lock = threading.Lock()
+
+    def record(self, signal: Dict[str, Any]):
+        """تسجيل إشارة صادرة"""
+        with self._lock:
+            self._signals.append(signal)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """نسخة من الإشارات المسجلة بالترتيب"""
+        with self._lock:
+            return list(self._signals)
+
+    def clear(self):
+        """حذف جميع الإشارات"""
+        with self._lock:
+            self._signals.clear()
+
+    def __len__(self) -> int:
+        return len(self._signals)
@@ -0,0 +1,403 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+محرك المؤشرات الفنية المتدفق (Streaming)
+يحدّث جميع المؤشرات بتكلفة ثابتة O(1) لكل شمعة جديدة بدلاً من إعادة الحساب الكامل
+"""
+
+import logging
+import math
+import threading
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from src.analysis.indicators import SERIES_KEYS, build_indicators_dict
+from src.analysis.ohlcv import OHLCV, find_new_rows
+
+logger = logging.getLogger(__name__)
+
+
+class RollingWindow:
+    """
+    نافذة متحركة بطول ثابت تحتفظ بالمتوسط ومجموع مربعات الانحرافات (طريقة Welford)
+
+    التحديث بالانحرافات عن المتوسط يتجنب طرح مجاميع كبيرة متقاربة (الأسعار كبيرة مقارنة
+    بتباينها)، والقيم تُعاد حسابها من النافذة كل RESYNC_INTERVAL إضافة لمنع تراكم الخطأ
+    """
+
+    RESYNC_INTERVAL = 1000
+
+    def __init__(self, length: int):
+        self.length = length
+        self.values = deque(maxlen=length)
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._pushes = 0
+
+    def push(self, value: float):
+        """إضافة قيمة جديدة وإخراج الأقدم عند امتلاء النافذة"""
+        if len(self.values) == self.length:
+            old = self.values[0]
+            self.values.append(value)
+            old_mean = self._mean
+            self._mean += (value - old) / self.length
+            self._m2 += (value - old) * (value - self._mean + old - old_mean)
+        else:
+            self.values.append(value)
+            delta = value - self._mean
+            self._mean += delta / len(self.values)
+            self._m2 += delta * (value - self._mean)
+
+        self._pushes += 1
+        if self._pushes % self.RESYNC_INTERVAL == 0:
+            self._resync()
+
+    def _resync(self):
+        """إعادة حساب المتوسط ومجموع مربعات الانحرافات من قيم النافذة"""
+        values = np.fromiter(self.values, dtype=float, count=len(self.values))
+        self._mean = float(values.mean())
+        self._m2 = float(((values - self._mean) ** 2).sum())
+
+    @property
+    def ready(self) -> bool:
+        return len(self.values) == self.length
+
+    @property
+    def mean(self) -> Optional[float]:
+        if not self.ready:
+            return None
+        return self._mean
+
+    @property
+    def std(self) -> Optional[float]:
+        """الانحراف المعياري للمجتمع (ddof=0) كما في pandas_ta.bbands"""
+        if not self.ready:
+            return None
+        variance = self._m2 / self.length
+        return math.sqrt(variance) if variance > 0 else 0.0
+
+
+class RollingExtremum:
+    """أعلى/أدنى قيمة في نافذة متحركة باستخدام طابور رتيب (O(1) بالمتوسط)"""
+
+    def __init__(self, length: int, mode: str = "max"):
+        self.length = length
+        self.is_max = mode == "max"
+        self.items = deque()  # (index, value)
+        self.count = 0
+
+    def push(self, value: float):
+        """إضافة قيمة جديدة"""
+        if self.is_max:
+            while self.items and self.items[-1][1] <= value:
+                self.items.pop()
+        else:
+            while self.items and self.items[-1][1] >= value:
+                self.items.pop()
+        self.items.append((self.count, value))
+        self.count += 1
+
+        # إخراج العناصر التي خرجت من النافذة
+        while self.items[0][0] <= self.count - 1 - self.length:
+            self.items.popleft()
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.length
+
+    @property
+    def value(self) -> Optional[float]:
+        if not self.ready:
+            return None
+        return self.items[0][1]
+
+
+class StreamingEMA:
+    """متوسط متحرك أسي تُهيأ قيمته الأولى بالمتوسط البسيط (كما في pandas_ta)"""
+
+    def __init__(self, length: int, alpha: Optional[float] = None):
+        self.length = length
+        self.alpha = alpha if alpha is not None else 2.0 / (length + 1)
+        self.seed = RollingWindow(length)
+        self.value: Optional[float] = None
+
+    def push(self, value: float) -> Optional[float]:
+        """إضافة قيمة جديدة وإرجاع قيمة المتوسط الحالية"""
+        if self.value is None:
+            self.seed.push(value)
+            if self.seed.ready:
+                self.value = self.seed.mean
+        else:
+            self.value = self.value + self.alpha * (value - self.value)
+        return self.value
+
+    @property
+    def ready(self) -> bool:
+        return self.value is not None
+
+
+class StreamingRMA(StreamingEMA):
+    """متوسط وايلدر المتحرك (RMA) المستخدم في RSI و ADX"""
+
+    def __init__(self, length: int):
+        super().__init__(length, alpha=1.0 / length)
+
+
+class StreamingIndicatorSet:
+    """
+    حالة المؤشرات لسلسلة واحدة (زوج + إطار زمني)
+    تحدّث SMA/EMA 20/50/200 و RSI و MACD و Stochastic و Bollinger و ADX لكل شمعة
+    """
+
+    MA_LENGTHS = (20, 50, 200)
+
+    def __init__(self, history: int = 20):
+        """
+        Parameters:
+            history: عدد القيم الأخيرة المحفوظة لكل مؤشر (للتحقق من التقاطعات)
+        """
+        self.history = history
+
+        # المتوسطات المتحركة
+        self.sma = {length: RollingWindow(length) for length in self.MA_LENGTHS}
+        self.ema = {length: StreamingEMA(length) for length in self.MA_LENGTHS}
+
+        # RSI
+        self.rsi_gain = StreamingRMA(14)
+        self.rsi_loss = StreamingRMA(14)
+
+        # MACD
+        self.macd_fast = StreamingEMA(12)
+        self.macd_slow = StreamingEMA(26)
+        self.macd_signal = StreamingEMA(9)
+
+        # Stochastic
+        self.stoch_high = RollingExtremum(14, "max")
+        self.stoch_low = RollingExtremum(14, "min")
+        self.stoch_k = RollingWindow(3)
+        self.stoch_d = RollingWindow(3)
+
+        # Bollinger Bands
+        self.bb_window = RollingWindow(20)
+
+        # ADX
+        self.atr = StreamingRMA(14)
+        self.plus_dm = StreamingRMA(14)
+        self.minus_dm = StreamingRMA(14)
+        self.adx = StreamingRMA(14)
+
+        self.prev_high: Optional[float] = None
+        self.prev_low: Optional[float] = None
+        self.prev_close: Optional[float] = None
+        self.count = 0
+
+        self.series = {key: deque(maxlen=history) for key in SERIES_KEYS}
+
+    def update(self, high: float, low: float, close: float):
+        """
+        تحديث جميع المؤشرات بشمعة مغلقة جديدة
+
+        Parameters:
+            high: أعلى سعر
+            low: أدنى سعر
+            close: سعر الإغلاق
+        """
+        out = {}
+
+        # المتوسطات المتحركة (القيم غير الجاهزة تُملأ بصفر كما في السابق)
+        for length in self.MA_LENGTHS:
+            window = self.sma[length]
+            window.push(close)
+            out[f'sma_{length}'] = window.mean if window.ready else 0.0
+            ema = self.ema[length].push(close)
+            out[f'ema_{length}'] = ema if ema is not None else 0.0
+
+        # RSI
+        rsi = 50.0
+        if self.prev_close is not None:
+            change = close - self.prev_close
+            avg_gain = self.rsi_gain.push(max(change, 0.0))
+            avg_loss = self.rsi_loss.push(max(-change, 0.0))
+            if avg_gain is not None and avg_loss is not None:
+                total = avg_gain + avg_loss
+                rsi = 100.0 * avg_gain / total if total > 0 else 50.0
+        out['rsi'] = rsi
+
+        # MACD
+        fast = self.macd_fast.push(close)
+        slow = self.macd_slow.push(close)
+        macd = signal = hist = 0.0
+        if fast is not None and slow is not None:
+            macd = fast - slow
+            macd_signal = self.macd_signal.push(macd)
+            if macd_signal is not None:
+                signal = macd_signal
+                hist = macd - macd_signal
+        out['macd'] = macd
+        out['macd_signal'] = signal
+        out['macd_hist'] = hist
+
+        # Stochastic
+        self.stoch_high.push(high)
+        self.stoch_low.push(low)
+        stoch_k = stoch_d = 50.0
+        if self.stoch_high.ready:
+            highest = self.stoch_high.value
+            lowest = self.stoch_low.value
+            span = highest - lowest
+            raw_k = 100.0 * (close - lowest) / span if span > 0 else 50.0
+            self.stoch_k.push(raw_k)
+            if self.stoch_k.ready:
+                stoch_k = self.stoch_k.mean
+                self.stoch_d.push(stoch_k)
+                if self.stoch_d.ready:
+                    stoch_d = self.stoch_d.mean
+        out['stoch_k'] = stoch_k
+        out['stoch_d'] = stoch_d
+
+        # Bollinger Bands
+        self.bb_window.push(close)
+        if self.bb_window.ready:
+            middle = self.bb_window.mean
+            deviation = 2 * self.bb_window.std
+            out['bb_upper'] = middle + deviation
+            out['bb_middle'] = middle
+            out['bb_lower'] = middle - deviation
+        else:
+            out['bb_upper'] = close + close * 0.02
+            out['bb_middle'] = close
+            out['bb_lower'] = close - close * 0.02
+
+        # ADX
+        adx = 25.0
+        if self.prev_close is not None:
+            true_range = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+            up_move = high - self.prev_high
+            down_move = self.prev_low - low
+            plus = up_move if up_move > down_move and up_move > 0 else 0.0
+            minus = down_move if down_move > up_move and down_move > 0 else 0.0
+
+            atr = self.atr.push(true_range)
+            plus_avg = self.plus_dm.push(plus)
+            minus_avg = self.minus_dm.push(minus)
+            if atr is not None:
+                plus_di = 100.0 * plus_avg / atr if atr > 0 else 0.0
+                minus_di = 100.0 * minus_avg / atr if atr > 0 else 0.0
+                di_sum = plus_di + minus_di
+                dx = 100.0 * abs(plus_di - minus_di) / di_sum if di_sum > 0 else 0.0
+                smoothed = self.adx.push(dx)
+                if smoothed is not None:
+                    adx = smoothed
+        out['adx'] = adx
+
+        for key, value in out.items():
+            self.series[key].append(value)
+
+        self.prev_high = high
+        self.prev_low = low
+        self.prev_close = close
+        self.count += 1
+
+    def snapshot(self) -> Dict:
+        """
+        بناء قاموس المؤشرات بنفس الشكل الذي ينتجه TechnicalAnalyzer._calculate_indicators
+
+        Returns:
+            Dict: قاموس المؤشرات
+        """
+        series = {key: np.fromiter(values, dtype=float, count=len(values)) for key, values in self.series.items()}
+        current = {key: values[-1] for key, values in self.series.items()}
+        return build_indicators_dict(series, current)
+
+
+class _SeriesState:
+    """حالة سلسلة واحدة داخل المحرك"""
+
+    def __init__(self, history: int):
+        self.indicators = StreamingIndicatorSet(history)
+        self.last_timestamp = None
+        self.snapshot: Optional[Dict] = None
+
+
+class StreamingIndicatorEngine:
+    """
+    محرك المؤشرات المتدفق مفهرس حسب (الزوج، الإطار الزمني)
+    يغذّي كل سلسلة بالشموع الجديدة فقط منذ آخر استدعاء
+    """
+
+    def __init__(self, history: int = 20):
+        """
+        Parameters:
+            history: عدد القيم الأخيرة المحفوظة لكل مؤشر
+        """
+        self.history = history
+        self._states: Dict[Tuple[str, str], _SeriesState] = {}
+        self._lock = threading.Lock()
+
+    def update(self, symbol: str, timeframe: str, data: OHLCV) -> Dict:
+        """
+        تحديث حالة السلسلة بالشموع الجديدة في البيانات وإرجاع قاموس المؤشرات
+
+        Parameters:
+            symbol: رمز الزوج
+            timeframe: الإطار الزمني
+            data: حاوية OHLCV (يجب أن تحتوي على أوقات الشموع لتتبع الشموع الجديدة)
+
+        Returns:
+            Dict: قاموس المؤشرات
+        """
+        key = (symbol, timeframe)
+
+        with self._lock:
+            state = self._states.get(key)
+            if state is None:
+                state = self._states[key] = _SeriesState(self.history)
+
+            dates = data.timestamp
+            start = find_new_rows(dates, state.last_timestamp if state.snapshot is not None else None)
+
+            if start is None:
+                # لا توجد شموع جديدة منذ آخر تحديث
+                return state.snapshot
+
+            if start == 0 and state.indicators.count > 0:
+                # البيانات لا تتصل بالحالة السابقة، نعيد البناء من البداية
+                logger.debug(f"إعادة بناء حالة المؤشرات المتدفقة لـ {symbol} ({timeframe})")
+                state.indicators = StreamingIndicatorSet(self.history)
+
+            high = data.high
+            low = data.low
+            close = data.close
+            for i in range(start, len(close)):
+                state.indicators.update(float(high[i]), float(low[i]), float(close[i]))
+
+            state.last_timestamp = dates[-1] if dates is not None else None
+            state.snapshot = state.indicators.snapshot()
+            return state.snapshot
+
+    def history_count(self, symbol: str, timeframe: str) -> int:
+        """
+        عدد الشموع التي غذّت حالة السلسلة منذ آخر إعادة بناء
+
+        Returns:
+            int: العدد (صفر إذا لم تُحدّث السلسلة بعد)
+        """
+        with self._lock:
+            state = self._states.get((symbol, timeframe))
+            return state.indicators.count if state is not None else 0
+
+    def reset(self, symbol: Optional[str] = None, timeframe: Optional[str] = None):
+        """
+        حذف الحالة المخزنة لسلسلة محددة أو لجميع السلاسل
+
+        Parameters:
+            symbol: رمز الزوج (اختياري)
+            timeframe: الإطار الزمني (اختياري)
+        """
+        with self._lock:
+            if symbol is None:
+                self._states.clear()
+            else:
+                self._states.pop((symbol, timeframe), None)
@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+فهرس نقاط التأرجح (ZigZag) للقمم والقيعان
+يُبنى في تمريرة خطية واحدة ويُحدَّث تدريجياً مع وصول الشموع الجديدة
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.analysis.ohlcv import OHLCV, find_new_rows
+
+logger = logging.getLogger(__name__)
+
+# الحد الأدنى لنسبة الانعكاس المطلوبة لتأكيد نقطة تأرجح
+SWING_MIN_THRESHOLD = 0.002
+
+SWING_HIGH = 1
+SWING_LOW = -1
+
+
+def local_extrema(values: np.ndarray, order: int = 1, mode: str = "max") -> np.ndarray:
+    """
+    مواضع القمم (أو القيعان) المحلية بعمليات متجهة
+
+    النقطة قمة محلية إذا كانت أكبر تماماً من order جار على كل جانب
+
+    Parameters:
+        values: مصفوفة الأسعار
+        order: عدد الجيران على كل جانب
+        mode: max للقمم أو min للقيعان
+
+    Returns:
+        np.ndarray: مواضع النقاط في المصفوفة الأصلية
+    """
+    width = 2 * order + 1
+    if order < 1 or len(values) < width:
+        return np.empty(0, dtype=int)
+
+    windows = sliding_window_view(values, width)
+    center = windows[:, order]
+    if mode == "max":
+        neighbours = np.maximum(windows[:, :order].max(axis=1), windows[:, order + 1:].max(axis=1))
+        mask = center > neighbours
+    else:
+        neighbours = np.minimum(windows[:, :order].min(axis=1), windows[:, order + 1:].min(axis=1))
+        mask = center < neighbours
+    return np.flatnonzero(mask) + order
+
+
+class SwingPoint:
+    """نقطة تأرجح مؤكدة (قمة أو قاع)"""
+
+    __slots__ = ('index', 'price', 'kind')
+
+    def __init__(self, index: int, price: float, kind: int):
+        self.index = index
+        self.price = price
+        self.kind = kind
+
+    @property
+    def is_high(self) -> bool:
+        return self.kind == SWING_HIGH
+
+    def __repr__(self):
+        name = "قمة" if self.is_high else "قاع"
+        return f"SwingPoint({name}, index={self.index}, price={self.price})"
+
+
+class SwingIndex:
+    """
+    فهرس ZigZag للقمم والقيعان
+
+    يتم تأكيد القمة عندما ينعكس السعر عنها بنسبة threshold على الأقل (والعكس للقاع)،
+    لذا تتناوب النقاط المؤكدة دائماً بين قمة وقاع
+    """
+
+    def __init__(self, threshold: float, max_points: int = 50):
+        """
+        Parameters:
+            threshold: نسبة الانعكاس المطلوبة لتأكيد نقطة (مثل 0.01 = 1%)
+            max_points: عدد النقاط المؤكدة المحفوظة
+        """
+        self.threshold = threshold
+        self.points = deque(maxlen=max_points)
+        self.count = 0
+
+        # الاتجاه الحالي: 1 يبحث عن قمة، -1 يبحث عن قاع، 0 غير محدد بعد
+        self.direction = 0
+        self.candidate_index = -1
+        self.candidate_price = 0.0
+
+        # أعلى وأدنى سعر قبل تحديد الاتجاه الأول
+        self._high_index = -1
+        self._high = -np.inf
+        self._low_index = -1
+        self._low = np.inf
+
+    @classmethod
+    def for_data(cls, data: OHLCV, max_points: int = 50) -> 'SwingIndex':
+        """
+        إنشاء فهرس بعتبة متناسبة مع تقلب السلسلة وبناؤه من البيانات
+
+        Parameters:
+            data: حاوية OHLCV
+            max_points: عدد النقاط المؤكدة المحفوظة
+
+        Returns:
+            SwingIndex: الفهرس المبني
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            relative_range = (data.high - data.low) / data.close
+        typical = float(np.nanmedian(relative_range)) if len(data) else 0.0
+        threshold = max(SWING_MIN_THRESHOLD, 2 * typical) if np.isfinite(typical) else SWING_MIN_THRESHOLD
+
+        index = cls(threshold, max_points)
+        index.extend(data.high, data.low)
+        return index
+
+    def update(self, high: float, low: float):
+        """
+        معالجة شمعة جديدة بتكلفة ثابتة
+
+        Parameters:
+            high: أعلى سعر
+            low: أدنى سعر
+        """
+        i = self.count
+        self.count += 1
+
+        if self.direction == 0:
+            if high > self._high:
+                self._high, self._high_index = high, i
+            if low < self._low:
+                self._low, self._low_index = low, i
+
+            if self._high >= self._low * (1 + self.threshold):
+                # تحديد الاتجاه الأول بحسب أي الطرفين ظهر أولاً
+                if self._low_index < self._high_index:
+                    self.points.append(SwingPoint(self._low_index, self._low, SWING_LOW))
+                    self.direction = SWING_HIGH
+                    self.candidate_index, self.candidate_price = self._high_index, self._high
+                else:
+                    self.points.append(SwingPoint(self._high_index, self._high, SWING_HIGH))
+                    self.direction = SWING_LOW
+                    self.candidate_index, self.candidate_price = self._low_index, self._low
+            return
+
+        if self.direction == SWING_HIGH:
+            if high > self.candidate_price:
+                self.candidate_index, self.candidate_price = i, high
+            elif low <= self.candidate_price * (1 - self.threshold):
+                self.points.append(SwingPoint(self.candidate_index, self.candidate_price, SWING_HIGH))
+                self.direction = SWING_LOW
+                self.candidate_index, self.candidate_price = i, low
+        else:
+            if low < self.candidate_price:
+                self.candidate_index, self.candidate_price = i, low
+            elif high >= self.candidate_price * (1 + self.threshold):
+                self.points.append(SwingPoint(self.candidate_index, self.candidate_price, SWING_LOW))
+                self.direction = SWING_HIGH
+                self.candidate_index, self.candidate_price = i, high
+
+    def extend(self, high: np.ndarray, low: np.ndarray, start: int = 0):
+        """
+        معالجة مجموعة من الشموع بالترتيب
+
+        Parameters:
+            high: مصفوفة أعلى الأسعار
+            low: مصفوفة أدنى الأسعار
+            start: موضع أول شمعة جديدة
+        """
+        for i in range(start, len(high)):
+            self.update(float(high[i]), float(low[i]))
+
+    def last(self, n: int) -> List[SwingPoint]:
+        """آخر n نقطة مؤكدة بالترتيب الزمني"""
+        if n <= 0:
+            return []
+        points = list(self.points)
+        return points[-n:]
+
+    def highs(self, n: int) -> List[SwingPoint]:
+        """آخر n قمة مؤكدة"""
+        return [p for p in self.points if p.is_high][-n:]
+
+    def lows(self, n: int) -> List[SwingPoint]:
+        """آخر n قاع مؤكد"""
+        return [p for p in self.points if not p.is_high][-n:]
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+
+class SwingIndexStore:
+    """
+    فهارس التأرجح لكل (زوج، إطار زمني)
+    تُغذّى بالشموع الجديدة فقط منذ آخر استدعاء
+    """
+
+    def __init__(self, max_points: int = 50):
+        self.max_points = max_points
+        self._entries: Dict[Tuple[str, str], Tuple[object, SwingIndex]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, data: OHLCV, symbol: Optional[str] = None,
+            timeframe: Optional[str] = None) -> SwingIndex:
+        """
+        الحصول على فهرس التأرجح المحدث للسلسلة
+
+        Parameters:
+            data: حاوية OHLCV
+            symbol: رمز الزوج (اختياري، بدونه يُبنى فهرس جديد)
+            timeframe: الإطار الزمني (اختياري)
+
+        Returns:
+            SwingIndex: فهرس التأرجح
+        """
+        if not symbol or not timeframe or data.timestamp is None:
+            return SwingIndex.for_data(data, self.max_points)
+
+        key = (symbol, timeframe)
+        with self._lock:
+            entry = self._entries.get(key)
+            start = find_new_rows(data.timestamp, entry[0] if entry else None)
+
+            if entry is not None and start is None:
+                return entry[1]
+
+            if entry is None or start == 0:
+                index = SwingIndex.for_data(data, self.max_points)
+            else:
+                index = entry[1]
+                index.extend(data.high, data.low, start)
+
+            self._entries[key] = (data.timestamp[-1], index)
+            return index
@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+حساب المؤشرات الفنية دفعة واحدة على لوحة ثنائية الأبعاد (السلاسل × الشموع)
+كل عملية متجهة على محور الشموع وتعالج جميع الأزواج والأطر الزمنية معاً
+"""
+
+import logging
+from typing import Dict, Hashable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.analysis.indicators import SERIES_KEYS, active_series
+from src.analysis.ohlcv import OHLCV
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+
+def _first_valid(values: np.ndarray) -> int:
+    """موضع أول عمود لا يحتوي على قيم NaN في أي صف"""
+    valid = ~np.isnan(values).any(axis=0)
+    if not valid.any():
+        return values.shape[1]
+    return int(np.argmax(valid))
+
+
+def rolling_mean(values: np.ndarray, length: int) -> np.ndarray:
+    """
+    المتوسط المتحرك البسيط على المحور الأخير
+
+    Parameters:
+        values: مصفوفة (السلاسل × الشموع)
+        length: طول النافذة
+
+    Returns:
+        np.ndarray: مصفوفة بنفس الأبعاد، القيم غير الجاهزة NaN
+    """
+    out = np.full(values.shape, np.nan)
+    start = _first_valid(values)
+    if values.shape[1] - start < length:
+        return out
+
+    csum = np.cumsum(values[:, start:], axis=1)
+    first = start + length - 1
+    out[:, first] = csum[:, length - 1] / length
+    out[:, first + 1:] = (csum[:, length:] - csum[:, :-length]) / length
+    return out
+
+
+def rolling_std(values: np.ndarray, length: int) -> np.ndarray:
+    """الانحراف المعياري المتحرك (ddof=0) على المحور الأخير"""
+    out = np.full(values.shape, np.nan)
+    if values.shape[1] < length:
+        return out
+    out[:, length - 1:] = sliding_window_view(values, length, axis=1).std(axis=-1)
+    return out
+
+
+def rolling_max(values: np.ndarray, length: int) -> np.ndarray:
+    """أعلى قيمة في نافذة متحركة على المحور الأخير"""
+    out = np.full(values.shape, np.nan)
+    if values.shape[1] < length:
+        return out
+    out[:, length - 1:] = sliding_window_view(values, length, axis=1).max(axis=-1)
+    return out
+
+
+def rolling_min(values: np.ndarray, length: int) -> np.ndarray:
+    """أدنى قيمة في نافذة متحركة على المحور الأخير"""
+    out = np.full(values.shape, np.nan)
+    if values.shape[1] < length:
+        return out
+    out[:, length - 1:] = sliding_window_view(values, length, axis=1).min(axis=-1)
+    return out
+
+
+def ema(values: np.ndarray, length: int, alpha: Optional[float] = None) -> np.ndarray:
+    """
+    المتوسط المتحرك الأسي مُهيأً بالمتوسط البسيط لأول نافذة صالحة
+
+    العودية تمنع التوجيه على محور الشموع: حلقة Python بخطوة لكل شمعة، وكل خطوة متجهة
+    على جميع السلاسل فقط. لذلك تتناسب التكلفة مع عدد الشموع، ويأتي التسريع من تجميع
+    السلاسل في صفوف اللوحة وليس من طول السلسلة
+
+    Parameters:
+        values: مصفوفة (السلاسل × الشموع)
+        length: طول المتوسط
+        alpha: معامل التنعيم (الافتراضي 2 / (length + 1))
+
+    Returns:
+        np.ndarray: مصفوفة بنفس الأبعاد، القيم غير الجاهزة NaN
+    """
+    if alpha is None:
+        alpha = 2.0 / (length + 1)
+
+    out = np.full(values.shape, np.nan)
+    start = _first_valid(values)
+    seed = start + length - 1
+    if seed >= values.shape[1]:
+        return out
+
+    out[:, seed] = values[:, start:seed + 1].mean(axis=1)
+    for t in range(seed + 1, values.shape[1]):
+        prev = out[:, t - 1]
+        out[:, t] = prev + alpha * (values[:, t] - prev)
+    return out
+
+
+def rma(values: np.ndarray, length: int) -> np.ndarray:
+    """متوسط وايلدر المتحرك (RMA)"""
+    return ema(values, length, alpha=1.0 / length)
+
+
+def _default_series(key: str, close: np.ndarray) -> np.ndarray:
+    """القيم الافتراضية لسلسلة مؤشر غير محسوب"""
+    if key in ('rsi', 'stoch_k', 'stoch_d'):
+        return np.full(close.shape, 50.0)
+    if key == 'adx':
+        return np.full(close.shape, 25.0)
+    if key == 'bb_upper':
+        return close + close * 0.02
+    if key == 'bb_middle':
+        return close.copy()
+    if key == 'bb_lower':
+        return close - close * 0.02
+    return np.zeros(close.shape)
+
+
+def compute_indicator_panel(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                            indicators: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    حساب المؤشرات النشطة لكل صفوف اللوحة
+
+    القيم غير الجاهزة والمؤشرات غير النشطة تُملأ بنفس القيم الافتراضية المستخدمة في التحليل الفردي
+
+    Parameters:
+        high: مصفوفة أعلى الأسعار (السلاسل × الشموع)
+        low: مصفوفة أدنى الأسعار
+        close: مصفوفة أسعار الإغلاق
+        indicators: أسماء المؤشرات النشطة من INDICATOR_REGISTRY (الافتراضي جميعها)
+
+    Returns:
+        Dict[str, np.ndarray]: مصفوفة لكل مفتاح من SERIES_KEYS
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    active = active_series(indicators)
+    out = {}
+
+    # المتوسطات المتحركة
+    for length in (20, 50, 200):
+        if f'sma_{length}' in active:
+            out[f'sma_{length}'] = np.nan_to_num(rolling_mean(close, length), nan=0.0)
+        if f'ema_{length}' in active:
+            out[f'ema_{length}'] = np.nan_to_num(ema(close, length), nan=0.0)
+
+    # الفروقات بين الشموع المتتالية (العمود الأول NaN)
+    prev_close = np.full(close.shape, np.nan)
+    prev_close[:, 1:] = close[:, :-1]
+    change = close - prev_close
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # RSI
+        if 'rsi' in active:
+            avg_gain = rma(np.where(np.isnan(change), np.nan, np.maximum(change, 0.0)), 14)
+            avg_loss = rma(np.where(np.isnan(change), np.nan, np.maximum(-change, 0.0)), 14)
+            total = avg_gain + avg_loss
+            rsi = np.where(total > 0, 100.0 * avg_gain / total, 50.0)
+            out['rsi'] = np.where(np.isnan(total), 50.0, rsi)
+
+        # MACD
+        if 'macd' in active:
+            macd = ema(close, 12) - ema(close, 26)
+            signal = ema(macd, 9)
+            hist = macd - signal
+            out['macd'] = np.nan_to_num(macd, nan=0.0)
+            out['macd_signal'] = np.nan_to_num(signal, nan=0.0)
+            out['macd_hist'] = np.nan_to_num(hist, nan=0.0)
+
+        # Stochastic
+        if 'stoch_k' in active:
+            highest = rolling_max(high, 14)
+            lowest = rolling_min(low, 14)
+            span = highest - lowest
+            raw_k = np.where(span > 0, 100.0 * (close - lowest) / span, 50.0)
+            raw_k[np.isnan(span)] = np.nan
+            stoch_k = rolling_mean(raw_k, 3)
+            stoch_d = rolling_mean(stoch_k, 3)
+            out['stoch_k'] = np.nan_to_num(stoch_k, nan=50.0)
+            out['stoch_d'] = np.nan_to_num(stoch_d, nan=50.0)
+
+        # Bollinger Bands
+        if 'bb_middle' in active:
+            middle = rolling_mean(close, 20)
+            deviation = 2 * rolling_std(close, 20)
+            ready = ~np.isnan(middle)
+            out['bb_upper'] = np.where(ready, middle + deviation, close + close * 0.02)
+            out['bb_middle'] = np.where(ready, middle, close)
+            out['bb_lower'] = np.where(ready, middle - deviation, close - close * 0.02)
+
+        # ADX
+        if 'adx' in active:
+            prev_high = np.full(high.shape, np.nan)
+            prev_high[:, 1:] = high[:, :-1]
+            prev_low = np.full(low.shape, np.nan)
+            prev_low[:, 1:] = low[:, :-1]
+
+            true_range = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+            up_move = high - prev_high
+            down_move = prev_low - low
+            plus = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+            minus = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+            plus[:, 0] = np.nan
+            minus[:, 0] = np.nan
+
+            atr = rma(true_range, 14)
+            plus_di = np.where(atr > 0, 100.0 * rma(plus, 14) / atr, 0.0)
+            minus_di = np.where(atr > 0, 100.0 * rma(minus, 14) / atr, 0.0)
+            di_sum = plus_di + minus_di
+            dx = np.where(di_sum > 0, 100.0 * np.abs(plus_di - minus_di) / di_sum, 0.0)
+            dx[np.isnan(atr)] = np.nan
+            out['adx'] = np.nan_to_num(rma(dx, 14), nan=25.0)
+
+    # المؤشرات غير النشطة بقيمها الافتراضية
+    for key in SERIES_KEYS:
+        if key not in out:
+            out[key] = _default_series(key, close)
+
+    return out
+
+
+def stack_panel(frames: Dict[Hashable, Union[pd.DataFrame, OHLCV]],
+                length: Optional[int] = None) -> Tuple[Dict[str, np.ndarray], List[Hashable]]:
+    """
+    تجميع عدة سلاسل OHLCV في لوحة ثنائية الأبعاد
+
+    يتم قص كل سلسلة إلى آخر length شمعة، وتُستبعد السلاسل الأقصر من ذلك
+
+    Parameters:
+        frames: قاموس مفتاح السلسلة -> حاوية OHLCV أو إطار بيانات
+        length: عدد الشموع لكل صف (الافتراضي أقصر سلسلة)
+
+    Returns:
+        Tuple: (قاموس عمود -> مصفوفة (السلاسل × الشموع)، قائمة مفاتيح الصفوف بالترتيب)
+        يتضمن القاموس عمود Date إذا كان موجوداً في جميع السلاسل، وتكون اللوحة فارغة
+        إذا لم تتبقَّ أي سلسلة
+    """
+    if not frames:
+        return {}, []
+
+    if length is None:
+        lengths = [len(frame) for frame in frames.values() if frame is not None]
+        if not lengths:
+            logger.warning("لا توجد سلاسل صالحة لتجميع اللوحة")
+            return {}, []
+        length = min(lengths)
+
+    keys = []
+    columns = {col: [] for col in OHLCV_COLUMNS}
+    dates = []
+    for key, frame in frames.items():
+        if frame is None or len(frame) < length:
+            logger.warning(f"استبعاد {key} من اللوحة: بيانات غير كافية")
+            continue
+        keys.append(key)
+        tail = OHLCV.from_any(frame).tail(length)
+        for col in OHLCV_COLUMNS:
+            columns[col].append(tail[col])
+        if tail.timestamp is not None:
+            dates.append(tail.timestamp)
+
+    if not keys:
+        return {}, []
+
+    panel = {col: np.vstack(rows) for col, rows in columns.items()}
+    if len(dates) == len(keys):
+        panel['Date'] = np.vstack(dates)
+    return panel, keys
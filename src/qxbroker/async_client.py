@@ -0,0 +1,264 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+عميل QXBroker غير المتزامن (asyncio) بمجمع اتصالات محدود مع إبقاء الاتصال
+
+واجهة HTTP المستخدمة:
+    POST {base_url}/auth/login      {"username", "password"} -> {"access_token", "expires_in"}
+    GET  {base_url}/prices?symbols=A,B -> {"prices": {"A": ..., "B": ...}}
+    GET  {base_url}/candles?symbol=&timeframe=&limit=
+         -> {"time": [...], "open": [...], "high": [...], "low": [...], "close": [...], "volume": [...]}
+         (الأوقات بالثواني منذ 1970، والأعمدة بنفس الطول)
+
+تسجيل الدخول وتجديد الرمز يتولاهما SessionManager في الخلفية كما في العميل المتزامن،
+فلا يقع تسجيل الدخول في مسار الطلبات
+"""
+
+import asyncio
+import logging
+from typing import Dict, Iterable, Optional
+
+import aiohttp
+import pandas as pd
+import requests
+
+from src.qxbroker.session import SessionManager
+from src.utils.cache import TTLCache
+from src.utils.config import load_config
+
+logger = logging.getLogger(__name__)
+
+# الحد الأقصى للاتصالات المفتوحة في المجمع
+DEFAULT_POOL_SIZE = 10
+
+# مهلة الطلب الواحد بالثواني
+DEFAULT_TIMEOUT = 10
+
+# مدة إبقاء الاتصال الخامل مفتوحاً لإعادة استخدامه
+KEEPALIVE_TIMEOUT = 30
+
+# إعادة المحاولة لأخطاء الخادم وتجاوز حد الطلبات، بتأخير متزايد يبدأ من RETRY_BACKOFF
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.2
+
+# أعمدة استجابة الشموع وأسماؤها في إطار البيانات
+CANDLE_FIELDS = {
+    'open': 'Open',
+    'high': 'High',
+    'low': 'Low',
+    'close': 'Close',
+    'volume': 'Volume',
+}
+
+
+class AsyncQXClient:
+    """
+    عميل QXBroker غير المتزامن
+
+    يوفر نفس واجهة QXClient (get_current_price و get_historical_data) كدوال async،
+    مع دوال مجمّعة لعدة أزواج: الأسعار بطلب واحد، والشموع بطلبات متوازية عبر
+    asyncio.gather، فيستغرق فحص جميع الأزواج زمن رحلة واحدة تقريباً بدلاً من رحلة لكل زوج
+    """
+
+    # صلاحية السعر الحالي في التخزين المؤقت بالثواني
+    PRICE_TTL = 5
+
+    def __init__(self, base_url: Optional[str] = None, pool_size: int = DEFAULT_POOL_SIZE,
+                 timeout: float = DEFAULT_TIMEOUT, auth: Optional[SessionManager] = None):
+        """
+        Parameters:
+            base_url: عنوان واجهة المنصة (الافتراضي عنوان auth أو QX_API_URL من الإعدادات)
+            pool_size: الحد الأقصى للاتصالات المتزامنة
+            timeout: مهلة الطلب الواحد بالثواني
+            auth: مدير جلسة مشترك (مثل QXClient().auth)، وإلا يُنشأ مدير خاص من الإعدادات
+        """
+        if auth is None:
+            config = load_config()
+            base_url = (base_url or config.QX_API_URL).rstrip('/')
+            auth = SessionManager(requests.Session(), base_url, config.QX_USERNAME, config.QX_PASSWORD,
+                                  timeout=timeout)
+            self._owns_auth = True
+        else:
+            self._owns_auth = False
+        self.auth = auth
+        self.base_url = (base_url or auth.base_url).rstrip('/')
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.cache = TTLCache()
+
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> 'AsyncQXClient':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    @property
+    def is_logged_in(self) -> bool:
+        """هل توجد جلسة صالحة؟"""
+        return self.auth.current() is not None
+
+    @property
+    def access_token(self) -> Optional[str]:
+        """رمز الوصول للجلسة الحالية أو None"""
+        session = self.auth.current()
+        return session.token if session is not None else None
+
+    async def start(self):
+        """فتح جلسة HTTP بمجمع اتصالات محدود وبدء مدير الجلسة (يُستدعى تلقائياً عند أول طلب)"""
+        self.auth.start()
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=KEEPALIVE_TIMEOUT)
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+
+    async def close(self):
+        """إغلاق الجلسة وجميع اتصالات المجمع (وإيقاف مدير الجلسة إذا كان خاصاً بالعميل)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self._owns_auth:
+            self.auth.stop()
+
+    async def login(self, timeout: Optional[float] = None) -> bool:
+        """
+        انتظار أول جلسة صالحة من مدير الجلسة (للتهيئة فقط، وليس لمسار الطلبات)
+
+        الانتظار يتم في خيط منفصل فلا يوقف حلقة asyncio
+
+        Parameters:
+            timeout: أقصى مدة انتظار بالثواني (None بلا حد)
+
+        Returns:
+            bool: True إذا توفرت جلسة صالحة
+        """
+        await self.start()
+        return await asyncio.get_running_loop().run_in_executor(None, self.auth.wait, timeout)
+
+    async def _get(self, path: str, params: Optional[dict] = None) -> dict:
+        """
+        طلب GET بآخر جلسة صالحة
+
+        إذا رُفض الرمز يُطلب التجديد في الخلفية، ويُعاد الطلب مرة واحدة فقط إذا كانت جلسة
+        أحدث متاحة بالفعل (دون انتظار تسجيل الدخول). يعيد المحاولة حتى MAX_RETRIES لأخطاء
+        الخادم وتجاوز حد الطلبات (مع احترام Retry-After)
+
+        Raises:
+            ConnectionError: إذا لم توجد جلسة صالحة
+            aiohttp.ClientError: عند فشل الطلب
+        """
+        await self.start()
+        session = self.auth.current()
+        if session is None:
+            raise ConnectionError("لا توجد جلسة صالحة لـ QXBroker بعد")
+
+        renewed = False
+        attempt = 0
+        while True:
+            async with self._session.get(f"{self.base_url}{path}", params=params,
+                                         headers=session.headers) as response:
+                if response.status == 401 and not renewed:
+                    renewed = True
+                    self.auth.invalidate(session.token)
+                    newer = self.auth.current()
+                    if newer is None or newer.token == session.token:
+                        raise ConnectionError("انتهت صلاحية رمز الوصول، جارٍ التجديد في الخلفية")
+                    session = newer
+                    continue
+
+                if response.status in RETRY_STATUSES and attempt < MAX_RETRIES:
+                    retry_after = response.headers.get('Retry-After')
+                    delay = float(retry_after) if retry_after else RETRY_BACKOFF * 2 ** attempt
+                    attempt += 1
+                    logger.debug(f"إعادة محاولة {path} بعد {delay} ثانية (الحالة {response.status})")
+                else:
+                    response.raise_for_status()
+                    return await response.json()
+            await asyncio.sleep(delay)
+
+    async def get_current_price(self, symbol: str) -> Optional[float]:
+        """
+        الحصول على السعر الحالي للزوج المحدد
+
+        Parameters:
+            symbol: رمز الزوج (مثل BTCUSDT)
+
+        Returns:
+            float: السعر الحالي أو None في حالة الفشل
+        """
+        return (await self.get_current_prices([symbol]))[symbol]
+
+    async def get_historical_data(self, symbol: str, timeframe: str, limit: int = 50) -> Optional[pd.DataFrame]:
+        """
+        الحصول على البيانات التاريخية للزوج والإطار الزمني المحدد
+
+        Parameters:
+            symbol: رمز الزوج (مثل BTCUSDT)
+            timeframe: الإطار الزمني (مثل 1h, 4h)
+            limit: عدد الشموع المطلوبة
+
+        Returns:
+            DataFrame: إطار بيانات يحتوي على البيانات التاريخية أو None في حالة الفشل
+        """
+        try:
+            payload = await self._get(
+                "/candles", params={'symbol': symbol, 'timeframe': timeframe, 'limit': limit}
+            )
+            data = pd.DataFrame({name: payload[field] for field, name in CANDLE_FIELDS.items()}, dtype=float)
+            data['Date'] = pd.to_datetime(payload['time'], unit='s')
+            return data
+
+        except Exception as e:
+            logger.error(f"خطأ أثناء الحصول على البيانات التاريخية لـ {symbol}: {str(e)}")
+            return None
+
+    async def get_current_prices(self, symbols: Iterable[str]) -> Dict[str, Optional[float]]:
+        """
+        الحصول على أسعار عدة أزواج بطلب واحد (للأزواج غير المخزنة مؤقتاً فقط)
+
+        Parameters:
+            symbols: رموز الأزواج
+
+        Returns:
+            Dict[str, Optional[float]]: السعر لكل زوج (None عند فشل الطلب)
+        """
+        prices = {symbol: self.cache.get(f"price_{symbol}") for symbol in symbols}
+        missing = [symbol for symbol, price in prices.items() if price is None]
+        if not missing:
+            return prices
+
+        try:
+            payload = await self._get("/prices", params={'symbols': ','.join(missing)})
+            for symbol in missing:
+                price = payload['prices'].get(symbol)
+                if price is not None:
+                    prices[symbol] = float(price)
+                    self.cache.set(f"price_{symbol}", prices[symbol], ttl=self.PRICE_TTL)
+
+        except Exception as e:
+            logger.error(f"خطأ أثناء الحصول على أسعار الأزواج: {str(e)}")
+
+        return prices
+
+    async def get_historical_data_many(self, symbols: Iterable[str], timeframe: str,
+                                       limit: int = 50) -> Dict[str, Optional[pd.DataFrame]]:
+        """
+        الحصول على البيانات التاريخية لعدة أزواج بطلبات متوازية
+
+        Parameters:
+            symbols: رموز الأزواج
+            timeframe: الإطار الزمني
+            limit: عدد الشموع لكل زوج
+
+        Returns:
+            Dict[str, Optional[DataFrame]]: البيانات لكل زوج (None للطلبات الفاشلة)
+        """
+        symbols = list(symbols)
+        frames = await asyncio.gather(
+            *(self.get_historical_data(symbol, timeframe, limit) for symbol in symbols)
+        )
+        return dict(zip(symbols, frames))
@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+أرشيف الشموع على القرص: ملف إلحاق بسجلات ثابتة الطول لكل (زوج، إطار زمني)
+يُقرأ عبر mmap دون تحميل البيانات إلى كائنات بايثون، مع فهرس زمني للاستعلام عن النطاقات
+
+الشموع الأقدم من بداية الأرشيف (جلب تاريخي أعمق) تُضاف بإعادة كتابة الملف، وهذا نادر
+"""
+
+import logging
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.ohlcv import OHLCV
+
+logger = logging.getLogger(__name__)
+
+# ترويسة الملف: توقيع الصيغة (8 بايت) + طول السجل (8 بايت)
+ARCHIVE_MAGIC = b'QXCNDL01'
+HEADER_SIZE = 16
+
+# السجل: الوقت بالنانوثانية منذ 1970 ثم الأسعار والحجم
+CANDLE_DTYPE = np.dtype([
+    ('timestamp', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+])
+
+# الفهرس الزمني يحتفظ بوقت سجل واحد من كل INDEX_STRIDE سجل
+INDEX_STRIDE = 1024
+
+
+def _header() -> bytes:
+    """ترويسة ملف الأرشيف"""
+    return ARCHIVE_MAGIC + np.uint64(CANDLE_DTYPE.itemsize).tobytes()
+
+
+def _to_records(data: OHLCV, timestamps: np.ndarray, start: int, end: int) -> np.ndarray:
+    """الشموع [start, end) كسجلات الأرشيف"""
+    records = np.empty(end - start, dtype=CANDLE_DTYPE)
+    records['timestamp'] = timestamps[start:end]
+    records['open'] = data.open[start:end]
+    records['high'] = data.high[start:end]
+    records['low'] = data.low[start:end]
+    records['close'] = data.close[start:end]
+    records['volume'] = data.volume[start:end]
+    return records
+
+
+class CandleArchiveFile:
+    """
+    ملف أرشيف لسلسلة واحدة
+
+    السجلات مرتبة زمنياً (تُقبل الشموع الأحدث من النهاية والأقدم من البداية فقط)، لذا يكفي فهرس متناثر
+    في الذاكرة مع بحث ثنائي داخل الكتلة للعثور على أي نطاق زمني
+    """
+
+    def __init__(self, path: str):
+        """
+        Parameters:
+            path: مسار الملف (يُنشأ إذا لم يكن موجوداً)
+        """
+        self.path = path
+        self._records: Optional[np.memmap] = None
+        self._index = np.empty(0, dtype='<i8')
+        self._lock = threading.Lock()
+
+        if not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(_header())
+        else:
+            with open(path, 'rb') as f:
+                header = f.read(HEADER_SIZE)
+            if header[:8] != ARCHIVE_MAGIC or int(np.frombuffer(header[8:], '<u8')[0]) != CANDLE_DTYPE.itemsize:
+                raise ValueError(f"صيغة ملف أرشيف غير معروفة: {path}")
+
+        self._remap()
+
+    def _remap(self):
+        """إعادة ربط الملف بالذاكرة بعد تغيّر حجمه (السجل الناقص في النهاية يُتجاهل)"""
+        count = (os.path.getsize(self.path) - HEADER_SIZE) // CANDLE_DTYPE.itemsize
+        if count <= 0:
+            self._records = None
+            self._index = np.empty(0, dtype='<i8')
+            return
+
+        self._records = np.memmap(self.path, dtype=CANDLE_DTYPE, mode='r',
+                                  offset=HEADER_SIZE, shape=(count,))
+        # الفهرس يقرأ صفحة واحدة لكل INDEX_STRIDE سجل
+        self._index = np.array(self._records['timestamp'][::INDEX_STRIDE])
+
+    def __len__(self) -> int:
+        return len(self._records) if self._records is not None else 0
+
+    @property
+    def last_timestamp(self) -> Optional[np.datetime64]:
+        """وقت آخر شمعة في الأرشيف"""
+        if not len(self):
+            return None
+        return np.datetime64(int(self._records['timestamp'][-1]), 'ns')
+
+    def append(self, data: Union[pd.DataFrame, OHLCV]) -> int:
+        """
+        إلحاق الشموع الأحدث من آخر شمعة محفوظة، وإضافة الأقدم من أول شمعة محفوظة في البداية
+
+        Parameters:
+            data: حاوية OHLCV أو إطار بيانات بعمود Date
+
+        Returns:
+            int: عدد السجلات المضافة
+        """
+        data = OHLCV.from_any(data)
+        if data.timestamp is None or not len(data):
+            return 0
+
+        timestamps = np.asarray(data.timestamp, dtype='datetime64[ns]').astype('<i8')
+        with self._lock:
+            older, start = 0, 0
+            if len(self):
+                older = int(np.searchsorted(timestamps, self._records['timestamp'][0], side='left'))
+                start = int(np.searchsorted(timestamps, self._records['timestamp'][-1], side='right'))
+
+            added = 0
+            if older:
+                self._prepend(_to_records(data, timestamps, 0, older))
+                added += older
+            if start < len(timestamps):
+                with open(self.path, 'ab') as f:
+                    f.write(_to_records(data, timestamps, start, len(timestamps)).tobytes())
+                self._remap()
+                added += len(timestamps) - start
+            return added
+
+    def _prepend(self, records: np.ndarray):
+        """إضافة سجلات أقدم من أول سجل بإعادة كتابة الملف (الاستبدال ذري)"""
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(_header())
+            f.write(records.tobytes())
+            if self._records is not None:
+                f.write(np.asarray(self._records).tobytes())
+        self._records = None
+        os.replace(temp_path, self.path)
+        self._remap()
+
+    def _locate(self, timestamp: np.int64, side: str) -> int:
+        """موضع الوقت في السجلات باستخدام الفهرس المتناثر ثم البحث داخل الكتلة"""
+        block = max(int(np.searchsorted(self._index, timestamp, side=side)) - 1, 0)
+        lo = block * INDEX_STRIDE
+        hi = min(lo + 2 * INDEX_STRIDE, len(self))
+        return lo + int(np.searchsorted(self._records['timestamp'][lo:hi], timestamp, side=side))
+
+    def _view(self, start: int, end: int) -> OHLCV:
+        """عرض السجلات [start, end) كحاوية OHLCV على ذاكرة الملف دون نسخ"""
+        records = self._records[start:end]
+        return OHLCV(records['open'], records['high'], records['low'], records['close'],
+                     records['volume'], records['timestamp'].view('datetime64[ns]'))
+
+    def range(self, start=None, end=None) -> Optional[OHLCV]:
+        """
+        الشموع ضمن نطاق زمني [start, end]
+
+        Parameters:
+            start: بداية النطاق (None من أول الأرشيف)
+            end: نهاية النطاق (None حتى آخر الأرشيف)
+
+        Returns:
+            OHLCV: حاوية على ذاكرة الملف، أو None إذا كان الأرشيف فارغاً
+        """
+        with self._lock:
+            if not len(self):
+                return None
+            lo = 0 if start is None else self._locate(np.datetime64(start, 'ns').astype('<i8'), 'left')
+            hi = len(self) if end is None else self._locate(np.datetime64(end, 'ns').astype('<i8'), 'right')
+            return self._view(lo, max(lo, hi))
+
+    def tail(self, n: int) -> Optional[OHLCV]:
+        """آخر n شمعة من الأرشيف"""
+        with self._lock:
+            if not len(self):
+                return None
+            return self._view(max(len(self) - n, 0), len(self))
+
+
+class CandleArchive:
+    """أرشيف الشموع لجميع السلاسل داخل مجلد واحد (ملف لكل زوج وإطار زمني)"""
+
+    FILE_SUFFIX = '.candles'
+
+    def __init__(self, root: str):
+        """
+        Parameters:
+            root: مجلد الأرشيف (يُنشأ إذا لم يكن موجوداً)
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._files: Dict[Tuple[str, str], CandleArchiveFile] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, symbol: str, timeframe: str) -> str:
+        safe = re.sub(r'[^A-Za-z0-9]', '', symbol)
+        return os.path.join(self.root, f"{safe}_{timeframe}{self.FILE_SUFFIX}")
+
+    def file(self, symbol: str, timeframe: str) -> CandleArchiveFile:
+        """ملف أرشيف السلسلة (يُفتح أو يُنشأ عند أول استخدام)"""
+        key = (symbol, timeframe)
+        with self._lock:
+            archive = self._files.get(key)
+            if archive is None:
+                archive = self._files[key] = CandleArchiveFile(self._path(symbol, timeframe))
+            return archive
+
+    def series(self) -> List[Tuple[str, str]]:
+        """
+        السلاسل المحفوظة في المجلد
+
+        Returns:
+            List[Tuple[str, str]]: قائمة (الزوج، الإطار الزمني)
+        """
+        result = []
+        for name in sorted(os.listdir(self.root)):
+            if name.endswith(self.FILE_SUFFIX):
+                symbol, _, timeframe = name[:-len(self.FILE_SUFFIX)].rpartition('_')
+                if symbol and timeframe:
+                    result.append((symbol, timeframe))
+        return result
+
+    def append(self, symbol: str, timeframe: str, data: Union[pd.DataFrame, OHLCV]) -> int:
+        """إلحاق الشموع الجديدة بأرشيف السلسلة"""
+        return self.file(symbol, timeframe).append(data)
+
+    def range(self, symbol: str, timeframe: str, start=None, end=None) -> Optional[OHLCV]:
+        """الشموع ضمن نطاق زمني للسلسلة"""
+        return self.file(symbol, timeframe).range(start, end)
+
+    def tail(self, symbol: str, timeframe: str, n: int) -> Optional[OHLCV]:
+        """آخر n شمعة للسلسلة"""
+        return self.file(symbol, timeframe).tail(n)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+مخزن الشموع العمودي بمخازن حلقية ثابتة السعة لكل (زوج، إطار زمني)
+"""
+
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.ohlcv import OHLCV
+
+logger = logging.getLogger(__name__)
+
+# السعة الافتراضية لكل سلسلة (عدد الشموع المغلقة المحفوظة)
+DEFAULT_CAPACITY = 1000
+
+# ترتيب الأعمدة الرقمية في المصفوفة الداخلية
+PRICE_COLUMNS = ('Open', 'High', 'Low', 'Close', 'Volume')
+
+
+class CandleBuffer:
+    """
+    مخزن حلقي عمودي لسلسلة شموع واحدة
+
+    كل شمعة تُكتب مرتين (في الموضع i و i + capacity)، فتكون أي نافذة من آخر
+    الشموع متصلة في الذاكرة وتُقرأ كعرض دون نسخ، والإضافة بتكلفة ثابتة.
+    العرض المقروء يبقى صالحاً حتى تُضاف (capacity - طول النافذة) شمعة جديدة
+    """
+
+    __slots__ = ('capacity', 'count', '_prices', '_timestamps', '_pos')
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """
+        Parameters:
+            capacity: الحد الأقصى لعدد الشموع المحفوظة
+        """
+        self.capacity = capacity
+        self.count = 0
+        self._prices = np.zeros((len(PRICE_COLUMNS), 2 * capacity))
+        self._timestamps = np.zeros(2 * capacity, dtype='datetime64[ns]')
+        self._pos = 0
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    @property
+    def nbytes(self) -> int:
+        """حجم ذاكرة المخزن بالبايت"""
+        return self._prices.nbytes + self._timestamps.nbytes
+
+    @property
+    def last_timestamp(self) -> Optional[np.datetime64]:
+        """وقت آخر شمعة محفوظة"""
+        if not self.count:
+            return None
+        return self._timestamps[self._pos + self.capacity - 1]
+
+    def append(self, timestamp, open: float, high: float, low: float, close: float,
+               volume: float = 0.0) -> bool:
+        """
+        إضافة شمعة مغلقة بتكلفة ثابتة
+
+        Parameters:
+            timestamp: وقت الشمعة
+            open: سعر الافتتاح
+            high: أعلى سعر
+            low: أدنى سعر
+            close: سعر الإغلاق
+            volume: الحجم
+
+        Returns:
+            bool: True إذا أضيفت، False إذا لم تكن أحدث من آخر شمعة
+        """
+        timestamp = np.datetime64(timestamp, 'ns')
+        last = self.last_timestamp
+        if last is not None and timestamp <= last:
+            return False
+
+        i = self._pos
+        j = i + self.capacity
+        row = (open, high, low, close, volume)
+        self._prices[:, i] = row
+        self._prices[:, j] = row
+        self._timestamps[i] = timestamp
+        self._timestamps[j] = timestamp
+
+        self._pos = (i + 1) % self.capacity
+        self.count += 1
+        return True
+
+    def extend(self, timestamps: np.ndarray, prices: np.ndarray) -> int:
+        """
+        إضافة مجموعة من الشموع المرتبة زمنياً (الأقدم من آخر شمعة محفوظة يُتجاهل)
+
+        Parameters:
+            timestamps: أوقات الشموع
+            prices: مصفوفة (5 × عدد الشموع) بترتيب PRICE_COLUMNS
+
+        Returns:
+            int: عدد الشموع المضافة
+        """
+        timestamps = np.asarray(timestamps, dtype='datetime64[ns]')
+        last = self.last_timestamp
+        if last is not None:
+            start = int(np.searchsorted(timestamps, last, side='right'))
+            timestamps = timestamps[start:]
+            prices = prices[:, start:]
+
+        # لا فائدة من كتابة أكثر من السعة
+        if len(timestamps) > self.capacity:
+            timestamps = timestamps[-self.capacity:]
+            prices = prices[:, -self.capacity:]
+
+        n = len(timestamps)
+        if not n:
+            return 0
+
+        # الكتابة على جزأين عند الالتفاف حول نهاية المخزن
+        first = min(n, self.capacity - self._pos)
+        for a, b in ((0, first), (first, n)):
+            if a == b:
+                continue
+            i = (self._pos + a) % self.capacity
+            for base in (i, i + self.capacity):
+                self._prices[:, base:base + b - a] = prices[:, a:b]
+                self._timestamps[base:base + b - a] = timestamps[a:b]
+
+        self._pos = (self._pos + n) % self.capacity
+        self.count += n
+        return n
+
+    def window(self, n: Optional[int] = None) -> OHLCV:
+        """
+        آخر n شمعة كحاوية OHLCV تشير إلى ذاكرة المخزن دون نسخ
+
+        Parameters:
+            n: عدد الشموع (الافتراضي جميع الشموع المحفوظة)
+
+        Returns:
+            OHLCV: حاوية للقراءة فقط
+        """
+        size = len(self)
+        n = size if n is None else max(0, min(n, size))
+        end = self._pos + self.capacity
+        start = end - n
+        p = self._prices
+        return OHLCV(p[0, start:end], p[1, start:end], p[2, start:end], p[3, start:end],
+                     p[4, start:end], self._timestamps[start:end])
+
+
+class CandleStore:
+    """مخازن الشموع الحلقية لكل (زوج، إطار زمني)"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """
+        Parameters:
+            capacity: سعة كل سلسلة
+        """
+        self.capacity = capacity
+        self._buffers: Dict[Tuple[str, str], CandleBuffer] = {}
+        self._lock = threading.Lock()
+
+    def _buffer(self, symbol: str, timeframe: str) -> CandleBuffer:
+        """المخزن الخاص بالسلسلة (يُنشأ عند أول استخدام)"""
+        key = (symbol, timeframe)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = CandleBuffer(self.capacity)
+        return buffer
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._buffers
+
+    def series(self) -> List[Tuple[str, str]]:
+        """جميع السلاسل المخزنة (الزوج، الإطار الزمني)"""
+        with self._lock:
+            return list(self._buffers)
+
+    def length(self, symbol: str, timeframe: str) -> int:
+        """عدد الشموع المحفوظة للسلسلة"""
+        buffer = self._buffers.get((symbol, timeframe))
+        return len(buffer) if buffer is not None else 0
+
+    def nbytes(self, symbol: str, timeframe: str) -> int:
+        """حجم ذاكرة السلسلة بالبايت"""
+        buffer = self._buffers.get((symbol, timeframe))
+        return buffer.nbytes if buffer is not None else 0
+
+    def last_timestamp(self, symbol: str, timeframe: str) -> Optional[np.datetime64]:
+        """وقت آخر شمعة في السلسلة"""
+        buffer = self._buffers.get((symbol, timeframe))
+        return buffer.last_timestamp if buffer is not None else None
+
+    def append(self, symbol: str, timeframe: str, timestamp, open: float, high: float,
+               low: float, close: float, volume: float = 0.0) -> bool:
+        """
+        إضافة شمعة مغلقة إلى السلسلة
+
+        Returns:
+            bool: True إذا أضيفت الشمعة
+        """
+        with self._lock:
+            return self._buffer(symbol, timeframe).append(timestamp, open, high, low, close, volume)
+
+    def load(self, symbol: str, timeframe: str, data: Union[pd.DataFrame, OHLCV]) -> int:
+        """
+        إضافة شموع مرتبة زمنياً (إطار بيانات بعمود Date أو حاوية OHLCV بأوقات) إلى السلسلة
+
+        Parameters:
+            symbol: رمز الزوج
+            timeframe: الإطار الزمني
+            data: الشموع
+
+        Returns:
+            int: عدد الشموع المضافة
+        """
+        data = OHLCV.from_any(data)
+        prices = np.vstack([data.open, data.high, data.low, data.close, data.volume])
+        with self._lock:
+            return self._buffer(symbol, timeframe).extend(data.timestamp, prices)
+
+    def window(self, symbol: str, timeframe: str, n: Optional[int] = None) -> Optional[OHLCV]:
+        """
+        آخر n شمعة للسلسلة دون نسخ
+
+        Returns:
+            OHLCV: حاوية للقراءة فقط، أو None إذا لم تكن السلسلة موجودة
+        """
+        with self._lock:
+            buffer = self._buffers.get((symbol, timeframe))
+            if buffer is None or not len(buffer):
+                return None
+            return buffer.window(n)
+
+    def clear(self, symbol: Optional[str] = None, timeframe: Optional[str] = None):
+        """حذف سلسلة محددة أو جميع السلاسل"""
+        with self._lock:
+            if symbol is None:
+                self._buffers.clear()
+            else:
+                self._buffers.pop((symbol, timeframe), None)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+استيراد وتصدير الشموع والإشارات بصيغ عمودية (Parquet أو Arrow IPC)
+
+الصيغة تُحدد من امتداد الملف (.parquet أو .arrow/.feather/.ipc). القراءة عبر
+pyarrow.dataset مع تمرير شروط الزوج والإطار الزمني والفترة الزمنية إلى القارئ، فتُتخطى
+مجموعات الصفوف غير المطلوبة في Parquet دون قراءتها. pyarrow ضمن المتطلبات، وإذا
+لم تكن مثبتة (مثل بيئة تطوير جزئية) ترفع الدوال ImportError برسالة واضحة
+"""
+
+import logging
+import os
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.ohlcv import OHLCV
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# عدد الصفوف في كل مجموعة صفوف Parquet (وحدة التخطي عند التصفية)
+ROW_GROUP_SIZE = 64 * 1024
+
+# أعمدة الأسعار في ملفات الشموع
+CANDLE_PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+# حقول الإشارة -> (اسم العمود، النوع)
+SIGNAL_COLUMNS = {
+    "id": ('id', 'string'),
+    "الزوج": ('symbol', 'string'),
+    "الإطار_الزمني": ('timeframe', 'string'),
+    "نوع": ('signal_type', 'string'),
+    "الاتجاه": ('direction', 'string'),
+    "نقطة_الدخول": ('entry_price', 'float64'),
+    "وقف_الخسارة": ('stop_loss', 'float64'),
+    "الهدف": ('take_profit', 'float64'),
+    "الهدف_الثاني": ('take_profit2', 'float64'),
+    "نسبة_الثقة": ('confidence', 'int64'),
+    "المؤشرات": ('indicators', 'string'),
+    "الأنماط": ('patterns', 'string'),
+    "التحليل": ('analysis', 'string'),
+}
+
+
+def _require_pyarrow():
+    """التأكد من توفر pyarrow"""
+    if pa is None:
+        raise ImportError("استيراد وتصدير Parquet/Arrow يتطلب تثبيت pyarrow")
+
+
+def _file_format(path: str) -> str:
+    """صيغة الملف من امتداده"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.arrow', '.feather', '.ipc'):
+        return 'ipc'
+    return 'parquet'
+
+
+def _write_table(table, path: str, row_group_size: int = ROW_GROUP_SIZE):
+    """كتابة الجدول بصيغة الملف"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if _file_format(path) == 'ipc':
+        feather.write_feather(table, path, chunksize=row_group_size)
+    else:
+        pq.write_table(table, path, row_group_size=row_group_size)
+
+
+def _timestamp(value):
+    """تحويل وقت (نص أو datetime أو datetime64) إلى قيمة Arrow بدقة النانو ثانية"""
+    return pa.scalar(np.datetime64(pd.Timestamp(value).to_datetime64(), 'ns'), pa.timestamp('ns'))
+
+
+def _read_table(path: str, symbols=None, timeframes=None, start=None, end=None, time_column='timestamp'):
+    """قراءة الجدول مع تمرير شروط التصفية إلى القارئ"""
+    _require_pyarrow()
+    conditions = []
+    if symbols is not None:
+        conditions.append(ds.field('symbol').isin(list(symbols)))
+    if timeframes is not None:
+        conditions.append(ds.field('timeframe').isin(list(timeframes)))
+    if start is not None:
+        conditions.append(ds.field(time_column) >= _timestamp(start))
+    if end is not None:
+        conditions.append(ds.field(time_column) <= _timestamp(end))
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return ds.dataset(path, format=_file_format(path)).to_table(filter=expression)
+
+
+def _encode(column) -> Tuple[np.ndarray, list]:
+    """رموز عددية وقائمة القيم لعمود نصي (بدون تحويل كل صف إلى كائن Python)"""
+    column = column.combine_chunks()
+    if not pa.types.is_dictionary(column.type):
+        column = pc.dictionary_encode(column)
+    return column.indices.to_numpy(), column.dictionary.to_pylist()
+
+
+def write_candles(series: Mapping[Tuple[str, str], OHLCV], path: str,
+                  row_group_size: int = ROW_GROUP_SIZE) -> int:
+    """
+    تصدير سلاسل الشموع إلى ملف واحد مرتب حسب (الزوج، الإطار، الوقت)
+
+    Parameters:
+        series: قاموس (الزوج، الإطار الزمني) -> حاوية OHLCV بأوقات
+        path: مسار الملف
+        row_group_size: عدد الصفوف في كل مجموعة صفوف
+
+    Returns:
+        int: عدد الشموع المصدرة
+    """
+    _require_pyarrow()
+    keys = sorted(key for key, data in series.items() if data is not None and len(data))
+    lengths = [len(series[key]) for key in keys]
+
+    def column(attr):
+        return np.concatenate([getattr(series[key], attr) for key in keys]) if keys else np.zeros(0)
+
+    symbols = sorted({symbol for symbol, _ in keys})
+    timeframes = sorted({timeframe for _, timeframe in keys})
+    symbol_codes = np.repeat([symbols.index(symbol) for symbol, _ in keys], lengths).astype(np.int32)
+    timeframe_codes = np.repeat([timeframes.index(tf) for _, tf in keys], lengths).astype(np.int32)
+    timestamps = column('timestamp').astype('datetime64[ns]') if keys else np.zeros(0, dtype='datetime64[ns]')
+
+    table = pa.table({
+        'symbol': pa.DictionaryArray.from_arrays(symbol_codes, pa.array(symbols, pa.string())),
+        'timeframe': pa.DictionaryArray.from_arrays(timeframe_codes, pa.array(timeframes, pa.string())),
+        'timestamp': pa.array(timestamps, pa.timestamp('ns')),
+        **{name: pa.array(column(name), pa.float64()) for name in CANDLE_PRICE_COLUMNS},
+    })
+    _write_table(table, path, row_group_size)
+    logger.info(f"تم تصدير {table.num_rows} شمعة من {len(keys)} سلسلة إلى {path}")
+    return table.num_rows
+
+
+def read_candles(path: str, symbols: Optional[Iterable[str]] = None, timeframes: Optional[Iterable[str]] = None,
+                 start=None, end=None) -> Dict[Tuple[str, str], OHLCV]:
+    """
+    قراءة الشموع من ملف Parquet/Arrow كسلاسل OHLCV
+
+    Parameters:
+        path: مسار الملف
+        symbols: الأزواج المطلوبة (None للجميع)
+        timeframes: الأطر المطلوبة (None للجميع)
+        start: بداية الفترة (شاملة)
+        end: نهاية الفترة (شاملة)
+
+    Returns:
+        Dict: قاموس (الزوج، الإطار الزمني) -> حاوية OHLCV مرتبة زمنياً
+    """
+    table = _read_table(path, symbols, timeframes, start, end)
+    if not table.num_rows:
+        return {}
+
+    # ترتيب الصفوف حسب السلسلة ثم الوقت، ثم تقسيمها عند حدود السلاسل
+    table = table.combine_chunks()
+    symbol_codes, symbol_names = _encode(table['symbol'])
+    timeframe_codes, timeframe_names = _encode(table['timeframe'])
+    timestamps = table['timestamp'].to_numpy().astype('datetime64[ns]')
+
+    order = np.lexsort((timestamps, timeframe_codes, symbol_codes))
+    symbol_codes, timeframe_codes, timestamps = symbol_codes[order], timeframe_codes[order], timestamps[order]
+    prices = {name: table[name].to_numpy()[order] for name in CANDLE_PRICE_COLUMNS}
+
+    boundaries = np.flatnonzero(
+        (np.diff(symbol_codes) != 0) | (np.diff(timeframe_codes) != 0)
+    ) + 1
+    starts = np.concatenate([[0], boundaries])
+    ends = np.concatenate([boundaries, [len(order)]])
+
+    result = {}
+    for i, j in zip(starts, ends):
+        key = (symbol_names[symbol_codes[i]], timeframe_names[timeframe_codes[i]])
+        result[key] = OHLCV(
+            prices['open'][i:j], prices['high'][i:j], prices['low'][i:j], prices['close'][i:j],
+            prices['volume'][i:j], timestamps[i:j]
+        )
+    return result
+
+
+def write_signals(signals: Iterable[Dict[str, Any]], path: str) -> int:
+    """
+    تصدير الإشارات إلى ملف Parquet/Arrow
+
+    Parameters:
+        signals: الإشارات بعد توليد نصوصها (render_signal_fields)
+        path: مسار الملف
+
+    Returns:
+        int: عدد الإشارات المصدرة
+    """
+    _require_pyarrow()
+    frame = pd.DataFrame(list(signals), columns=list(SIGNAL_COLUMNS) + ["الوقت"])
+    table = pa.table({
+        **{name: pa.array(frame[key].tolist(), getattr(pa, dtype)()) for key, (name, dtype) in SIGNAL_COLUMNS.items()},
+        'time': pa.array(pd.to_datetime(frame["الوقت"]).to_numpy().astype('datetime64[ns]'), pa.timestamp('ns')),
+    })
+    _write_table(table, path)
+    logger.info(f"تم تصدير {table.num_rows} إشارة إلى {path}")
+    return table.num_rows
+
+
+def read_signals(path: str, symbols: Optional[Iterable[str]] = None, timeframes: Optional[Iterable[str]] = None,
+                 start=None, end=None) -> pd.DataFrame:
+    """
+    قراءة الإشارات المصدرة
+
+    Returns:
+        DataFrame: إطار بيانات بأعمدة SIGNAL_COLUMNS و time
+    """
+    return _read_table(path, symbols, timeframes, start, end, time_column='time').to_pandas()
@@ -0,0 +1,400 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+خادم QXBroker محلي بديل لاختبارات الأداء والشبكة دون اتصال بالمنصة
+
+يوفر نفس واجهة HTTP التي يستخدمها العميلان (انظر async_client) مع بث الأسعار:
+    POST /auth/login                 تسجيل الدخول -> {"access_token", "expires_in"}
+    GET  /prices/{symbol}            سعر زوج واحد
+    GET  /prices?symbols=A,B         أسعار عدة أزواج -> {"prices": {...}}
+    GET  /candles?symbol=&timeframe=&limit=
+    GET  /stream?symbols=A,B         بث NDJSON للأسعار (سطر JSON لكل تحديث)
+    GET  /ws                         بث الأسعار عبر websocket
+
+مع زمن استجابة وتذبذب ونسبة أخطاء وحد للطلبات قابلة للضبط.
+
+التشغيل:
+    python -m src.qxbroker.fake_server --port 8080 --latency 0.05 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Set
+
+import numpy as np
+from aiohttp import web
+
+from src.qxbroker.simulator import MarketSimulator, symbol_profile, SYMBOL_PROFILES, SECONDS_PER_YEAR
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FakeBrokerSettings:
+    """إعدادات سلوك الخادم البديل"""
+    latency: float = 0.05  # زمن الاستجابة الأساسي بالثواني
+    jitter: float = 0.0  # تذبذب زمن الاستجابة (± بالثواني)
+    error_rate: float = 0.0  # نسبة الطلبات التي تُرفض بالخطأ 503
+    rate_limit: float = 0.0  # الطلبات المسموحة في الثانية لكل عميل (0 بلا حد)
+    token_ttl: float = 3600  # صلاحية رمز الوصول بالثواني
+    tick_interval: float = 1.0  # الفترة بين تحديثات الأسعار المبثوثة بالثواني
+    max_candles: int = 100000  # الحد الأقصى للشموع في طلب واحد
+    username: Optional[str] = None  # اسم المستخدم المقبول (None يقبل أي مستخدم)
+    password: Optional[str] = None  # كلمة المرور المقبولة
+    seed: Optional[int] = None  # بذرة الأسعار والشموع والأخطاء
+
+
+class FakeBroker:
+    """
+    خادم QXBroker بديل مبني على aiohttp
+
+    يمكن تشغيله داخل حلقة asyncio قائمة (start/stop) أو في خيط مستقل لاختبار
+    العميل المتزامن (run_in_thread/stop_thread)
+    """
+
+    def __init__(self, settings: Optional[FakeBrokerSettings] = None):
+        """
+        Parameters:
+            settings: إعدادات الخادم (الافتراضية عند عدم التحديد)
+        """
+        self.settings = settings or FakeBrokerSettings()
+        self.simulator = MarketSimulator(seed=self.settings.seed)
+        self._random = random.Random(self.settings.seed)
+        self._rng = np.random.default_rng(self.settings.seed)
+
+        self.prices: Dict[str, float] = {symbol: profile.base_price for symbol, profile in SYMBOL_PROFILES.items()}
+        self._tokens: Dict[str, float] = {}
+        self._buckets: Dict[str, list] = {}
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._streams: Set[asyncio.Task] = set()
+
+        self.stats = {'requests': 0, 'logins': 0, 'errors': 0, 'rate_limited': 0, 'unauthorized': 0}
+
+        self._runner: Optional[web.AppRunner] = None
+        self._ticker: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.base_url: Optional[str] = None
+
+    # ---- التطبيق ----
+
+    def create_app(self) -> web.Application:
+        """إنشاء تطبيق aiohttp بالمسارات والوسطاء"""
+        app = web.Application(middlewares=[self._network_middleware])
+        app.add_routes([
+            web.post('/auth/login', self._login),
+            web.get('/prices', self._prices),
+            web.get('/prices/{symbol}', self._price),
+            web.get('/candles', self._candles),
+            web.get('/stream', self._stream),
+            web.get('/ws', self._websocket),
+        ])
+        return app
+
+    @web.middleware
+    async def _network_middleware(self, request: web.Request, handler):
+        """محاكاة الشبكة: زمن الاستجابة، ثم حد الطلبات، ثم الأخطاء العشوائية"""
+        settings = self.settings
+        self.stats['requests'] += 1
+
+        delay = settings.latency + self._random.uniform(-settings.jitter, settings.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        retry_after = self._take_token(request.headers.get('Authorization') or request.remote or '')
+        if retry_after:
+            self.stats['rate_limited'] += 1
+            return web.json_response(
+                {'error': 'rate limit exceeded'}, status=429,
+                headers={'Retry-After': str(max(1, math.ceil(retry_after)))}
+            )
+
+        if settings.error_rate and self._random.random() < settings.error_rate:
+            self.stats['errors'] += 1
+            return web.json_response({'error': 'service unavailable'}, status=503)
+
+        return await handler(request)
+
+    def _take_token(self, client: str) -> float:
+        """
+        حد الطلبات بدلو رموز لكل عميل
+
+        Returns:
+            float: 0 إذا سُمح بالطلب، وإلا الثواني حتى يتوفر رمز
+        """
+        rate = self.settings.rate_limit
+        if not rate:
+            return 0.0
+
+        now = time.monotonic()
+        bucket = self._buckets.setdefault(client, [rate, now])
+        bucket[0] = min(rate, bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / rate
+
+    def _authorized(self, request: web.Request) -> bool:
+        """التحقق من رمز الوصول وصلاحيته"""
+        header = request.headers.get('Authorization', '')
+        token = header[7:] if header.startswith('Bearer ') else None
+        expires_at = self._tokens.get(token)
+        if expires_at is None or time.monotonic() >= expires_at:
+            self.stats['unauthorized'] += 1
+            return False
+        return True
+
+    # ---- المسارات ----
+
+    async def _login(self, request: web.Request) -> web.Response:
+        try:
+            payload = await request.json()
+        except Exception:
+            return web.json_response({'error': 'invalid body'}, status=400)
+
+        settings = self.settings
+        if not payload.get('username') or (
+            settings.username is not None
+            and (payload.get('username'), payload.get('password')) != (settings.username, settings.password)
+        ):
+            return web.json_response({'error': 'invalid credentials'}, status=401)
+
+        token = secrets.token_hex(16)
+        self._tokens[token] = time.monotonic() + settings.token_ttl
+        self.stats['logins'] += 1
+        return web.json_response({'access_token': token, 'expires_in': settings.token_ttl})
+
+    def _current_price(self, symbol: str) -> float:
+        if symbol not in self.prices:
+            self.prices[symbol] = symbol_profile(symbol).base_price
+        return self.prices[symbol]
+
+    async def _price(self, request: web.Request) -> web.Response:
+        if not self._authorized(request):
+            return web.json_response({'error': 'unauthorized'}, status=401)
+        symbol = request.match_info['symbol']
+        return web.json_response({'symbol': symbol, 'price': self._current_price(symbol)})
+
+    async def _prices(self, request: web.Request) -> web.Response:
+        if not self._authorized(request):
+            return web.json_response({'error': 'unauthorized'}, status=401)
+        symbols = [s for s in request.query.get('symbols', '').split(',') if s] or list(self.prices)
+        return web.json_response({'prices': {symbol: self._current_price(symbol) for symbol in symbols}})
+
+    async def _candles(self, request: web.Request) -> web.Response:
+        if not self._authorized(request):
+            return web.json_response({'error': 'unauthorized'}, status=401)
+        try:
+            symbol = request.query['symbol']
+            timeframe = request.query.get('timeframe', '1h')
+            limit = min(int(request.query.get('limit', 50)), self.settings.max_candles)
+            data = self.simulator.generate(symbol, limit, timeframe)
+        except (KeyError, ValueError) as e:
+            return web.json_response({'error': str(e)}, status=400)
+
+        return web.json_response({
+            'time': (data.timestamp.astype('datetime64[s]').astype(np.int64)).tolist(),
+            'open': data.open.tolist(),
+            'high': data.high.tolist(),
+            'low': data.low.tolist(),
+            'close': data.close.tolist(),
+            'volume': data.volume.tolist(),
+        })
+
+    async def _stream(self, request: web.Request) -> web.StreamResponse:
+        """بث NDJSON: سطر لكل تحديث سعر حتى يغلق العميل الاتصال"""
+        if not self._authorized(request):
+            return web.json_response({'error': 'unauthorized'}, status=401)
+
+        symbols = {s for s in request.query.get('symbols', '').split(',') if s}
+        response = web.StreamResponse(headers={'Content-Type': 'application/x-ndjson'})
+        await response.prepare(request)
+        queue = self._subscribe()
+        try:
+            while True:
+                ticks = await queue.get()
+                lines = ''.join(json.dumps(tick) + '\n' for tick in ticks if not symbols or tick['symbol'] in symbols)
+                if lines:
+                    await response.write(lines.encode())
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass
+        finally:
+            self._unsubscribe(queue)
+        return response
+
+    async def _websocket(self, request: web.Request) -> web.WebSocketResponse:
+        """بث الأسعار عبر websocket: رسالة JSON لكل تحديث سعر"""
+        if not self._authorized(request):
+            return web.json_response({'error': 'unauthorized'}, status=401)
+
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        queue = self._subscribe()
+
+        async def send():
+            while True:
+                for tick in await queue.get():
+                    await ws.send_json(tick)
+
+        # القراءة تكشف إغلاق العميل للاتصال، فيتوقف الإرسال معه
+        sender = asyncio.ensure_future(send())
+        try:
+            async for _ in ws:
+                pass
+        except asyncio.CancelledError:
+            pass
+        finally:
+            sender.cancel()
+            self._unsubscribe(queue)
+            await ws.close()
+        return ws
+
+    def _subscribe(self) -> asyncio.Queue:
+        """تسجيل مشترك جديد في البث (مع مهمته ليُلغى عند إيقاف الخادم)"""
+        queue = asyncio.Queue(maxsize=1000)
+        self._subscribers.add(queue)
+        self._streams.add(asyncio.current_task())
+        return queue
+
+    def _unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+        self._streams.discard(asyncio.current_task())
+
+    # ---- الأسعار ----
+
+    def tick(self) -> list:
+        """
+        تحريك جميع الأسعار خطوة واحدة وبثها للمشتركين
+
+        Returns:
+            list: التحديثات المبثوثة
+        """
+        symbols = list(self.prices)
+        sigmas = np.array([symbol_profile(symbol).annual_volatility for symbol in symbols])
+        sigmas *= np.sqrt(self.settings.tick_interval / SECONDS_PER_YEAR)
+        factors = np.exp(sigmas * self._rng.standard_normal(len(symbols)))
+        now = time.time()
+
+        ticks = []
+        for symbol, factor in zip(symbols, factors.tolist()):
+            self.prices[symbol] *= factor
+            ticks.append({'symbol': symbol, 'price': self.prices[symbol], 'time': now})
+
+        for queue in list(self._subscribers):
+            if queue.full():
+                queue.get_nowait()  # المشترك البطيء يفقد أقدم تحديث بدلاً من إبطاء الخادم
+            queue.put_nowait(ticks)
+        return ticks
+
+    async def _tick_loop(self):
+        while True:
+            await asyncio.sleep(self.settings.tick_interval)
+            self.tick()
+
+    # ---- التشغيل ----
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """
+        تشغيل الخادم داخل حلقة asyncio الحالية
+
+        Parameters:
+            host: عنوان الاستماع
+            port: المنفذ (0 لاختيار منفذ متاح)
+
+        Returns:
+            str: العنوان الأساسي للواجهة
+        """
+        self._runner = web.AppRunner(self.create_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self._ticker = asyncio.ensure_future(self._tick_loop())
+        self.base_url = f"http://{host}:{port}"
+        logger.info(f"تم تشغيل خادم QXBroker البديل على {self.base_url}")
+        return self.base_url
+
+    async def stop(self):
+        """إيقاف الخادم وإغلاق جميع الاتصالات"""
+        if self._ticker is not None:
+            self._ticker.cancel()
+            self._ticker = None
+        for task in list(self._streams):
+            task.cancel()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def run_in_thread(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """
+        تشغيل الخادم في خيط مستقل بحلقة asyncio خاصة (لاختبار العميل المتزامن)
+
+        Returns:
+            str: العنوان الأساسي للواجهة
+        """
+        started = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self.start(host, port))
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name='fake-qxbroker', daemon=True)
+        self._thread.start()
+        started.wait()
+        return self.base_url
+
+    def stop_thread(self):
+        """إيقاف الخادم المشغل عبر run_in_thread"""
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+
+def main():
+    """تشغيل الخادم من سطر الأوامر"""
+    parser = argparse.ArgumentParser(description="خادم QXBroker محلي بديل")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=float, default=0.0)
+    parser.add_argument('--tick-interval', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    broker = FakeBroker(FakeBrokerSettings(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        rate_limit=args.rate_limit, tick_interval=args.tick_interval, seed=args.seed
+    ))
+
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(broker.start(args.host, args.port))
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loop.run_until_complete(broker.stop())
+        loop.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,76 +1,170 @@
-#!/usr/bin/env python
-# -*- coding: utf-8 -*-
-"""
-نماذج البيانات المستخدمة في قسم QXBroker
-"""
-
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Union
-from datetime import datetime
-
-@dataclass
-class Asset:
-    """نموذج لتمثيل أصل تداول"""
-    id: int
-    name: str
-    ticker: str
-    active: bool = True
-    type: Optional[str] = None
-    
-    def __str__(self):
-        return f"{self.name} ({self.ticker})"
-
-@dataclass
-class Candle:
-    """نموذج لتمثيل شمعة"""
-    timestamp: int
-    open: float
-    close: float
-    high: float
-    low: float
-    volume: Optional[float] = 0
-    
-    @property
-    def datetime(self) -> datetime:
-        """تحويل الطابع الزمني إلى تاريخ"""
-        return datetime.fromtimestamp(self.timestamp)
-    
-    @property
-    def is_bullish(self) -> bool:
-        """هل الشمعة صاعدة؟"""
-        return self.close > self.open
-    
-    @property
-    def body_size(self) -> float:
-        """حجم جسم الشمعة"""
-        return abs(self.close - self.open)
-    
-    @property
-    def range(self) -> float:
-        """نطاق الشمعة الكامل"""
-        return self.high - self.low
-    
-    def __str__(self):
-        direction = "صاعدة" if self.is_bullish else "هابطة"
-        return f"شمعة {direction} ({self.datetime.strftime('%Y-%m-%d %H:%M')}): O={self.open}, H={self.high}, L={self.low}, C={self.close}, V={self.volume}"
-
-@dataclass
-class TradeSignal:
-    """نموذج لتمثيل إشارة تداول"""
-    id: str
-    symbol: str
-    timeframe: str
-    signal_type: str  # شراء، بيع، انتظار
-    direction: str
-    entry_price: float
-    stop_loss: float
-    take_profit: float
-    take_profit2: Optional[float] = None
-    confidence: float
-    indicators_used: str
-    analysis_text: str
-    created_at: datetime = datetime.now()
-    
-    def __str__(self):
-        emoji = "🟢" if self.signal_type == "شراء" else "🔴" if self.signal_type == "بيع" else "⚪"
-        return f"{emoji} إشارة {self.signal_type} لـ {self.symbol} ({self.timeframe}) - ثقة: {self.confidence}%"
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+نماذج البيانات المستخدمة في قسم QXBroker
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+from datetime import datetime
+
+import numpy as np
+
+from src.analysis.ohlcv import OHLCV
+
+@dataclass(slots=True)
+class Asset:
+    """نموذج لتمثيل أصل تداول"""
+    id: int
+    name: str
+    ticker: str
+    active: bool = True
+    type: Optional[str] = None
+    
+    def __str__(self):
+        return f"{self.name} ({self.ticker})"
+
+@dataclass(slots=True)
+class Candle:
+    """نموذج لتمثيل شمعة"""
+    timestamp: int
+    open: float
+    close: float
+    high: float
+    low: float
+    volume: Optional[float] = 0
+    
+    @property
+    def datetime(self) -> datetime:
+        """تحويل الطابع الزمني إلى تاريخ"""
+        return datetime.fromtimestamp(self.timestamp)
+    
+    @property
+    def is_bullish(self) -> bool:
+        """هل الشمعة صاعدة؟"""
+        return self.close > self.open
+    
+    @property
+    def body_size(self) -> float:
+        """حجم جسم الشمعة"""
+        return abs(self.close - self.open)
+    
+    @property
+    def range(self) -> float:
+        """نطاق الشمعة الكامل"""
+        return self.high - self.low
+    
+    def __str__(self):
+        direction = "صاعدة" if self.is_bullish else "هابطة"
+        return f"شمعة {direction} ({self.datetime.strftime('%Y-%m-%d %H:%M')}): O={self.open}, H={self.high}, L={self.low}, C={self.close}, V={self.volume}"
+
+class CandleSeries:
+    """
+    سلسلة شموع بتخزين عمودي (مصفوفة لكل حقل) بدلاً من كائن Candle لكل شمعة
+    
+    الخصائص المحسوبة مصفوفات متجهة، وكائنات Candle تُنشأ عند الطلب فقط
+    """
+    
+    __slots__ = ('timestamp', 'open', 'close', 'high', 'low', 'volume')
+    
+    def __init__(self, timestamp, open, close, high, low, volume=None):
+        """
+        Parameters:
+            timestamp: الطوابع الزمنية بالثواني منذ 1970
+            open: أسعار الافتتاح
+            close: أسعار الإغلاق
+            high: أعلى الأسعار
+            low: أدنى الأسعار
+            volume: الأحجام (اختياري، أصفار افتراضياً)
+        """
+        self.timestamp = np.asarray(timestamp, dtype=np.int64)
+        self.open = np.asarray(open, dtype=float)
+        self.close = np.asarray(close, dtype=float)
+        self.high = np.asarray(high, dtype=float)
+        self.low = np.asarray(low, dtype=float)
+        self.volume = np.zeros(len(self.close)) if volume is None else np.asarray(volume, dtype=float)
+    
+    @classmethod
+    def from_candles(cls, candles: Iterable[Candle]) -> 'CandleSeries':
+        """إنشاء سلسلة من كائنات Candle"""
+        candles = list(candles)
+        return cls(
+            [c.timestamp for c in candles], [c.open for c in candles], [c.close for c in candles],
+            [c.high for c in candles], [c.low for c in candles], [c.volume or 0 for c in candles]
+        )
+    
+    @classmethod
+    def from_ohlcv(cls, data: OHLCV) -> 'CandleSeries':
+        """إنشاء سلسلة من حاوية OHLCV دون نسخ أعمدة الأسعار"""
+        if data.timestamp is None:
+            timestamp = np.zeros(len(data), dtype=np.int64)
+        else:
+            timestamp = data.timestamp.astype('datetime64[s]').astype(np.int64)
+        return cls(timestamp, data.open, data.close, data.high, data.low, data.volume)
+    
+    def to_ohlcv(self) -> OHLCV:
+        """تحويل السلسلة إلى حاوية OHLCV لمسار التحليل"""
+        return OHLCV(
+            self.open, self.high, self.low, self.close, self.volume,
+            self.timestamp.astype('datetime64[s]').astype('datetime64[ns]')
+        )
+    
+    def __len__(self) -> int:
+        return len(self.close)
+    
+    def __getitem__(self, key) -> Union[Candle, 'CandleSeries']:
+        """شمعة واحدة كـ Candle، أو سلسلة فرعية تشير إلى نفس الذاكرة عند التقطيع"""
+        if isinstance(key, slice):
+            return CandleSeries(
+                self.timestamp[key], self.open[key], self.close[key],
+                self.high[key], self.low[key], self.volume[key]
+            )
+        return Candle(
+            int(self.timestamp[key]), float(self.open[key]), float(self.close[key]),
+            float(self.high[key]), float(self.low[key]), float(self.volume[key])
+        )
+    
+    def __iter__(self) -> Iterator[Candle]:
+        for i in range(len(self)):
+            yield self[i]
+    
+    @property
+    def is_bullish(self) -> np.ndarray:
+        """هل كل شمعة صاعدة؟"""
+        return self.close > self.open
+    
+    @property
+    def body_size(self) -> np.ndarray:
+        """أحجام أجسام الشموع"""
+        return np.abs(self.close - self.open)
+    
+    @property
+    def range(self) -> np.ndarray:
+        """النطاق الكامل لكل شمعة"""
+        return self.high - self.low
+    
+    @property
+    def nbytes(self) -> int:
+        """حجم بيانات السلسلة بالبايت"""
+        return sum(getattr(self, name).nbytes for name in self.__slots__)
+
+@dataclass(slots=True)
+class TradeSignal:
+    """نموذج لتمثيل إشارة تداول"""
+    id: str
+    symbol: str
+    timeframe: str
+    signal_type: str  # شراء، بيع، انتظار
+    direction: str
+    entry_price: float
+    stop_loss: float
+    take_profit: float
+    confidence: float
+    indicators_used: str
+    analysis_text: str
+    take_profit2: Optional[float] = None
+    created_at: datetime = field(default_factory=datetime.now)
+    
+    def __str__(self):
+        emoji = "🟢" if self.signal_type == "شراء" else "🔴" if self.signal_type == "بيع" else "⚪"
+        return f"{emoji} إشارة {self.signal_type} لـ {self.symbol} ({self.timeframe}) - ثقة: {self.confidence}%"
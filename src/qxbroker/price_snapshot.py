@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+لقطة أسعار مشتركة لجميع الأزواج تُستبدل كاملة عند كل تحديث
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class PriceSnapshot:
+    """
+    لقطة أسعار ثابتة: مصفوفة أسعار وأوقات تحديث بموضع ثابت لكل زوج
+
+    اللقطة لا تتغير بعد إنشائها، فيقرأ أي عدد من الخيوط منها دون قفل
+    """
+
+    __slots__ = ('symbols', 'index', 'prices', 'updated_at')
+
+    def __init__(self, symbols: Tuple[str, ...] = (), prices: Optional[np.ndarray] = None,
+                 updated_at: Optional[np.ndarray] = None):
+        """
+        Parameters:
+            symbols: رموز الأزواج بترتيب المصفوفات
+            prices: الأسعار
+            updated_at: أوقات التحديث (time.monotonic)
+        """
+        self.symbols = tuple(symbols)
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.prices = np.asarray(prices if prices is not None else np.zeros(0), dtype=float)
+        self.updated_at = np.asarray(updated_at if updated_at is not None else np.zeros(0), dtype=float)
+        self.prices.flags.writeable = False
+        self.updated_at.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def positions(self, symbols: Sequence[str]) -> np.ndarray:
+        """مواضع الأزواج في المصفوفات (-1 للأزواج غير الموجودة)"""
+        index = self.index
+        return np.fromiter((index.get(symbol, -1) for symbol in symbols), dtype=np.intp, count=len(symbols))
+
+    def lookup(self, symbols: Sequence[str], max_age: Optional[float] = None,
+               now: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        قراءة أسعار عدة أزواج دفعة واحدة
+
+        Parameters:
+            symbols: رموز الأزواج
+            max_age: أقصى عمر مقبول للسعر بالثواني (None بلا حد)
+            now: الوقت الحالي (الافتراضي time.monotonic())
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: الأسعار (NaN للمفقود أو القديم) وقناع الأسعار الصالحة
+        """
+        pos = self.positions(symbols)
+        valid = pos >= 0
+        prices = np.full(len(pos), np.nan)
+        prices[valid] = self.prices[pos[valid]]
+
+        if max_age is not None:
+            now = time.monotonic() if now is None else now
+            ages = np.full(len(pos), np.inf)
+            ages[valid] = now - self.updated_at[pos[valid]]
+            valid &= ages < max_age
+            prices[~valid] = np.nan
+        return prices, valid
+
+    def as_dict(self) -> Dict[str, float]:
+        """الأسعار كقاموس (زوج -> سعر)"""
+        return dict(zip(self.symbols, self.prices.tolist()))
+
+
+class PriceBook:
+    """
+    مصدر الأسعار المشترك: يحتفظ بلقطة واحدة ويستبدلها بلقطة جديدة عند كل تحديث
+
+    استبدال المرجع عملية ذرية، فيرى القارئ إما اللقطة القديمة كاملة أو الجديدة كاملة،
+    والكتابة وحدها محمية بقفل
+    """
+
+    def __init__(self):
+        self._snapshot = PriceSnapshot()
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> PriceSnapshot:
+        """اللقطة الحالية"""
+        return self._snapshot
+
+    def update(self, prices: Mapping[str, float], now: Optional[float] = None) -> PriceSnapshot:
+        """
+        تحديث أسعار مجموعة من الأزواج في لقطة جديدة
+
+        Parameters:
+            prices: قاموس (زوج -> سعر)
+            now: وقت التحديث (الافتراضي time.monotonic())
+
+        Returns:
+            PriceSnapshot: اللقطة الجديدة
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            current = self._snapshot
+            new_symbols = [symbol for symbol in prices if symbol not in current.index]
+            symbols = current.symbols + tuple(new_symbols)
+
+            values = np.concatenate([current.prices, np.zeros(len(new_symbols))])
+            updated_at = np.concatenate([current.updated_at, np.zeros(len(new_symbols))])
+            index = {symbol: i for i, symbol in enumerate(symbols)}
+            pos = np.fromiter((index[symbol] for symbol in prices), dtype=np.intp, count=len(prices))
+            values[pos] = np.fromiter(prices.values(), dtype=float, count=len(prices))
+            updated_at[pos] = now
+
+            self._snapshot = PriceSnapshot(symbols, values, updated_at)
+            return self._snapshot
+
+    def get(self, symbol: str, max_age: Optional[float] = None) -> Optional[float]:
+        """سعر زوج واحد أو None إذا لم يوجد أو كان أقدم من max_age"""
+        snapshot = self._snapshot
+        i = snapshot.index.get(symbol)
+        if i is None:
+            return None
+        if max_age is not None and time.monotonic() - snapshot.updated_at[i] >= max_age:
+            return None
+        return float(snapshot.prices[i])
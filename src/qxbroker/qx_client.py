@@ -1,246 +1,726 @@
-#!/usr/bin/env python
-# -*- coding: utf-8 -*-
-"""
-عميل QXBroker المبسط - باستخدام طلبات HTTP مباشرة
-"""
-
-import logging
-import os
-import time
-import json
-import pandas as pd
-import requests
-from datetime import datetime
-from functools import lru_cache
-
-from src.utils.config import load_config
-
-logger = logging.getLogger(__name__)
-
-class QXClient:
-    """
-    فئة عميل QXBroker المبسطة للتفاعل مع المنصة
-    تستخدم requests للتواصل المباشر
-    """
-    
-    _instance = None
-    
-    def __new__(cls):
-        """تطبيق نمط Singleton"""
-        if cls._instance is None:
-            cls._instance = super(QXClient, cls).__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-    
-    def __init__(self):
-        """تهيئة عميل QXBroker"""
-        if self._initialized:
-            return
-            
-        # تحميل الإعدادات
-        config = load_config()
-        self.username = config.QX_USERNAME
-        self.password = config.QX_PASSWORD
-        
-        # بيانات العميل
-        self.base_url = "https://qxbroker.com/api/v1"
-        self.session = requests.Session()
-        self.is_logged_in = False
-        self.access_token = None
-        self.cache = {}
-        self.last_login_attempt = 0
-        self.login_cooldown = 60  # ثواني قبل إعادة محاولة تسجيل الدخول
-        
-        self._initialized = True
-        logger.info("تم تهيئة عميل QXBroker المبسط")
-
-    def initialize(self):
-        """تهيئة العميل وتسجيل الدخول"""
-        try:
-            logger.info("محاولة تسجيل الدخول إلى QXBroker...")
-            
-            # تفعيل استخدام التخزين المؤقت للبيانات وإعادة استخدامها
-            # للتغلب على قيود الاتصال
-            self._init_mock_data()
-            
-            # في بيئة الإنتاج، يمكن تعليق هذه السطور وإعادة محاولة تسجيل الدخول
-            # التوقف عن تسجيل الدخول الفعلي لتجنب مشاكل API
-            logger.info("تم تفعيل وضع المحاكاة للبيانات")
-            self.is_logged_in = True
-            return True
-                
-        except Exception as e:
-            logger.error(f"خطأ أثناء تهيئة عميل QXBroker: {str(e)}")
-            logger.info("تم تفعيل وضع المحاكاة للبيانات")
-            self.is_logged_in = True  # نفترض النجاح لتجنب توقف البوت
-            return True
-    
-    def _init_mock_data(self):
-        """تهيئة بيانات مزيفة للتخزين المؤقت"""
-        # إنشاء بيانات BTC/USDT
-        btc_data = self._generate_mock_data("BTCUSDT", base_price=60000)
-        self.cache["historical_BTCUSDT_1h"] = btc_data
-        self.cache["price_BTCUSDT"] = btc_data.iloc[-1]['Close']
-        
-        # إنشاء بيانات ETH/USDT
-        eth_data = self._generate_mock_data("ETHUSDT", base_price=3000)
-        self.cache["historical_ETHUSDT_1h"] = eth_data
-        self.cache["price_ETHUSDT"] = eth_data.iloc[-1]['Close']
-        
-        # إنشاء بيانات EUR/USD
-        eurusd_data = self._generate_mock_data("EURUSD", base_price=1.08)
-        self.cache["historical_EURUSD_1h"] = eurusd_data
-        self.cache["price_EURUSD"] = eurusd_data.iloc[-1]['Close']
-        
-        # إنشاء بيانات XAU/USD (الذهب)
-        gold_data = self._generate_mock_data("XAUUSD", base_price=2300)
-        self.cache["historical_XAUUSD_1h"] = gold_data
-        self.cache["price_XAUUSD"] = gold_data.iloc[-1]['Close']
-        
-        logger.info("تم تهيئة بيانات المحاكاة بنجاح")
-    
-    def _generate_mock_data(self, symbol, base_price, count=50):
-        """
-        إنشاء بيانات مزيفة لأغراض المحاكاة
-        
-        Parameters:
-            symbol: رمز الزوج
-            base_price: السعر الأساسي
-            count: عدد الشموع
-            
-        Returns:
-            DataFrame: إطار بيانات يحتوي على البيانات المزيفة
-        """
-        import numpy as np
-        
-        data = []
-        current_time = datetime.now().timestamp()
-        interval = 3600  # ساعة واحدة
-        
-        price = base_price
-        for i in range(count):
-            # حساب الوقت
-            timestamp = current_time - (count - i - 1) * interval
-            dt = datetime.fromtimestamp(timestamp)
-            
-            # توليد سعر عشوائي مع ميل للاتجاه
-            change = np.random.normal(0, 0.01) * base_price
-            price = price + change
-            
-            # إنشاء شمعة
-            open_price = price
-            close_price = price + np.random.normal(0, 0.005) * base_price
-            high_price = max(open_price, close_price) + abs(np.random.normal(0, 0.003) * base_price)
-            low_price = min(open_price, close_price) - abs(np.random.normal(0, 0.003) * base_price)
-            volume = int(abs(np.random.normal(0, 1)) * 1000)
-            
-            # إضافة البيانات
-            data.append({
-                'Date': dt,
-                'Open': open_price,
-                'High': high_price,
-                'Low': low_price,
-                'Close': close_price,
-                'Volume': volume
-            })
-        
-        return pd.DataFrame(data)
-    
-    def get_current_price(self, symbol):
-        """
-        الحصول على السعر الحالي للزوج المحدد
-        
-        Parameters:
-            symbol: رمز الزوج (مثل BTCUSDT)
-        
-        Returns:
-            float: السعر الحالي أو None في حالة الفشل
-        """
-        try:
-            # التحقق من التخزين المؤقت أولاً
-            cache_key = f"price_{symbol}"
-            
-            # استخدام السعر المخزن مؤقتًا إذا كان متاحًا
-            if cache_key in self.cache:
-                logger.debug(f"استخدام السعر المخزن مؤقتًا لـ {symbol}")
-                return self.cache[cache_key]
-                
-            # في حالة عدم وجود سعر في التخزين المؤقت، نقوم بتوليد واحد جديد
-            if symbol == "BTCUSDT":
-                price = 60000 + (time.time() % 1000) - 500
-            elif symbol == "ETHUSDT":
-                price = 3000 + (time.time() % 500) - 250
-            elif symbol == "EURUSD":
-                price = 1.08 + (time.time() % 100) / 10000
-            elif symbol == "XAUUSD":
-                price = 2300 + (time.time() % 200) - 100
-            else:
-                price = 100 + (time.time() % 10)
-            
-            # تخزين السعر في التخزين المؤقت
-            self.cache[cache_key] = price
-            
-            logger.info(f"السعر الحالي لـ {symbol}: {price}")
-            return price
-            
-        except Exception as e:
-            logger.error(f"خطأ أثناء الحصول على سعر {symbol}: {str(e)}")
-            # إرجاع قيمة افتراضية
-            return 100.0
-    
-    def get_historical_data(self, symbol, timeframe, limit=50):
-        """
-        الحصول على البيانات التاريخية للزوج والإطار الزمني المحدد
-        
-        Parameters:
-            symbol: رمز الزوج (مثل BTCUSDT)
-            timeframe: الإطار الزمني (مثل 1h, 4h)
-            limit: عدد الشموع المطلوبة
-        
-        Returns:
-            DataFrame: إطار بيانات يحتوي على البيانات التاريخية أو None في حالة الفشل
-        """
-        try:
-            # التحقق من التخزين المؤقت
-            cache_key = f"historical_{symbol}_{timeframe}"
-            
-            # استخدام البيانات المخزنة مؤقتًا إذا كانت متاحة
-            if cache_key in self.cache:
-                logger.debug(f"استخدام البيانات المخزنة مؤقتًا لـ {symbol} ({timeframe})")
-                return self.cache[cache_key]
-            
-            # إذا لم تكن البيانات متاحة في التخزين المؤقت، نقوم بتوليد بيانات جديدة
-            data = self._generate_mock_data(symbol, self._get_base_price(symbol), limit)
-            
-            # تخزين البيانات في التخزين المؤقت
-            self.cache[cache_key] = data
-            
-            logger.info(f"تم الحصول على {len(data)} صف من البيانات التاريخية لـ {symbol} ({timeframe})")
-            return data
-            
-        except Exception as e:
-            logger.error(f"خطأ أثناء الحصول على البيانات التاريخية لـ {symbol}: {str(e)}")
-            # إنشاء بيانات افتراضية في حالة الفشل
-            data = self._generate_mock_data(symbol, self._get_base_price(symbol), limit)
-            return data
-    
-    def _get_base_price(self, symbol):
-        """
-        الحصول على السعر الأساسي للزوج
-        
-        Parameters:
-            symbol: رمز الزوج
-            
-        Returns:
-            float: السعر الأساسي
-        """
-        if symbol == "BTCUSDT":
-            return 60000
-        elif symbol == "ETHUSDT":
-            return 3000
-        elif symbol == "EURUSD":
-            return 1.08
-        elif symbol == "XAUUSD":
-            return 2300
-        else:
-            return 100
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+عميل QXBroker المبسط - باستخدام طلبات HTTP مباشرة
+"""
+
+import logging
+import os
+import time
+import json
+import numpy as np
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from functools import lru_cache
+
+from src.analysis.ohlcv import OHLCV
+from src.qxbroker.candle_archive import CandleArchive
+from src.qxbroker.candle_store import CandleStore
+from src.qxbroker.datasets import read_candles, write_candles
+from src.qxbroker.price_snapshot import PriceBook
+from src.qxbroker.resampler import TimeframeResampler
+from src.qxbroker.session import SessionManager
+from src.qxbroker.simulator import MarketSimulator, symbol_profile
+from src.qxbroker.tick_feed import TickFeed
+from src.utils.cache import TTLCache
+from src.utils.singleflight import SingleFlight
+from src.utils.config import load_config
+from src.utils.helpers import seconds_until_candle_close, timeframe_to_seconds
+
+logger = logging.getLogger(__name__)
+
+class QXClient:
+    """
+    فئة عميل QXBroker المبسطة للتفاعل مع المنصة
+    تستخدم requests للتواصل المباشر
+    """
+    
+    _instance = None
+    
+    # صلاحية السعر الحالي في التخزين المؤقت بالثواني
+    PRICE_TTL = 5
+    
+    # أوضاع العميل: محاكاة داخلية، أو طلبات HTTP إلى QX_API_URL (المنصة أو الخادم البديل)
+    MODE_MOCK = "mock"
+    MODE_HTTP = "http"
+    
+    # مهلة طلبات HTTP بالثواني، وحجم مجمع الاتصالات
+    REQUEST_TIMEOUT = 10
+    
+    # أقصى انتظار لأول جلسة عند التهيئة بالثواني (الطلبات لا تنتظر تسجيل الدخول أبداً)
+    LOGIN_TIMEOUT = 15
+    POOL_SIZE = 10
+    
+    def __new__(cls):
+        """تطبيق نمط Singleton"""
+        if cls._instance is None:
+            cls._instance = super(QXClient, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+    
+    def __init__(self):
+        """تهيئة عميل QXBroker"""
+        if self._initialized:
+            return
+            
+        # تحميل الإعدادات
+        config = load_config()
+        self.username = config.QX_USERNAME
+        self.password = config.QX_PASSWORD
+        
+        # بيانات العميل
+        self.mode = config.QX_MODE
+        self.base_url = config.QX_API_URL.rstrip('/')
+        self.session = self._create_session()
+        # تسجيل الدخول وتجديد الرمز في الخلفية، والطلبات تستخدم آخر جلسة صالحة
+        self.auth = SessionManager(
+            self.session, self.base_url, self.username, self.password, timeout=self.REQUEST_TIMEOUT
+        )
+        # تخزين مؤقت محدود بصلاحية لكل عنصر، وحذف سلسلة منه يحرر شموعها من المخزن
+        self.cache = TTLCache(on_evict=self._on_cache_evict)
+        self.candles = CandleStore()  # الشموع لكل (زوج، إطار زمني) في مخازن حلقية
+        self.flights = SingleFlight()  # جلب واحد للطلبات المتزامنة لنفس السلسلة
+        self.prices = PriceBook()  # لقطة الأسعار الحالية المشتركة لجميع الأزواج
+        self.simulator = MarketSimulator(seed=config.SIMULATOR_SEED)  # مصدر شموع المحاكاة
+        # أرشيف الشموع على القرص لاستعادة المخزن فوراً عند إعادة التشغيل
+        self.archive = self._open_archive(config.CANDLE_ARCHIVE_DIR)
+        # تُجلب شموع الإطار الأساسي فقط وتُشتق منها بقية الأطر داخل المخزن
+        self.resampler = TimeframeResampler(
+            self.candles, config.BASE_TIMEFRAME, config.SUPPORTED_TIMEFRAMES
+        )
+        self.candle_listeners = []  # مستمعو أحداث إغلاق الشموع
+        self.tick_feed = None  # الاشتراك في بث الأسعار (وضع HTTP)
+        
+        self._initialized = True
+        logger.info("تم تهيئة عميل QXBroker المبسط")
+
+    def initialize(self):
+        """تهيئة العميل وتسجيل الدخول"""
+        try:
+            logger.info("محاولة تسجيل الدخول إلى QXBroker...")
+            
+            if self.mode == self.MODE_HTTP:
+                # انتظار أول جلسة مرة واحدة عند التهيئة، ويستمر التجديد في الخلفية
+                ready = self.auth.wait(self.LOGIN_TIMEOUT)
+                # الاستعادة بعد تسجيل الدخول لتُجلب الشموع الناقصة من الأرشيف المتأخر
+                self._warm_start()
+                if not ready:
+                    logger.warning("لم يكتمل تسجيل الدخول بعد، سيستمر في الخلفية")
+                    return False
+                self._init_mock_data()
+                logger.info(f"تم الاتصال بـ QXBroker على {self.base_url}")
+                return True
+            
+            # استعادة الشموع المؤرشفة، ثم توليد بيانات المحاكاة للسلاسل غير المؤرشفة فقط
+            # للتغلب على قيود الاتصال
+            self._warm_start()
+            self._init_mock_data()
+            
+            # في بيئة الإنتاج، يمكن تعليق هذه السطور وإعادة محاولة تسجيل الدخول
+            # التوقف عن تسجيل الدخول الفعلي لتجنب مشاكل API
+            logger.info("تم تفعيل وضع المحاكاة للبيانات")
+            return True
+                
+        except Exception as e:
+            logger.error(f"خطأ أثناء تهيئة عميل QXBroker: {str(e)}")
+            logger.info("تم تفعيل وضع المحاكاة للبيانات")
+            return True  # نفترض النجاح لتجنب توقف البوت
+    
+    def _create_session(self):
+        """
+        جلسة HTTP بمجمع اتصالات مع إبقاء الاتصال، وإعادة محاولة تلقائية بتأخير متزايد
+        لأخطاء الخادم وتجاوز حد الطلبات (مع احترام Retry-After)
+        
+        Returns:
+            requests.Session: الجلسة
+        """
+        retry = Retry(
+            total=3, backoff_factor=0.2, status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=None, respect_retry_after_header=True, raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=self.POOL_SIZE, pool_maxsize=self.POOL_SIZE, max_retries=retry)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+    
+    @property
+    def is_logged_in(self):
+        """هل توجد جلسة صالحة؟ (وضع المحاكاة لا يحتاج تسجيل دخول)"""
+        return self.mode == self.MODE_MOCK or self.auth.current() is not None
+    
+    @property
+    def access_token(self):
+        """رمز الوصول للجلسة الحالية أو None"""
+        session = self.auth.current()
+        return session.token if session is not None else None
+    
+    def login(self):
+        """
+        بدء مدير الجلسة في الخلفية إذا لم يكن يعمل، دون انتظار تسجيل الدخول
+        
+        Returns:
+            bool: True إذا توجد جلسة صالحة الآن
+        """
+        if self.mode == self.MODE_MOCK:
+            return True
+        self.auth.start()
+        return self.auth.current() is not None
+    
+    def _request(self, path, params=None):
+        """
+        طلب GET إلى واجهة المنصة بآخر جلسة صالحة
+        
+        إذا رُفض الرمز يُطلب التجديد في الخلفية، ويُعاد الطلب مرة واحدة فقط إذا كانت
+        جلسة أحدث متاحة بالفعل (دون انتظار تسجيل الدخول)
+        
+        Returns:
+            dict: الاستجابة
+        
+        Raises:
+            requests.RequestException: عند فشل الطلب
+        """
+        self.auth.start()
+        session = self.auth.current()
+        if session is None:
+            raise ConnectionError("لا توجد جلسة صالحة لـ QXBroker بعد")
+        
+        url = f"{self.base_url}{path}"
+        response = self.session.get(url, params=params, headers=session.headers, timeout=self.REQUEST_TIMEOUT)
+        if response.status_code == 401:
+            self.auth.invalidate(session.token)
+            newer = self.auth.current()
+            if newer is None or newer.token == session.token:
+                raise ConnectionError("انتهت صلاحية رمز الوصول، جارٍ التجديد في الخلفية")
+            response = self.session.get(url, params=params, headers=newer.headers, timeout=self.REQUEST_TIMEOUT)
+        
+        response.raise_for_status()
+        return response.json()
+    
+    def _fetch_candles(self, symbol, count, timeframe):
+        """
+        جلب الشموع من المصدر حسب الوضع (المحاكي أو واجهة HTTP)
+        
+        Returns:
+            OHLCV: الشموع مع أوقاتها
+        """
+        if self.mode != self.MODE_HTTP:
+            return self._generate_mock_data(symbol, self._get_base_price(symbol), count, timeframe)
+        
+        payload = self._request("/candles", params={"symbol": symbol, "timeframe": timeframe, "limit": count})
+        timestamps = np.asarray(payload["time"], dtype=np.int64).astype('datetime64[s]').astype('datetime64[ns]')
+        return OHLCV(payload["open"], payload["high"], payload["low"], payload["close"],
+                     payload["volume"], timestamps)
+    
+    def _open_archive(self, root):
+        """
+        فتح أرشيف الشموع على القرص
+        
+        Parameters:
+            root: مجلد الأرشيف (فارغ لتعطيل الأرشيف)
+            
+        Returns:
+            CandleArchive: الأرشيف أو None إذا كان معطلاً أو تعذر فتحه
+        """
+        if not root:
+            return None
+        try:
+            return CandleArchive(root)
+        except Exception as e:
+            logger.error(f"خطأ أثناء فتح أرشيف الشموع {root}: {str(e)}")
+            return None
+    
+    def _warm_start(self):
+        """
+        تحميل آخر الشموع المؤرشفة لكل سلسلة إلى المخزن (قراءة عبر mmap دون تحليل)
+        
+        السلسلة تُسجل كحديثة فقط إذا كانت آخر شمعة مؤرشفة هي آخر شمعة مغلقة، وإلا تُجلب
+        الشموع الناقصة أولاً (وإذا فشل الجلب تبقى قديمة فيعيد get_candles جلبها عند الطلب)
+        """
+        if self.archive is None:
+            return
+        
+        for symbol, timeframe in self.archive.series():
+            # الأطر المشتقة تُبنى من أرشيف الإطار الأساسي
+            if self.resampler.derives(timeframe):
+                continue
+            try:
+                count = self.candles.capacity
+                if timeframe == self.resampler.base_timeframe:
+                    count *= self.resampler.max_ratio
+                data = self.archive.tail(symbol, timeframe, count)
+                if data is None:
+                    continue
+                self.candles.load(symbol, timeframe, data)
+                if timeframe == self.resampler.base_timeframe:
+                    self.resampler.derive(symbol, data)
+                logger.info(f"تم استعادة {len(data)} شمعة مؤرشفة لـ {symbol} ({timeframe})")
+                
+                missing = self._missing_candles(symbol, timeframe)
+                if missing:
+                    # الأرشيف متأخر: جلب الشموع الناقصة قبل التسجيل كحديثة (مع فترة مشتقة كاملة
+                    # قبلها لتكتمل أول شمعة مشتقة بعد آخر شمعة مؤرشفة)
+                    fetch_count = min(missing + self.resampler.max_ratio, count)
+                    try:
+                        self._store_candles(symbol, timeframe, self._fetch_candles(symbol, fetch_count, timeframe))
+                    except Exception as e:
+                        logger.warning(
+                            f"أرشيف {symbol} ({timeframe}) متأخر {missing} شمعة وتعذر جلبها، ستُجلب عند الطلب: {str(e)}"
+                        )
+                        continue
+                
+                self._mark_candles_fresh(symbol, timeframe)
+                if timeframe == self.resampler.base_timeframe:
+                    for derived in self.resampler.timeframes:
+                        self._mark_candles_fresh(symbol, derived)
+                self.prices.update({symbol: float(self.candles.window(symbol, timeframe, 1).close[-1])})
+            except Exception as e:
+                logger.error(f"خطأ أثناء استعادة شموع {symbol} ({timeframe}) من الأرشيف: {str(e)}")
+    
+    def _missing_candles(self, symbol, timeframe):
+        """
+        عدد الشموع المغلقة بعد آخر شمعة في المخزن
+        
+        Returns:
+            int: صفر إذا كانت آخر شمعة محفوظة هي آخر شمعة مغلقة
+        """
+        interval = timeframe_to_seconds(timeframe)
+        last = self.candles.last_timestamp(symbol, timeframe)
+        last_closed = (int(time.time()) // interval - 1) * interval
+        if last is None:
+            return self.candles.capacity
+        return max(0, (last_closed - int(last.astype('datetime64[s]').astype(np.int64))) // interval)
+    
+    def _store_candles(self, symbol, timeframe, data):
+        """
+        إضافة الشموع إلى المخزن وحفظ ما ليس في الأرشيف منها (الأحدث والأقدم)
+        
+        Parameters:
+            symbol: رمز الزوج
+            timeframe: الإطار الزمني
+            data: إطار بيانات أو حاوية OHLCV
+        """
+        self.candles.load(symbol, timeframe, data)
+        self._mark_candles_fresh(symbol, timeframe)
+        if self.archive is not None:
+            try:
+                self.archive.append(symbol, timeframe, data)
+            except Exception as e:
+                logger.error(f"خطأ أثناء أرشفة شموع {symbol} ({timeframe}): {str(e)}")
+        if timeframe == self.resampler.base_timeframe:
+            self._derive_timeframes(symbol, data)
+    
+    def _derive_timeframes(self, symbol, data=None):
+        """
+        اشتقاق الأطر الأعلى من شموع الإطار الأساسي وتسجيلها كحديثة
+        
+        Parameters:
+            symbol: رمز الزوج
+            data: تاريخ أساسي أطول من المخزن (اختياري)، وبدونه تُشتق الشموع المغلقة حديثاً فقط
+        
+        Returns:
+            set: الأطر التي أضيفت إليها شموع جديدة
+        """
+        updated = set()
+        if data is not None:
+            updated.update(tf for tf, added in self.resampler.derive(symbol, data).items() if added)
+        updated.update(self.resampler.update(symbol))
+        for timeframe in updated:
+            self._mark_candles_fresh(symbol, timeframe)
+        return updated
+    
+    def _init_mock_data(self):
+        """تهيئة بيانات مزيفة للتخزين المؤقت (للسلاسل غير المستعادة من الأرشيف أو القديمة فيه)"""
+        for symbol in ("BTCUSDT", "ETHUSDT", "EURUSD", "XAUUSD"):
+            if self.cache.get(f"historical_{symbol}_1h") is not None:
+                continue
+            candles = self.get_candles(symbol, "1h", 50)
+            if candles is not None:
+                # السعر الحالي من آخر شمعة للإطار الأساسي (المشتق منه الإطار 1h)
+                self.prices.update({symbol: float(self._quote_prices([symbol])[0])})
+        
+        logger.info("تم تهيئة بيانات المحاكاة بنجاح")
+    
+    def _generate_mock_data(self, symbol, base_price, count=50, timeframe="1h"):
+        """
+        إنشاء بيانات مزيفة لأغراض المحاكاة من محاكي السوق
+        
+        Parameters:
+            symbol: رمز الزوج
+            base_price: السعر الأساسي
+            count: عدد الشموع
+            timeframe: الإطار الزمني (آخر شمعة هي آخر شمعة مغلقة)
+            
+        Returns:
+            OHLCV: حاوية تحتوي على البيانات المزيفة مع أوقاتها
+        """
+        return self.simulator.generate(symbol, count, timeframe, base_price=base_price)
+    
+    def get_current_price(self, symbol):
+        """
+        الحصول على السعر الحالي للزوج المحدد
+        
+        Parameters:
+            symbol: رمز الزوج (مثل BTCUSDT)
+        
+        Returns:
+            float: السعر الحالي أو None في حالة الفشل
+        """
+        try:
+            # استخدام السعر من اللقطة إذا كان ما زال صالحًا
+            price = self.prices.get(symbol, max_age=self.PRICE_TTL)
+            if price is not None:
+                logger.debug(f"استخدام السعر المخزن مؤقتًا لـ {symbol}")
+                return price
+                
+            # في حالة عدم وجود سعر صالح، نقوم بتوليد واحد جديد وتحديث اللقطة
+            price = float(self._quote_prices([symbol])[0])
+            self.prices.update({symbol: price})
+            
+            logger.info(f"السعر الحالي لـ {symbol}: {price}")
+            return price
+            
+        except Exception as e:
+            logger.error(f"خطأ أثناء الحصول على سعر {symbol}: {str(e)}")
+            # إرجاع قيمة افتراضية
+            return 100.0
+    
+    def get_current_prices(self, symbols, as_array=False):
+        """
+        الحصول على أسعار عدة أزواج في عملية واحدة من لقطة الأسعار المشتركة
+        
+        الأسعار الصالحة تُقرأ من اللقطة دفعة واحدة، والقديمة أو المفقودة فقط تُجدد
+        معاً في تحديث واحد للقطة
+        
+        Parameters:
+            symbols: رموز الأزواج
+            as_array: إرجاع مصفوفة أسعار بترتيب الرموز بدلاً من قاموس
+        
+        Returns:
+            Dict[str, float] أو np.ndarray: الأسعار، أو None في حالة الفشل
+        """
+        try:
+            symbols = list(symbols)
+            prices, valid = self.prices.snapshot().lookup(symbols, max_age=self.PRICE_TTL)
+            
+            if not valid.all():
+                stale = [symbol for symbol, ok in zip(symbols, valid) if not ok]
+                quotes = self._quote_prices(stale)
+                self.prices.update(dict(zip(stale, quotes.tolist())))
+                prices[~valid] = quotes
+                logger.debug(f"تم تحديث أسعار {len(stale)} زوج")
+            
+            if as_array:
+                return prices
+            return dict(zip(symbols, prices.tolist()))
+            
+        except Exception as e:
+            logger.error(f"خطأ أثناء الحصول على أسعار الأزواج: {str(e)}")
+            return None
+    
+    def _quote_prices(self, symbols):
+        """
+        جلب أسعار عدة أزواج دفعة واحدة (طلب واحد في وضع HTTP)
+        
+        في وضع المحاكاة السعر هو إغلاق آخر شمعة للإطار الأساسي في المخزن، أو من مسار
+        المحاكي في الوقت الحالي إذا لم تكن شموع الزوج مخزنة، فيتسق السعر مع الشموع
+        
+        Parameters:
+            symbols: رموز الأزواج
+        
+        Returns:
+            np.ndarray: الأسعار بترتيب الرموز
+        """
+        if self.mode == self.MODE_HTTP:
+            prices = self._request("/prices", params={"symbols": ",".join(symbols)})["prices"]
+            return np.array([prices[symbol] for symbol in symbols], dtype=float)
+        
+        timeframe = self.resampler.base_timeframe
+        prices = np.empty(len(symbols))
+        for i, symbol in enumerate(symbols):
+            candles = self.candles.window(symbol, timeframe, 1)
+            if candles is None or not len(candles):
+                candles = self.simulator.generate(symbol, 1, timeframe, self._get_base_price(symbol))
+            prices[i] = candles.close[-1]
+        return prices
+    
+    def get_candles(self, symbol, timeframe, limit=50):
+        """
+        الحصول على آخر الشموع من مخزن الشموع دون نسخ
+        
+        Parameters:
+            symbol: رمز الزوج (مثل BTCUSDT)
+            timeframe: الإطار الزمني (مثل 1h, 4h)
+            limit: عدد الشموع المطلوبة
+        
+        Returns:
+            OHLCV: حاوية للقراءة فقط تشير إلى ذاكرة المخزن أو None في حالة الفشل
+        """
+        try:
+            # استخدام الشموع المخزنة إذا كانت حديثة وتغطي العدد المطلوب
+            available = self.candles.length(symbol, timeframe)
+            fresh = self.cache.get(f"historical_{symbol}_{timeframe}") is not None
+            if fresh and available >= limit:
+                logger.debug(f"استخدام الشموع المخزنة لـ {symbol} ({timeframe})")
+                return self.candles.window(symbol, timeframe, limit)
+            
+            # الطلبات المتزامنة لنفس السلسلة تنتظر جلباً واحداً
+            return self.flights.do(
+                ("candles", symbol, timeframe, limit),
+                lambda: self._load_candles(symbol, timeframe, limit)
+            )
+            
+        except Exception as e:
+            logger.error(f"خطأ أثناء الحصول على شموع {symbol}: {str(e)}")
+            return None
+    
+    def _load_candles(self, symbol, timeframe, limit):
+        """
+        جلب الشموع من المصدر وتحديث المخزن ثم إرجاع آخر limit شمعة
+        
+        Returns:
+            OHLCV: حاوية للقراءة فقط تشير إلى ذاكرة المخزن
+        """
+        # قد يكون طلب متزامن سابق قد حدّث المخزن
+        available = self.candles.length(symbol, timeframe)
+        if available >= limit and self.cache.get(f"historical_{symbol}_{timeframe}") is not None:
+            return self.candles.window(symbol, timeframe, limit)
+        
+        # الأطر المشتقة تُبنى من شموع الإطار الأساسي (مع فترة إضافية لأن الأولى قد تكون ناقصة)
+        fetch_timeframe, count = timeframe, limit
+        if self.resampler.derives(timeframe):
+            fetch_timeframe = self.resampler.base_timeframe
+            count = (limit + 1) * self.resampler.ratio(timeframe)
+            if available >= limit:
+                # المخزن يغطي العدد المطلوب: تكفي الشموع الأساسية منذ آخر شمعة مشتقة
+                count = min(count, self._base_candles_since(symbol, timeframe))
+        
+        # جلب الشموع: الجديدة فقط تُضاف للمخزن، ويُعاد بناؤه إذا كان أقصر من المطلوب
+        data = self._fetch_candles(symbol, count, fetch_timeframe)
+        if available < limit:
+            self.candles.clear(symbol, timeframe)
+        self._store_candles(symbol, fetch_timeframe, data)
+        
+        logger.info(f"تم الحصول على {len(data)} صف من البيانات التاريخية لـ {symbol} ({timeframe})")
+        return self.candles.window(symbol, timeframe, limit)
+    
+    def _base_candles_since(self, symbol, timeframe):
+        """
+        عدد الشموع الأساسية منذ بداية آخر شمعة مشتقة محفوظة (يكفي لاشتقاق ما أُغلق بعدها)
+        
+        Parameters:
+            symbol: رمز الزوج
+            timeframe: الإطار المشتق
+        
+        Returns:
+            int: عدد الشموع الأساسية
+        """
+        last = self.candles.last_timestamp(symbol, timeframe)
+        elapsed = time.time() - int(last.astype('datetime64[s]').astype(np.int64))
+        return int(elapsed // self.resampler.base_interval) + 1
+    
+    def add_candle(self, symbol, timeframe, timestamp, open, high, low, close, volume=0.0):
+        """
+        إضافة شمعة مغلقة جديدة إلى مخزن الشموع بتكلفة ثابتة
+        
+        Returns:
+            bool: True إذا أضيفت الشمعة (الشموع الأقدم من آخر شمعة تُتجاهل)
+        """
+        added = self.candles.append(symbol, timeframe, timestamp, open, high, low, close, volume)
+        if added:
+            self._mark_candles_fresh(symbol, timeframe)
+            if self.archive is not None:
+                try:
+                    self.archive.append(symbol, timeframe, self.candles.window(symbol, timeframe, 1))
+                except Exception as e:
+                    logger.error(f"خطأ أثناء أرشفة شمعة {symbol} ({timeframe}): {str(e)}")
+            
+            # إغلاق شمعة أساسية قد يُغلق شموع الأطر الأعلى
+            closed = [timeframe]
+            if timeframe == self.resampler.base_timeframe:
+                closed.extend(sorted(self._derive_timeframes(symbol), key=self.resampler.ratio))
+            for closed_timeframe in closed:
+                self._notify_candle_close(symbol, closed_timeframe)
+        return added
+    
+    def start_tick_feed(self, symbols=None):
+        """
+        بدء الاشتراك في بث الأسعار: تتحدث الأسعار لحظياً وتُجمع الشموع وتُضاف عند إغلاقها
+        
+        Parameters:
+            symbols: الأزواج المشترك بها (None لجميع الأزواج)
+        
+        Returns:
+            TickFeed: المشترك
+        """
+        if self.tick_feed is None:
+            self.tick_feed = TickFeed(self, symbols=symbols)
+        elif symbols is not None:
+            self.tick_feed.subscribe(symbols)
+        self.tick_feed.start()
+        return self.tick_feed
+    
+    def stop_tick_feed(self):
+        """إيقاف الاشتراك في بث الأسعار"""
+        if self.tick_feed is not None:
+            self.tick_feed.stop()
+    
+    def add_candle_listener(self, callback):
+        """
+        تسجيل مستمع لأحداث إغلاق الشموع
+        
+        Parameters:
+            callback: دالة (symbol, timeframe, candle) حيث candle حاوية OHLCV بالشمعة المغلقة
+        """
+        self.candle_listeners.append(callback)
+    
+    def remove_candle_listener(self, callback):
+        """إلغاء تسجيل مستمع"""
+        if callback in self.candle_listeners:
+            self.candle_listeners.remove(callback)
+    
+    def _notify_candle_close(self, symbol, timeframe):
+        """إبلاغ المستمعين بإغلاق شمعة (خطأ أحد المستمعين لا يوقف البقية)"""
+        if not self.candle_listeners:
+            return
+        candle = self.candles.window(symbol, timeframe, 1)
+        for callback in list(self.candle_listeners):
+            try:
+                callback(symbol, timeframe, candle)
+            except Exception as e:
+                logger.error(f"خطأ في مستمع إغلاق الشموع لـ {symbol} ({timeframe}): {str(e)}")
+    
+    def _mark_candles_fresh(self, symbol, timeframe):
+        """
+        تسجيل شموع السلسلة كحديثة حتى إغلاق الشمعة الحالية للإطار الزمني
+        
+        Parameters:
+            symbol: رمز الزوج
+            timeframe: الإطار الزمني
+        """
+        try:
+            ttl = seconds_until_candle_close(timeframe)
+        except ValueError:
+            ttl = 60
+        
+        self.cache.set(
+            f"historical_{symbol}_{timeframe}", (symbol, timeframe),
+            ttl=ttl, size=self.candles.nbytes(symbol, timeframe)
+        )
+    
+    def _on_cache_evict(self, key, value):
+        """تحرير شموع السلسلة من المخزن عند حذفها من التخزين المؤقت لتجاوز حد الذاكرة"""
+        if isinstance(key, str) and key.startswith("historical_"):
+            symbol, timeframe = value
+            self.candles.clear(symbol, timeframe)
+    
+    def cache_stats(self):
+        """
+        إحصائيات التخزين المؤقت
+        
+        Returns:
+            Dict: عدد العناصر والحجم والإصابات والإخفاقات وعمليات الحذف
+        """
+        return self.cache.stats()
+    
+    def get_historical_data(self, symbol, timeframe, limit=50):
+        """
+        الحصول على البيانات التاريخية للزوج والإطار الزمني المحدد
+        
+        Parameters:
+            symbol: رمز الزوج (مثل BTCUSDT)
+            timeframe: الإطار الزمني (مثل 1h, 4h)
+            limit: عدد الشموع المطلوبة
+        
+        Returns:
+            DataFrame: إطار بيانات يحتوي على البيانات التاريخية أو None في حالة الفشل
+        """
+        try:
+            candles = self.get_candles(symbol, timeframe, limit)
+            if candles is not None:
+                return candles.to_dataframe()
+            
+            raise ValueError("لا توجد شموع في المخزن")
+            
+        except Exception as e:
+            logger.error(f"خطأ أثناء الحصول على البيانات التاريخية لـ {symbol}: {str(e)}")
+            # إنشاء بيانات افتراضية في حالة الفشل
+            data = self._generate_mock_data(symbol, self._get_base_price(symbol), limit, timeframe)
+            return data.to_dataframe()
+    
+    def export_candles(self, path, symbols=None, timeframes=None, start=None, end=None):
+        """
+        تصدير الشموع إلى ملف Parquet/Arrow (كامل التاريخ المؤرشف، أو المخزن إذا كان الأرشيف معطلاً)
+        
+        Parameters:
+            path: مسار الملف (.parquet أو .arrow)
+            symbols: الأزواج المطلوبة (None للجميع)
+            timeframes: الأطر المطلوبة (None للجميع)
+            start: بداية الفترة
+            end: نهاية الفترة
+        
+        Returns:
+            int: عدد الشموع المصدرة
+        """
+        start = pd.Timestamp(start).to_datetime64() if start is not None else None
+        end = pd.Timestamp(end).to_datetime64() if end is not None else None
+        
+        source = self.archive.series() if self.archive is not None else self.candles.series()
+        series = {}
+        for symbol, timeframe in source:
+            if symbols is not None and symbol not in symbols:
+                continue
+            if timeframes is not None and timeframe not in timeframes:
+                continue
+            
+            if self.archive is not None:
+                data = self.archive.range(symbol, timeframe, start, end)
+            else:
+                data = self.candles.window(symbol, timeframe)
+                if data is not None:
+                    lo = np.searchsorted(data.timestamp, start) if start is not None else 0
+                    hi = np.searchsorted(data.timestamp, end, 'right') if end is not None else len(data)
+                    data = data[lo:hi]
+            series[(symbol, timeframe)] = data
+        return write_candles(series, path)
+    
+    def import_candles(self, path, symbols=None, timeframes=None, start=None, end=None):
+        """
+        تحميل الشموع من ملف Parquet/Arrow دفعة واحدة إلى المخزن والأرشيف
+        
+        تحميل الإطار الأساسي يشتق بقية الأطر، والشموع الأقدم من آخر شمعة مخزنة تُتجاهل
+        
+        Parameters:
+            path: مسار الملف
+            symbols: الأزواج المطلوبة (None للجميع)
+            timeframes: الأطر المطلوبة (None للجميع)
+            start: بداية الفترة
+            end: نهاية الفترة
+        
+        Returns:
+            int: عدد الشموع المقروءة
+        """
+        series = read_candles(path, symbols, timeframes, start, end)
+        # الإطار الأساسي أولاً لتُشتق منه الأطر الأعلى
+        base = self.resampler.base_timeframe
+        for (symbol, timeframe), data in sorted(series.items(), key=lambda item: item[0][1] != base):
+            self._store_candles(symbol, timeframe, data)
+            self.prices.update({symbol: float(data.close[-1])})
+        
+        total = sum(len(data) for data in series.values())
+        logger.info(f"تم استيراد {total} شمعة من {len(series)} سلسلة من {path}")
+        return total
+    
+    def _get_base_price(self, symbol):
+        """
+        الحصول على السعر الأساسي للزوج
+        
+        Parameters:
+            symbol: رمز الزوج
+            
+        Returns:
+            float: السعر الأساسي
+        """
+        return symbol_profile(symbol).base_price
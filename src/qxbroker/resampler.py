@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+اشتقاق الأطر الزمنية الأعلى من سلسلة الإطار الأساسي (الأدق) لكل زوج
+"""
+
+import logging
+from typing import Dict, Iterable, List, Union
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.ohlcv import OHLCV
+from src.qxbroker.candle_store import CandleStore
+from src.utils.helpers import timeframe_to_seconds
+
+logger = logging.getLogger(__name__)
+
+NANOSECONDS = 10 ** 9
+
+
+def resample(data: Union[pd.DataFrame, OHLCV], interval: int, base_interval: int,
+             complete_only: bool = True) -> OHLCV:
+    """
+    تجميع الشموع في شموع أطول بعمليات متجهة
+
+    الشمعة المشتقة تبدأ عند بداية فترتها (أوقات مقربة لمضاعفات interval)، وافتتاحها
+    أول افتتاح وإغلاقها آخر إغلاق، وأعلاها وأدناها وحجمها من جميع شموعها
+
+    Parameters:
+        data: الشموع الأساسية المرتبة زمنياً (مع الأوقات)
+        interval: طول الشمعة المشتقة بالثواني
+        base_interval: طول الشمعة الأساسية بالثواني
+        complete_only: استبعاد الفترة الأولى والأخيرة إذا لم تغطهما الشموع الأساسية بالكامل
+
+    Returns:
+        OHLCV: الشموع المشتقة
+    """
+    data = OHLCV.from_any(data)
+    if data.timestamp is None:
+        raise ValueError("لا يمكن تجميع شموع بدون أوقات")
+    if not len(data):
+        return data
+
+    ts = np.asarray(data.timestamp, dtype='datetime64[ns]').view('<i8')
+    step = interval * NANOSECONDS
+    base_step = base_interval * NANOSECONDS
+    buckets = ts - ts % step
+
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(ts)] - 1
+
+    # الفترة الأولى ناقصة إذا بدأت شموعها بعد بدايتها، والأخيرة إذا لم تصل إلى نهايتها
+    first, last = 0, len(starts)
+    if complete_only:
+        if ts[0] - buckets[0] >= base_step:
+            first = 1
+        if ts[-1] + base_step < buckets[-1] + step:
+            last -= 1
+    starts, ends = starts[first:last], ends[first:last]
+    if not len(starts):
+        return data[0:0]
+
+    # reduceat يحتاج مصفوفة تنتهي عند آخر فترة مكتملة
+    stop = ends[-1] + 1
+    offsets = starts - starts[0]
+    window = slice(starts[0], stop)
+    return OHLCV(
+        data.open[starts],
+        np.maximum.reduceat(data.high[window], offsets),
+        np.minimum.reduceat(data.low[window], offsets),
+        data.close[ends],
+        np.add.reduceat(data.volume[window], offsets),
+        buckets[starts].view('datetime64[ns]'),
+    )
+
+
+class TimeframeResampler:
+    """
+    يحتفظ بشموع الإطار الأساسي فقط ويشتق منها الأطر الأعلى داخل مخزن الشموع
+
+    كل إطار مشتق يُحدَّث تدريجياً: عند إغلاق شموع أساسية جديدة تُجمَّع فقط الشموع
+    التي تلي آخر شمعة مشتقة، فتبقى جميع الأطر متسقة مع نفس المصدر
+    """
+
+    def __init__(self, store: CandleStore, base_timeframe: str, timeframes: Iterable[str]):
+        """
+        Parameters:
+            store: مخزن الشموع
+            base_timeframe: الإطار الأساسي (الأدق)
+            timeframes: الأطر المدعومة (تُشتق منها المضاعفات الصحيحة للإطار الأساسي)
+        """
+        self.store = store
+        self.base_timeframe = base_timeframe
+        self.base_interval = timeframe_to_seconds(base_timeframe)
+        self.intervals: Dict[str, int] = {}
+        for timeframe in timeframes:
+            interval = timeframe_to_seconds(timeframe)
+            if interval > self.base_interval and interval % self.base_interval == 0:
+                self.intervals[timeframe] = interval
+
+    @property
+    def timeframes(self) -> List[str]:
+        """الأطر المشتقة"""
+        return list(self.intervals)
+
+    def derives(self, timeframe: str) -> bool:
+        """هل يُشتق الإطار من الإطار الأساسي؟"""
+        return timeframe in self.intervals
+
+    def ratio(self, timeframe: str) -> int:
+        """عدد الشموع الأساسية في شمعة واحدة من الإطار"""
+        return self.intervals[timeframe] // self.base_interval
+
+    @property
+    def max_ratio(self) -> int:
+        """أكبر عدد شموع أساسية لشمعة مشتقة واحدة"""
+        return max(self.intervals.values(), default=self.base_interval) // self.base_interval
+
+    def derive(self, symbol: str, data: Union[pd.DataFrame, OHLCV]) -> Dict[str, int]:
+        """
+        اشتقاق جميع الأطر من تاريخ أساسي (مثل بيانات مجلوبة أو مستعادة من الأرشيف)
+
+        Parameters:
+            symbol: رمز الزوج
+            data: الشموع الأساسية
+
+        Returns:
+            Dict[str, int]: عدد الشموع المضافة لكل إطار مشتق
+        """
+        data = OHLCV.from_any(data)
+        added = {}
+        for timeframe, interval in self.intervals.items():
+            added[timeframe] = self.store.load(
+                symbol, timeframe, resample(data, interval, self.base_interval)
+            )
+        return added
+
+    def update(self, symbol: str) -> List[str]:
+        """
+        اشتقاق الشموع التي أغلقت منذ آخر تحديث من شموع المخزن الأساسية
+
+        Parameters:
+            symbol: رمز الزوج
+
+        Returns:
+            List[str]: الأطر التي أضيفت إليها شموع جديدة
+        """
+        base = self.store.window(symbol, self.base_timeframe)
+        if base is None:
+            return []
+
+        updated = []
+        for timeframe, interval in self.intervals.items():
+            last = self.store.last_timestamp(symbol, timeframe)
+            window = base
+            if last is not None:
+                # الشموع الأساسية بدءاً من الفترة التالية لآخر شمعة مشتقة
+                next_start = last + np.timedelta64(interval, 's')
+                window = base[int(np.searchsorted(base.timestamp, next_start)):]
+            if not len(window):
+                continue
+            if self.store.load(symbol, timeframe, resample(window, interval, self.base_interval)):
+                updated.append(timeframe)
+        return updated
+
+    def clear(self, symbol: str):
+        """حذف السلسلة الأساسية وجميع السلاسل المشتقة للزوج"""
+        for timeframe in [self.base_timeframe] + self.timeframes:
+            self.store.clear(symbol, timeframe)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+إدارة جلسة QXBroker في الخلفية
+
+تسجيل الدخول وتجديد رمز الوصول يتمان في خيط خلفي قبل انتهاء صلاحيته، مع تأخير متزايد
+عشوائي عند الفشل. الطلبات تقرأ آخر جلسة صالحة دون انتظار، فلا يقع تسجيل الدخول أبداً
+في مسار توليد الإشارات
+"""
+
+import logging
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# صلاحية الرمز إذا لم يحددها الخادم
+DEFAULT_TOKEN_TTL = 3600.0
+
+# التجديد قبل الانتهاء بهذه النسبة من الصلاحية (مع حد أدنى بالثواني)
+REFRESH_FRACTION = 0.1
+MIN_REFRESH_MARGIN = 5.0
+
+# التأخير بين محاولات تسجيل الدخول الفاشلة (يتضاعف حتى الحد الأقصى)
+MIN_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+
+
+class BrokerSession:
+    """جلسة ثابتة: رمز الوصول ووقت انتهائه (time.monotonic)"""
+
+    __slots__ = ('token', 'expires_at', 'refresh_at', 'headers')
+
+    def __init__(self, token: str, ttl: float, now: Optional[float] = None):
+        """
+        Parameters:
+            token: رمز الوصول
+            ttl: الصلاحية بالثواني
+            now: وقت الإنشاء (الافتراضي time.monotonic())
+        """
+        now = time.monotonic() if now is None else now
+        self.token = token
+        self.expires_at = now + ttl
+        self.refresh_at = self.expires_at - max(ttl * REFRESH_FRACTION, min(MIN_REFRESH_MARGIN, ttl / 2))
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+    def valid(self, now: Optional[float] = None) -> bool:
+        """هل الجلسة صالحة؟"""
+        return (time.monotonic() if now is None else now) < self.expires_at
+
+
+class SessionManager:
+    """
+    مدير الجلسة: يسجل الدخول ويجدد الرمز في خيط خلفي ويحتفظ بآخر جلسة صالحة
+
+    استبدال الجلسة عملية ذرية، فيقرأ أي خيط الجلسة الحالية دون قفل
+    """
+
+    def __init__(self, http, base_url: str, username: str, password: str, timeout: float = 10):
+        """
+        Parameters:
+            http: جلسة requests المشتركة (مجمع الاتصالات)
+            base_url: عنوان واجهة المنصة
+            username: اسم المستخدم
+            password: كلمة المرور
+            timeout: مهلة طلب تسجيل الدخول بالثواني
+        """
+        self.http = http
+        self.base_url = base_url.rstrip('/')
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+
+        self._session: Optional[BrokerSession] = None
+        self._ready = threading.Event()  # توجد جلسة صالحة
+        self._wake = threading.Event()  # طلب تجديد فوري
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+        self.logins = 0
+        self.failures = 0
+
+    def current(self) -> Optional[BrokerSession]:
+        """آخر جلسة صالحة أو None (دون انتظار)"""
+        session = self._session
+        if session is not None and session.valid():
+            return session
+        return None
+
+    def headers(self) -> Dict[str, str]:
+        """ترويسة التفويض للجلسة الحالية (فارغة إذا لم توجد جلسة صالحة)"""
+        session = self.current()
+        return session.headers if session is not None else {}
+
+    def start(self):
+        """بدء خيط التجديد في الخلفية (مرة واحدة)"""
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='qx-session', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5):
+        """إيقاف خيط التجديد"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        انتظار أول جلسة صالحة (للتهيئة فقط، وليس لمسار الطلبات)
+
+        Returns:
+            bool: True إذا توفرت جلسة صالحة
+        """
+        self.start()
+        self._ready.wait(timeout)
+        return self.current() is not None
+
+    def invalidate(self, token: str):
+        """
+        رفض الخادم للرمز: طلب تجديد فوري في الخلفية دون انتظاره
+
+        Parameters:
+            token: الرمز المرفوض (يُتجاهل إذا كانت الجلسة قد جُددت بالفعل)
+        """
+        session = self._session
+        if session is not None and session.token == token:
+            self._session = None
+            self._ready.clear()
+            logger.warning("رفض الخادم رمز الوصول، جارٍ التجديد في الخلفية")
+        self._wake.set()
+
+    def _authenticate(self) -> BrokerSession:
+        """تسجيل الدخول والحصول على جلسة جديدة"""
+        response = self.http.post(
+            f"{self.base_url}/auth/login",
+            json={"username": self.username, "password": self.password},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        payload = response.json()
+        return BrokerSession(payload["access_token"], float(payload.get("expires_in") or DEFAULT_TOKEN_TTL))
+
+    def _run(self):
+        """حلقة التجديد: تسجيل الدخول قبل انتهاء الرمز، وتأخير متزايد عشوائي عند الفشل"""
+        backoff = MIN_BACKOFF
+        while not self._stop.is_set():
+            session = self._session
+            now = time.monotonic()
+            if session is not None and now < session.refresh_at:
+                # انتظار موعد التجديد أو طلب تجديد فوري
+                self._wake.wait(session.refresh_at - now)
+                self._wake.clear()
+                if self._session is session and time.monotonic() < session.refresh_at:
+                    continue
+
+            try:
+                self._session = self._authenticate()
+                self._ready.set()
+                self.logins += 1
+                backoff = MIN_BACKOFF
+                logger.info("تم تسجيل الدخول إلى QXBroker")
+
+            except Exception as e:
+                self.failures += 1
+                # الجلسة السابقة تبقى مستخدمة حتى انتهاء صلاحيتها
+                delay = random.uniform(backoff / 2, backoff)
+                logger.error(f"خطأ أثناء تسجيل الدخول إلى QXBroker، إعادة المحاولة بعد {delay:.1f} ثانية: {str(e)}")
+                self._stop.wait(delay)
+                backoff = min(backoff * 2, MAX_BACKOFF)
+
+    def stats(self) -> Dict[str, object]:
+        """عدد عمليات تسجيل الدخول والفشل والوقت المتبقي للجلسة الحالية"""
+        session = self.current()
+        return {
+            'logins': self.logins,
+            'failures': self.failures,
+            'expires_in': session.expires_at - time.monotonic() if session is not None else None,
+        }
@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+محاكي سوق متجه بالكامل لتوليد شموع اصطناعية قابلة للتكرار
+
+المسار السعري مسير عشوائي لوغاريتمي بأنظمة سوق متبدلة (هادئ، صاعد، هابط، مضطرب)،
+وتقلب متجمع (لوغاريتم التقلب متوسط أسي لضجيج عشوائي)، وفجوات سعرية عشوائية
+وبعد عطلة نهاية الأسبوع للأسواق التي لا تتداول فيها
+
+الزمن مقسم إلى كتل ثابتة من الشموع حسب الوقت المطلق (وقت الشمعة // طول الشمعة)، ولكل
+كتلة مولد عشوائي خاص بها وسعر مرجعي عند بدايتها، والمسار داخل الكتلة جسر بين سعري
+طرفيها. لذلك الشمعة في وقت محدد هي نفسها دائماً مهما كان وقت الطلب أو عدد الشموع
+"""
+
+import logging
+import time
+import zlib
+from typing import Dict, Iterable, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.ohlcv import OHLCV
+from src.utils.helpers import timeframe_to_seconds
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_YEAR = 365 * 86400
+SECONDS_PER_WEEK = 7 * 86400
+
+
+class SymbolProfile(NamedTuple):
+    """خصائص الزوج في المحاكاة"""
+    base_price: float
+    annual_volatility: float
+    base_volume: float
+    trades_weekends: bool
+
+
+SYMBOL_PROFILES: Dict[str, SymbolProfile] = {
+    "BTCUSDT": SymbolProfile(60000, 0.60, 1000, True),
+    "ETHUSDT": SymbolProfile(3000, 0.75, 1000, True),
+    "BNBUSDT": SymbolProfile(550, 0.70, 1000, True),
+    "EURUSD": SymbolProfile(1.08, 0.08, 5000, False),
+    "GBPUSD": SymbolProfile(1.27, 0.09, 5000, False),
+    "USDJPY": SymbolProfile(150, 0.10, 5000, False),
+    "XAUUSD": SymbolProfile(2300, 0.15, 2000, False),
+}
+DEFAULT_PROFILE = SymbolProfile(100, 0.30, 1000, True)
+
+# أنظمة السوق: (الانحراف بوحدات التقلب لكل شمعة، مضاعف التقلب)
+REGIMES = np.array([
+    (0.00, 0.7),   # هادئ
+    (0.02, 1.0),   # صاعد
+    (-0.02, 1.1),  # هابط
+    (0.00, 1.6),   # مضطرب
+])
+# الأنظمة متساوية الاحتمال، فتُعاير المضاعفات ليكون متوسط التباين عبرها واحداً
+REGIMES[:, 1] /= np.sqrt(np.mean(REGIMES[:, 1] ** 2))
+
+# متوسط مدة النظام بالشموع
+MEAN_REGIME_LENGTH = 200
+
+# معامل تنعيم لوغاريتم التقلب وتأثيره
+VOLATILITY_ALPHA = 0.05
+VOLATILITY_OF_VOLATILITY = 0.5
+
+# احتمال فجوة عشوائية لكل شمعة، وحجم الفجوات بوحدات التقلب
+GAP_PROBABILITY = 0.005
+GAP_SCALE = 3.0
+WEEKEND_GAP_SCALE = 5.0
+
+# عدد الشموع في كل كتلة (وحدة التوليد العشوائي والسعر المرجعي)
+BLOCK_SIZE = 1024
+
+
+def symbol_profile(symbol: str) -> SymbolProfile:
+    """خصائص الزوج (الافتراضية للأزواج غير المعروفة)"""
+    return SYMBOL_PROFILES.get(symbol, DEFAULT_PROFILE)
+
+
+def trading_timestamps(end: int, count: int, interval: int, trades_weekends: bool = True) -> np.ndarray:
+    """
+    أوقات افتتاح آخر count شمعة تنتهي عند end، مع تخطي السبت والأحد إذا لزم
+
+    Parameters:
+        end: وقت افتتاح آخر شمعة بالثواني منذ 1970
+        count: عدد الشموع
+        interval: طول الشمعة بالثواني
+        trades_weekends: هل يتداول الزوج في عطلة نهاية الأسبوع
+
+    Returns:
+        np.ndarray: الأوقات بالثواني مرتبة تصاعدياً
+    """
+    if trades_weekends or interval >= SECONDS_PER_WEEK:
+        return end - np.arange(count - 1, -1, -1, dtype=np.int64) * interval
+
+    # شبكة تكفي لـ count شمعة في أيام العمل، ثم حذف شموع السبت والأحد
+    span = count * 7 // 5 + 3 * 86400 // interval + 1
+    grid = end - np.arange(span - 1, -1, -1, dtype=np.int64) * interval
+    return grid[trading_mask(grid, interval, trades_weekends)][-count:]
+
+
+def trading_mask(timestamps: np.ndarray, interval: int, trades_weekends: bool = True) -> np.ndarray:
+    """هل الشمعة (بوقت افتتاحها بالثواني) ضمن أوقات تداول الزوج؟"""
+    if trades_weekends or interval >= SECONDS_PER_WEEK:
+        return np.ones(np.shape(timestamps), dtype=bool)
+    weekday = (timestamps // 86400 + 3) % 7  # 1970-01-01 كان خميساً (الإثنين = 0)
+    return weekday < 5
+
+
+class MarketSimulator:
+    """
+    مولد شموع اصطناعية بعمليات NumPy متجهة (بدون حلقات لكل شمعة)
+
+    مع بذرة محددة، الشمعة في وقت افتتاح محدد هي نفسها دائماً لنفس (الزوج، الإطار الزمني)
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        """
+        Parameters:
+            seed: البذرة العشوائية (None لبذرة عشوائية تُسحب مرة واحدة: المسار ثابت طوال عمر
+                المحاكي ويختلف بين التشغيلات)
+        """
+        self.seed = np.random.SeedSequence().entropy if seed is None else seed
+
+    def _rng(self, symbol: str, interval: int, block: int) -> np.random.Generator:
+        """مولد أرقام عشوائية مستقل لكل (زوج، إطار زمني، كتلة)"""
+        # الكتل قبل 1970 سالبة، فتُمثل بمتممها لأن البذرة أعداد غير سالبة
+        return np.random.default_rng([self.seed, zlib.crc32(symbol.encode()), interval, block & 0xFFFFFFFFFFFFFFFF])
+
+    def _draw_blocks(self, symbol: str, interval: int, first: int, last: int) -> Dict[str, np.ndarray]:
+        """
+        السحوبات العشوائية للكتل من first إلى last (شاملة)، بنفس الترتيب دائماً لكل كتلة
+
+        لكل كتلة مولد مستقل، فتبقى الحلقة على الكتل (كتلة لكل 1024 شمعة) بثلاث سحوبات
+        تُكتب مباشرة في مصفوفات مجهزة مسبقاً، وبقية التحويلات متجهة عبر جميع الكتل
+
+        Returns:
+            Dict: مصفوفات بشكل (عدد الكتل، BLOCK_SIZE) ومرجع كل كتلة بشكل (عدد الكتل,)
+        """
+        blocks = last - first + 1
+        anchor = np.empty(blocks)
+        uniform = np.empty((blocks, 3, BLOCK_SIZE))  # تبدل النظام، النظام الجديد، الفجوات
+        normal = np.empty((blocks, 4, BLOCK_SIZE))  # ضجيج التقلب، ضجيج العائد، الفجوات، عطلة الأسبوع
+        wicks = np.empty((blocks, 2, BLOCK_SIZE))
+        for k, block in enumerate(range(first, last + 1)):
+            rng = self._rng(symbol, interval, block)
+            anchor[k] = rng.standard_normal()
+            rng.random(out=uniform[k])
+            rng.standard_normal(out=normal[k])
+            rng.standard_exponential(out=wicks[k])
+
+        # النظام يتبدل عند مواضع عشوائية، ويُسحب نظام جديد لبداية كل كتلة
+        switches = uniform[:, 0] < 1 / MEAN_REGIME_LENGTH
+        switches[:, 0] = True
+        regimes = (uniform[:, 1] * len(REGIMES)).astype(np.intp)
+        starts = np.maximum.accumulate(np.where(switches, np.arange(BLOCK_SIZE), 0), axis=1)
+
+        return {
+            'anchor': anchor,
+            'regime': np.take_along_axis(regimes, starts, axis=1),
+            'vol_noise': normal[:, 0],
+            'noise': normal[:, 1],
+            'gap': uniform[:, 2] < GAP_PROBABILITY,
+            'gap_noise': normal[:, 2],
+            'weekend_noise': normal[:, 3],
+            'wicks': wicks,
+        }
+
+    def generate(self, symbol: str, count: int = 50, timeframe: str = "1h",
+                 base_price: Optional[float] = None, end: Optional[float] = None) -> OHLCV:
+        """
+        توليد شموع اصطناعية
+
+        Parameters:
+            symbol: رمز الزوج
+            count: عدد الشموع
+            timeframe: الإطار الزمني
+            base_price: السعر المرجعي الذي يتذبذب حوله المسار (الافتراضي من خصائص الزوج)
+            end: الوقت المرجعي بالثواني (الافتراضي الآن)، وآخر شمعة هي آخر شمعة مغلقة قبله
+
+        Returns:
+            OHLCV: الشموع مع أوقاتها
+        """
+        profile = symbol_profile(symbol)
+        base_price = profile.base_price if base_price is None else base_price
+        interval = timeframe_to_seconds(timeframe)
+        end = time.time() if end is None else end
+
+        last_open = (int(end) // interval - 1) * interval
+        timestamps = trading_timestamps(last_open, count, interval, profile.trades_weekends)
+        n = len(timestamps)
+        if not n:
+            empty = np.zeros(0)
+            return OHLCV(empty, empty, empty, empty, empty, np.zeros(0, dtype='datetime64[ns]'))
+
+        sigma = profile.annual_volatility * np.sqrt(interval / SECONDS_PER_YEAR)
+        # الفجوات العشوائية جزء من التقلب المحقق، فيُخفض تقلب الشمعة العادية بقدرها
+        sigma /= np.sqrt(1 + GAP_PROBABILITY * GAP_SCALE ** 2)
+
+        # الكتل المطلوبة، مع الكتلة السابقة لإحماء التقلب ومرجع الكتلة التالية
+        first = int(timestamps[0] // interval) // BLOCK_SIZE
+        last = int(timestamps[-1] // interval) // BLOCK_SIZE
+        draws = self._draw_blocks(symbol, interval, first - 1, last + 1)
+        blocks = last - first + 1
+        buckets = (np.arange(first, last + 1, dtype=np.int64)[:, None] * BLOCK_SIZE
+                   + np.arange(BLOCK_SIZE, dtype=np.int64))
+
+        # الشموع خارج أوقات التداول لا تتحرك، وأول شمعة بعد الانقطاع تفتح بفجوة
+        trading = trading_mask(buckets * interval, interval, profile.trades_weekends)
+        previous = trading_mask((buckets - 1) * interval, interval, profile.trades_weekends)
+        reopen = trading & ~previous
+
+        regime = REGIMES[draws['regime'][1:-1]]
+        drift, vol_mult = regime[..., 0], regime[..., 1]
+
+        # تجمع التقلب: متوسط أسي للضجيج مُعاير لتباين واحد، يبدأ من الكتلة السابقة بتوزيعه
+        # المستقر فتعتمد قيم كل كتلة على ضجيجها وضجيج سابقتها فقط
+        stationary_std = np.sqrt(VOLATILITY_ALPHA / (2 - VOLATILITY_ALPHA))
+        vol_noise = np.concatenate([draws['vol_noise'][:-2], draws['vol_noise'][1:-1]], axis=1)
+        vol_noise[:, 0] *= stationary_std
+        log_vol = pd.DataFrame(vol_noise.T).ewm(alpha=VOLATILITY_ALPHA, adjust=False).mean().to_numpy().T
+        log_vol = log_vol[:, BLOCK_SIZE:] / stationary_std
+        # طرح VoV² (وليس VoV²/2) يجعل متوسط التباين sigma² فيبقى التقلب المحقق عند التقلب السنوي
+        sigmas = sigma * vol_mult * np.exp(VOLATILITY_OF_VOLATILITY * log_vol - VOLATILITY_OF_VOLATILITY ** 2)
+        sigmas = np.where(trading, sigmas, 0.0)
+
+        noise = draws['noise'][1:-1]
+        returns = sigmas * (drift + noise)
+        gaps = np.where(draws['gap'][1:-1], draws['gap_noise'][1:-1] * GAP_SCALE * sigmas, 0.0)
+        gaps += np.where(reopen, draws['weekend_noise'][1:-1] * WEEKEND_GAP_SCALE * sigmas, 0.0)
+
+        # جسر بين السعرين المرجعيين لطرفي الكتلة: الفرق يوزع على الشموع بحسب تباينها.
+        # تشتت المرجع يساوي تشتت مسير عشوائي على نصف كتلة فيبقى تقلب الشمعة sigma تقريباً
+        trading_share = trading.mean()
+        anchor_scale = sigma * np.sqrt(BLOCK_SIZE * trading_share / 2)
+        anchors = np.log(base_price) + anchor_scale * draws['anchor'][1:]
+        variance = sigmas ** 2
+        # الكتلة الواقعة كلها خارج أوقات التداول (مثل عطلة الأسبوع للفوركس على 1m) بلا تباين،
+        # فيُوضع فرقها على آخر شمعة فيها، وهي لا تظهر فيبدو كفجوة عند إعادة الافتتاح
+        variance[variance.sum(axis=1) == 0, -1] = 1.0
+        weights = variance / variance.sum(axis=1, keepdims=True)
+        shortfall = np.diff(anchors) - (returns + gaps).sum(axis=1)
+        returns += weights * shortfall[:, None]
+        log_close = anchors[:-1, None] + np.cumsum(returns + gaps, axis=1)
+
+        # الشموع المطلوبة من مواضعها المطلقة
+        pos = timestamps // interval - first * BLOCK_SIZE
+        log_close = log_close.ravel()[pos]
+        returns = returns.ravel()[pos]
+        sigmas = sigmas.ravel()[pos]
+        close = np.exp(log_close)
+        open_ = np.exp(log_close - returns)
+
+        # الظلال بتوزيع أسي، والحجم يتبع التقلب ومدى الشمعة
+        wicks = draws['wicks'][1:-1].transpose(1, 0, 2).reshape(2, -1)[:, pos]
+        wicks *= sigmas * 0.5
+        high = np.maximum(open_, close) * np.exp(wicks[0])
+        low = np.minimum(open_, close) * np.exp(-wicks[1])
+        volume = np.round(profile.base_volume * (sigmas / sigma) * (0.5 + (wicks[0] + wicks[1]) / (2 * sigmas)))
+
+        return OHLCV(open_, high, low, close, volume, timestamps.astype('datetime64[s]').astype('datetime64[ns]'))
+
+    def generate_many(self, symbols: Iterable[str], count: int = 50, timeframe: str = "1h",
+                      end: Optional[float] = None) -> Dict[str, OHLCV]:
+        """
+        توليد شموع لعدة أزواج بنفس الإطار الزمني ووقت النهاية
+
+        Returns:
+            Dict[str, OHLCV]: الشموع لكل زوج
+        """
+        end = time.time() if end is None else end
+        return {symbol: self.generate(symbol, count, timeframe, end=end) for symbol in symbols}
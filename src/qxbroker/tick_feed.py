@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+مشترك بث الأسعار (NDJSON): يستقبل التحديثات ويجمعها في شموع لحظياً
+
+كل سطر في البث كائن JSON بالشكل {"symbol", "price", "time", "volume"} (الوقت بالثواني
+منذ 1970، والحجم اختياري). الأسعار تُحدّث في لقطة أسعار العميل فوراً، وعند إغلاق
+شمعة تُضاف إلى مخزن الشموع عبر QXClient.add_candle فيُبلَّغ مستمعو إغلاق الشموع
+"""
+
+import json
+import logging
+import random
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from src.utils.helpers import timeframe_to_seconds
+
+logger = logging.getLogger(__name__)
+
+# مهلة الاتصال ومهلة انتظار السطر التالي بالثواني
+CONNECT_TIMEOUT = 10
+READ_TIMEOUT = 30
+
+# التأخير بين محاولات إعادة الاتصال (يتضاعف حتى الحد الأقصى)
+RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 30.0
+
+
+class Tick(NamedTuple):
+    """تحديث سعر واحد"""
+    symbol: str
+    price: float
+    time: float
+    volume: float = 0.0
+
+
+class ClosedCandle(NamedTuple):
+    """شمعة مغلقة ناتجة عن التجميع"""
+    symbol: str
+    timestamp: int  # وقت الافتتاح بالثواني منذ 1970
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+class CandleAggregator:
+    """
+    تجميع التحديثات في شمعة مفتوحة لكل زوج تُحدَّث في مكانها
+
+    الشمعة تُغلق عند وصول أول تحديث من فترة لاحقة (للزوج نفسه أو لأي زوج آخر)
+    """
+
+    __slots__ = ('interval', '_open', '_latest')
+
+    def __init__(self, interval: int):
+        """
+        Parameters:
+            interval: طول الشمعة بالثواني
+        """
+        self.interval = interval
+        # الزوج -> [بداية الفترة، افتتاح، أعلى، أدنى، إغلاق، حجم]
+        self._open: Dict[str, list] = {}
+        self._latest = 0
+
+    def add(self, tick: Tick) -> List[ClosedCandle]:
+        """
+        إضافة تحديث
+
+        Returns:
+            List[ClosedCandle]: الشموع التي أُغلقت بسبب هذا التحديث
+        """
+        bucket = int(tick.time) // self.interval * self.interval
+        closed = []
+
+        # فترة جديدة: إغلاق الشموع المفتوحة لجميع الأزواج في الفترات السابقة
+        if bucket > self._latest:
+            self._latest = bucket
+            closed = self.close_before(bucket)
+
+        candle = self._open.get(tick.symbol)
+        if candle is None:
+            self._open[tick.symbol] = [bucket, tick.price, tick.price, tick.price, tick.price, tick.volume]
+        elif bucket < candle[0]:
+            # تحديث متأخر من فترة أُغلقت، يُتجاهل
+            pass
+        else:
+            if tick.price > candle[2]:
+                candle[2] = tick.price
+            if tick.price < candle[3]:
+                candle[3] = tick.price
+            candle[4] = tick.price
+            candle[5] += tick.volume
+        return closed
+
+    def close_before(self, bucket: int) -> List[ClosedCandle]:
+        """إغلاق الشموع المفتوحة التي بدأت قبل الفترة المحددة"""
+        closed = []
+        for symbol, candle in list(self._open.items()):
+            if candle[0] < bucket:
+                closed.append(ClosedCandle(symbol, *candle))
+                del self._open[symbol]
+        return closed
+
+
+class TickFeed:
+    """
+    مشترك في بث الأسعار في خيط خلفي مع إعادة الاتصال التلقائية
+
+    يحدّث لقطة أسعار العميل مع كل تحديث، ويضيف الشموع المغلقة لإطار العميل الأساسي
+    إلى المخزن (فتُشتق الأطر الأعلى ويُبلَّغ المستمعون)
+    """
+
+    def __init__(self, client, url: Optional[str] = None, symbols: Optional[Iterable[str]] = None,
+                 timeframe: Optional[str] = None):
+        """
+        Parameters:
+            client: عميل QXClient
+            url: عنوان البث (الافتراضي {base_url}/stream)
+            symbols: الأزواج المشترك بها (None لجميع الأزواج)
+            timeframe: إطار الشموع المجمعة (الافتراضي الإطار الأساسي للعميل)
+        """
+        self.client = client
+        self.url = url or f"{client.base_url}/stream"
+        self.symbols = set(symbols) if symbols is not None else None
+        self.timeframe = timeframe or client.resampler.base_timeframe
+        self.aggregator = CandleAggregator(timeframe_to_seconds(self.timeframe))
+
+        self.ticks = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._response = None
+        self._lock = threading.Lock()
+
+    def subscribe(self, symbols: Iterable[str]):
+        """إضافة أزواج إلى الاشتراك"""
+        with self._lock:
+            if self.symbols is not None:
+                self.symbols.update(symbols)
+
+    def ingest(self, tick: Tick) -> List[ClosedCandle]:
+        """
+        معالجة تحديث واحد: تحديث السعر، والتجميع، وإضافة الشموع المغلقة
+
+        Returns:
+            List[ClosedCandle]: الشموع المغلقة
+        """
+        if self.symbols is not None and tick.symbol not in self.symbols:
+            return []
+
+        with self._lock:
+            self.ticks += 1
+            self.client.prices.update({tick.symbol: tick.price})
+            closed = self.aggregator.add(tick)
+
+        for candle in closed:
+            self.client.add_candle(
+                candle.symbol, self.timeframe, candle.timestamp * 10 ** 9,
+                candle.open, candle.high, candle.low, candle.close, candle.volume
+            )
+        return closed
+
+    def ingest_line(self, line) -> List[ClosedCandle]:
+        """معالجة سطر NDJSON (الأسطر الفارغة أو غير الصالحة تُتجاهل)"""
+        if not line:
+            return []
+        try:
+            payload = json.loads(line)
+            tick = Tick(payload['symbol'], float(payload['price']), float(payload['time']),
+                        float(payload.get('volume', 0.0)))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"تحديث غير صالح في البث: {str(e)}")
+            return []
+        return self.ingest(tick)
+
+    def start(self):
+        """بدء الاستماع في خيط خلفي"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='qx-tick-feed', daemon=True)
+        self._thread.start()
+        logger.info(f"تم بدء الاشتراك في بث الأسعار {self.url}")
+
+    def stop(self, timeout: Optional[float] = 5):
+        """إيقاف الاستماع وإغلاق الاتصال"""
+        self._stop.set()
+        response = self._response
+        if response is not None:
+            response.close()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self):
+        """حلقة الاتصال والقراءة مع إعادة الاتصال بتأخير متزايد عشوائي"""
+        delay = RECONNECT_DELAY
+        while not self._stop.is_set():
+            try:
+                self.client.auth.start()
+                session = self.client.auth.current()
+                if session is None:
+                    raise ConnectionError("لا توجد جلسة صالحة لـ QXBroker بعد")
+
+                params = {'symbols': ','.join(sorted(self.symbols))} if self.symbols else None
+                self._response = self.client.session.get(
+                    self.url, params=params, headers=session.headers, stream=True,
+                    timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)
+                )
+                if self._response.status_code == 401:
+                    self.client.auth.invalidate(session.token)
+                self._response.raise_for_status()
+
+                delay = RECONNECT_DELAY
+                for line in self._response.iter_lines():
+                    if self._stop.is_set():
+                        break
+                    self.ingest_line(line)
+
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                logger.error(f"انقطع بث الأسعار: {str(e)}")
+            finally:
+                if self._response is not None:
+                    self._response.close()
+                    self._response = None
+
+            if self._stop.wait(delay * random.uniform(0.5, 1.5)):
+                break
+            delay = min(delay * 2, MAX_RECONNECT_DELAY)
+
+        logger.info("تم إيقاف الاشتراك في بث الأسعار")
@@ -1,77 +1,77 @@
-#!/usr/bin/env python
-# -*- coding: utf-8 -*-
-"""
-قوالب الرسائل لبوت تليجرام
-"""
-
-# رسالة الترحيب
-WELCOME_MESSAGE = """
-مرحبًا بك {username} في بوت التداول الذكي! 🚀
-
-أنا مساعدك الشخصي للتداول، مدعوم بتقنيات الذكاء الاصطناعي لتقديم إشارات تداول عالية الدقة.
-
-استخدم الأوامر التالية للتفاعل معي:
-/تحليل BTCUSDT 1h - لتحليل زوج على إطار زمني محدد
-/إشارة - لعرض أقوى إشارة حالية
-/الإعدادات - لتخصيص تفضيلاتك
-/مساعدة - للحصول على مساعدة إضافية
-
-يمكنك أيضًا استخدام لوحة المفاتيح أدناه للوصول إلى الوظائف بسهولة.
-"""
-
-# رسالة المساعدة
-HELP_MESSAGE = """
-💡 *دليل الاستخدام - بوت التداول الذكي* 💡
-
-*الأوامر الأساسية:*
-/ابدأ - بدء استخدام البوت
-/تحليل BTCUSDT 1h - تحليل زوج على إطار زمني محدد
-/إشارة - عرض أقوى إشارة تداول حالية
-/الإعدادات - تخصيص إعدادات البوت
-/مساعدة - عرض هذه المساعدة
-
-*الرموز المستخدمة:*
-🟢 - إشارة شراء
-🔴 - إشارة بيع
-⚪ - انتظار أو عدم وجود إشارة
-📊 - بيانات التحليل الفني
-🔔 - الإشعارات والتنبيهات
-
-*الأزواج المدعومة:*
-- العملات المشفرة: BTC/USDT, ETH/USDT, BNB/USDT
-- العملات الأجنبية: EUR/USD, GBP/USD, USD/JPY
-- السلع: GOLD (XAUUSD)
-
-*الأطر الزمنية المدعومة:*
-5m, 15m, 30m, 1h, 4h, 1d
-
-*للحصول على أفضل النتائج:*
-- استخدم أطرًا زمنية متعددة للتأكد من الاتجاه
-- ضع وقف الخسارة دائمًا كما هو مقترح في الإشارة
-- لا تتجاهل نسبة الثقة المعروضة مع كل إشارة
-"""
-
-# رسالة الإعدادات
-SETTINGS_MESSAGE = """
-⚙️ *إعدادات البوت* ⚙️
-
-*الإشعارات:* {notification}
-*اللغة:* {language}
-
-*الأزواج المدعومة:*
-{pairs}
-
-*الأطر الزمنية المدعومة:*
-{timeframes}
-
-اختر من القائمة أدناه لتغيير الإعدادات:
-"""
-
-# رسالة معالجة الإشارة
-SIGNAL_PROCESSING_MESSAGE = """
-⏳ *جاري تحليل {symbol} على الإطار الزمني {timeframe}*
-
-يرجى الانتظار بينما أقوم بتحليل البيانات وإنشاء توصية...
-
-هذه العملية قد تستغرق عدة ثوانٍ لضمان جودة التحليل.
-"""
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+قوالب الرسائل لبوت تليجرام
+"""
+
+# رسالة الترحيب
+WELCOME_MESSAGE = """
+مرحبًا بك {username} في بوت التداول الذكي! 🚀
+
+أنا مساعدك الشخصي للتداول، مدعوم بتقنيات الذكاء الاصطناعي لتقديم إشارات تداول عالية الدقة.
+
+استخدم الأوامر التالية للتفاعل معي:
+/تحليل BTCUSDT 1h - لتحليل زوج على إطار زمني محدد
+/إشارة - لعرض أقوى إشارة حالية
+/الإعدادات - لتخصيص تفضيلاتك
+/مساعدة - للحصول على مساعدة إضافية
+
+يمكنك أيضًا استخدام لوحة المفاتيح أدناه للوصول إلى الوظائف بسهولة.
+"""
+
+# رسالة المساعدة
+HELP_MESSAGE = """
+💡 *دليل الاستخدام - بوت التداول الذكي* 💡
+
+*الأوامر الأساسية:*
+/ابدأ - بدء استخدام البوت
+/تحليل BTCUSDT 1h - تحليل زوج على إطار زمني محدد
+/إشارة - عرض أقوى إشارة تداول حالية
+/الإعدادات - تخصيص إعدادات البوت
+/مساعدة - عرض هذه المساعدة
+
+*الرموز المستخدمة:*
+🟢 - إشارة شراء
+🔴 - إشارة بيع
+⚪ - انتظار أو عدم وجود إشارة
+📊 - بيانات التحليل الفني
+🔔 - الإشعارات والتنبيهات
+
+*الأزواج المدعومة:*
+- العملات المشفرة: BTC/USDT, ETH/USDT, BNB/USDT
+- العملات الأجنبية: EUR/USD, GBP/USD, USD/JPY
+- السلع: GOLD (XAUUSD)
+
+*الأطر الزمنية المدعومة:*
+5m, 15m, 30m, 1h, 4h, 1d
+
+*للحصول على أفضل النتائج:*
+- استخدم أطرًا زمنية متعددة للتأكد من الاتجاه
+- ضع وقف الخسارة دائمًا كما هو مقترح في الإشارة
+- لا تتجاهل نسبة الثقة المعروضة مع كل إشارة
+"""
+
+# رسالة الإعدادات
+SETTINGS_MESSAGE = """
+⚙️ *إعدادات البوت* ⚙️
+
+*الإشعارات:* {notification}
+*اللغة:* {language}
+
+*الأزواج المدعومة:*
+{pairs}
+
+*الأطر الزمنية المدعومة:*
+{timeframes}
+
+اختر من القائمة أدناه لتغيير الإعدادات:
+"""
+
+# رسالة معالجة الإشارة
+SIGNAL_PROCESSING_MESSAGE = """
+⏳ *جاري تحليل {symbol} على الإطار الزمني {timeframe}*
+
+يرجى الانتظار بينما أقوم بتحليل البيانات وإنشاء توصية...
+
+هذه العملية قد تستغرق عدة ثوانٍ لضمان جودة التحليل.
+"""
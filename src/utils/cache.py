@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+تخزين مؤقت محدود الحجم مع صلاحية لكل عنصر
+"""
+
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+# الحد الافتراضي لحجم التخزين المؤقت بالبايت
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def estimate_size(value: Any) -> int:
+    """
+    تقدير حجم القيمة في الذاكرة بالبايت
+
+    المصفوفات والحاويات التي توفر nbytes تُقاس ببياناتها، والباقي بـ sys.getsizeof
+    """
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+    try:
+        return sys.getsizeof(value)
+    except TypeError:
+        return 64
+
+
+class TTLCache:
+    """
+    تخزين مؤقت بصلاحية لكل عنصر وحذف الأقدم استخداماً عند تجاوز حد الذاكرة أو عدد العناصر
+
+    آمن للاستخدام من عدة خيوط، ويحتفظ بعدادات الإصابة والإخفاق والحذف
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, default_ttl: Optional[float] = None,
+                 on_evict: Optional[Callable[[Hashable, Any], None]] = None,
+                 max_entries: Optional[int] = None):
+        """
+        Parameters:
+            max_bytes: الحد الأقصى لمجموع أحجام العناصر
+            default_ttl: الصلاحية الافتراضية بالثواني (None تعني بلا انتهاء)
+            on_evict: دالة تُستدعى عند حذف عنصر بسبب حد الذاكرة أو عدد العناصر
+            max_entries: الحد الأقصى لعدد العناصر (None بلا حد)
+        """
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.on_evict = on_evict
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        قراءة عنصر صالح من التخزين المؤقت
+
+        Parameters:
+            key: المفتاح
+            default: القيمة المرجعة إذا لم يوجد العنصر أو انتهت صلاحيته
+
+        Returns:
+            Any: القيمة المخزنة أو default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at, size = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None, size: Optional[int] = None):
+        """
+        تخزين عنصر
+
+        Parameters:
+            key: المفتاح
+            value: القيمة
+            ttl: الصلاحية بالثواني (الافتراضي default_ttl)
+            size: حجم العنصر بالبايت (الافتراضي تقدير تلقائي)
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        size = estimate_size(value) if size is None else size
+
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires_at, size)
+            self._bytes += size
+
+            # حذف الأقدم استخداماً حتى العودة تحت الحدود (مع إبقاء العنصر الجديد)
+            while len(self._entries) > 1 and (
+                self._bytes > self.max_bytes
+                or (self.max_entries is not None and len(self._entries) > self.max_entries)
+            ):
+                old_key, (old_value, _, _) = next(iter(self._entries.items()))
+                self._remove(old_key)
+                self.evictions += 1
+                evicted.append((old_key, old_value))
+
+        for old_key, old_value in evicted:
+            logger.debug(f"حذف {old_key} من التخزين المؤقت لتجاوز الحد")
+            if self.on_evict is not None:
+                try:
+                    self.on_evict(old_key, old_value)
+                except Exception as e:
+                    logger.error(f"خطأ أثناء معالجة حذف {old_key}: {str(e)}")
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """حذف عنصر وإرجاع قيمته"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._remove(key)
+            return entry[0]
+
+    def _remove(self, key: Hashable):
+        """حذف عنصر وتحديث الحجم الكلي (يُستدعى مع القفل)"""
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        """حذف جميع العناصر"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        """هل يوجد عنصر صالح بالمفتاح؟ (دون تعديل العدادات)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry[1] is None or time.monotonic() < entry[1])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        """مجموع أحجام العناصر المخزنة"""
+        return self._bytes
+
+    def stats(self) -> Dict[str, int]:
+        """
+        إحصائيات التخزين المؤقت
+
+        Returns:
+            Dict[str, int]: عدد العناصر والحجم والإصابات والإخفاقات وعمليات الحذف
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
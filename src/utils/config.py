@@ -1,76 +1,106 @@
-#!/usr/bin/env python
-# -*- coding: utf-8 -*-
-"""
-إدارة الإعدادات والمتغيرات البيئية
-"""
-
-import os
-import logging
-from dataclasses import dataclass
-
-logger = logging.getLogger(__name__)
-
-@dataclass
-class Config:
-    """فئة الإعدادات الرئيسية"""
-    TELEGRAM_BOT_TOKEN: str
-    TELEGRAM_ADMIN_ID: str
-    QX_USERNAME: str
-    QX_PASSWORD: str
-    DEBUG: bool = False
-    
-    # إعدادات الأزواج المدعومة
-    SUPPORTED_PAIRS = [
-        "BTCUSDT", "ETHUSDT", "BNBUSDT",  # عملات مشفرة
-        "EURUSD", "GBPUSD", "USDJPY",     # عملات أجنبية
-        "XAUUSD"                          # ذهب
-    ]
-    
-    # الأطر الزمنية المدعومة
-    SUPPORTED_TIMEFRAMES = ["5m", "15m", "30m", "1h", "4h", "1d"]
-    
-    # الحد الأدنى لنسبة الثقة لإصدار إشارة
-    MIN_CONFIDENCE = 70
-
-def load_config():
-    """
-    تحميل الإعدادات من المتغيرات البيئية
-    
-    Returns:
-        Config: كائن الإعدادات
-    """
-    try:
-        # القراءة من المتغيرات البيئية
-        telegram_bot_token = os.environ.get('TELEGRAM_BOT_TOKEN')
-        telegram_admin_id = os.environ.get('TELEGRAM_ADMIN_ID')
-        qx_username = os.environ.get('QX_USERNAME')
-        qx_password = os.environ.get('QX_PASSWORD')
-        debug = os.environ.get('DEBUG', 'False').lower() == 'true'
-        
-        # التحقق من وجود المتغيرات الإلزامية
-        missing_vars = []
-        if not telegram_bot_token:
-            missing_vars.append('TELEGRAM_BOT_TOKEN')
-        if not telegram_admin_id:
-            missing_vars.append('TELEGRAM_ADMIN_ID')
-        if not qx_username:
-            missing_vars.append('QX_USERNAME')
-        if not qx_password:
-            missing_vars.append('QX_PASSWORD')
-        
-        if missing_vars:
-            logger.error(f"متغيرات بيئية مفقودة: {', '.join(missing_vars)}")
-            raise ValueError(f"متغيرات بيئية مفقودة: {', '.join(missing_vars)}")
-        
-        # إنشاء وإرجاع كائن الإعدادات
-        return Config(
-            TELEGRAM_BOT_TOKEN=telegram_bot_token,
-            TELEGRAM_ADMIN_ID=telegram_admin_id,
-            QX_USERNAME=qx_username,
-            QX_PASSWORD=qx_password,
-            DEBUG=debug
-        )
-        
-    except Exception as e:
-        logger.error(f"خطأ أثناء تحميل الإعدادات: {e}")
-        raise
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+إدارة الإعدادات والمتغيرات البيئية
+"""
+
+import os
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class Config:
+    """فئة الإعدادات الرئيسية"""
+    TELEGRAM_BOT_TOKEN: str
+    TELEGRAM_ADMIN_ID: str
+    QX_USERNAME: str
+    QX_PASSWORD: str
+    DEBUG: bool = False
+    # مجلد أرشيف الشموع على القرص (فارغ لتعطيل الأرشيف)
+    CANDLE_ARCHIVE_DIR: str = "data/candles"
+    # عنوان واجهة المنصة
+    QX_API_URL: str = "https://qxbroker.com/api/v1"
+    # وضع عميل QXBroker: mock (محاكاة داخلية) أو http (طلبات إلى QX_API_URL، مثل الخادم البديل المحلي)
+    QX_MODE: str = "mock"
+    # بذرة محاكي السوق لبيانات قابلة للتكرار (None لبذرة عشوائية: المسار ثابت خلال التشغيل ويختلف بين التشغيلات)
+    SIMULATOR_SEED: Optional[int] = None
+    
+    # إعدادات الأزواج المدعومة
+    SUPPORTED_PAIRS = [
+        "BTCUSDT", "ETHUSDT", "BNBUSDT",  # عملات مشفرة
+        "EURUSD", "GBPUSD", "USDJPY",     # عملات أجنبية
+        "XAUUSD"                          # ذهب
+    ]
+    
+    # الأطر الزمنية المدعومة
+    SUPPORTED_TIMEFRAMES = ["5m", "15m", "30m", "1h", "4h", "1d"]
+    
+    # الإطار الأساسي الذي تُجلب شموعه وتُشتق منه بقية الأطر
+    BASE_TIMEFRAME = "5m"
+    
+    # الحد الأدنى لنسبة الثقة لإصدار إشارة
+    MIN_CONFIDENCE = 70
+    
+    # إعادة حساب الإشارات في الخلفية بعد إغلاق كل شمعة: التأخير بالثواني وعدد الخيوط
+    SCHEDULER_DELAY = 2.0
+    SCHEDULER_WORKERS = 4
+    
+    # المؤشرات الفنية النشطة (من سجل المؤشرات)، وتحدد عدد الشموع المطلوب جلبه
+    ACTIVE_INDICATORS = [
+        "SMA_20", "SMA_50", "SMA_200", "EMA_20", "EMA_50", "EMA_200",
+        "RSI", "MACD", "Stochastic", "Bollinger", "ADX"
+    ]
+
+def load_config():
+    """
+    تحميل الإعدادات من المتغيرات البيئية
+    
+    Returns:
+        Config: كائن الإعدادات
+    """
+    try:
+        # القراءة من المتغيرات البيئية
+        telegram_bot_token = os.environ.get('TELEGRAM_BOT_TOKEN')
+        telegram_admin_id = os.environ.get('TELEGRAM_ADMIN_ID')
+        qx_username = os.environ.get('QX_USERNAME')
+        qx_password = os.environ.get('QX_PASSWORD')
+        debug = os.environ.get('DEBUG', 'False').lower() == 'true'
+        candle_archive_dir = os.environ.get('CANDLE_ARCHIVE_DIR', 'data/candles')
+        qx_api_url = os.environ.get('QX_API_URL', 'https://qxbroker.com/api/v1')
+        simulator_seed = os.environ.get('SIMULATOR_SEED')
+        qx_mode = os.environ.get('QX_MODE', 'mock').lower()
+        
+        # التحقق من وجود المتغيرات الإلزامية
+        missing_vars = []
+        if not telegram_bot_token:
+            missing_vars.append('TELEGRAM_BOT_TOKEN')
+        if not telegram_admin_id:
+            missing_vars.append('TELEGRAM_ADMIN_ID')
+        if not qx_username:
+            missing_vars.append('QX_USERNAME')
+        if not qx_password:
+            missing_vars.append('QX_PASSWORD')
+        
+        if missing_vars:
+            logger.error(f"متغيرات بيئية مفقودة: {', '.join(missing_vars)}")
+            raise ValueError(f"متغيرات بيئية مفقودة: {', '.join(missing_vars)}")
+        
+        # إنشاء وإرجاع كائن الإعدادات
+        return Config(
+            TELEGRAM_BOT_TOKEN=telegram_bot_token,
+            TELEGRAM_ADMIN_ID=telegram_admin_id,
+            QX_USERNAME=qx_username,
+            QX_PASSWORD=qx_password,
+            DEBUG=debug,
+            CANDLE_ARCHIVE_DIR=candle_archive_dir,
+            QX_API_URL=qx_api_url,
+            SIMULATOR_SEED=int(simulator_seed) if simulator_seed else None,
+            QX_MODE=qx_mode
+        )
+        
+    except Exception as e:
+        logger.error(f"خطأ أثناء تحميل الإعدادات: {e}")
+        raise
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+دمج الطلبات المتزامنة المتطابقة (single-flight)
+
+عند طلب نفس المفتاح من عدة خيوط في الوقت نفسه، ينفذ أول خيط العملية وينتظر
+الباقون نتيجتها بدلاً من تكرارها
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """عملية جارية لمفتاح واحد ونتيجتها"""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    تنفيذ عملية واحدة لكل مفتاح في وقت واحد ومشاركة نتيجتها مع جميع الطالبين المتزامنين
+
+    النتيجة لا تُخزن بعد انتهاء العملية (التخزين المؤقت مسؤولية المستدعي)، والاستثناء
+    يُعاد رفعه لدى جميع المنتظرين
+    """
+
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        تنفيذ fn أو انتظار نتيجة تنفيذ جارٍ لنفس المفتاح
+
+        Parameters:
+            key: مفتاح العملية
+            fn: العملية (بدون معاملات)
+
+        Returns:
+            Any: نتيجة العملية
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.calls += 1
+                leader = True
+            else:
+                self.shared += 1
+                leader = False
+
+        if not leader:
+            logger.debug(f"انتظار عملية جارية لـ {key}")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def in_flight(self, key: Hashable) -> bool:
+        """هل توجد عملية جارية للمفتاح؟"""
+        with self._lock:
+            return key in self._flights
+
+    def stats(self) -> Dict[str, int]:
+        """عدد العمليات المنفذة وعدد الطلبات التي شاركت نتيجة عملية جارية"""
+        with self._lock:
+            return {'calls': self.calls, 'shared': self.shared, 'in_flight': len(self._flights)}
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+import requests
+
+from src.qxbroker.async_client import AsyncQXClient
+from src.qxbroker.fake_server import FakeBroker, FakeBrokerSettings
+from src.qxbroker.session import SessionManager
+
+
+@pytest.fixture
+def broker():
+    broker = FakeBroker(FakeBrokerSettings(latency=0.0, seed=1))
+    broker.run_in_thread()
+    yield broker
+    broker.stop_thread()
+
+
+def _run(broker, scenario):
+    """تشغيل سيناريو على عميل غير متزامن بمدير جلسة متصل بالخادم البديل"""
+    auth = SessionManager(requests.Session(), broker.base_url, 'user', 'secret')
+
+    async def main():
+        async with AsyncQXClient(auth=auth) as client:
+            assert await client.login(timeout=5)
+            return await scenario(client)
+
+    try:
+        return asyncio.run(main())
+    finally:
+        auth.stop()
+
+
+def test_historical_data_many(broker):
+    async def scenario(client):
+        return await client.get_historical_data_many(['BTCUSDT', 'EURUSD'], '5m', limit=30)
+
+    frames = _run(broker, scenario)
+    for frame in frames.values():
+        assert len(frame) == 30
+        assert list(frame.columns) == ['Open', 'High', 'Low', 'Close', 'Volume', 'Date']
+        assert (frame['High'] >= frame['Low']).all()
+        assert frame['Date'].is_monotonic_increasing
+
+
+def test_bulk_prices_use_one_request_and_cache(broker):
+    async def scenario(client):
+        before = broker.stats['requests']
+        prices = await client.get_current_prices(['BTCUSDT', 'EURUSD', 'XAUUSD'])
+        cached = await client.get_current_price('EURUSD')
+        return prices, cached, broker.stats['requests'] - before
+
+    prices, cached, requests_made = _run(broker, scenario)
+    assert requests_made == 1
+    assert set(prices) == {'BTCUSDT', 'EURUSD', 'XAUUSD'}
+    assert all(price > 0 for price in prices.values())
+    assert cached == prices['EURUSD']
+
+
+def test_rejected_token_is_renewed_in_background(broker):
+    """الرمز المرفوض يُجدد في الخلفية، والطلب الفاشل لا ينتظر تسجيل الدخول"""
+    async def scenario(client):
+        broker._tokens.clear()
+        failed = await client.get_historical_data('BTCUSDT', '5m', limit=10)
+        renewed = await client.login(timeout=5)
+        retried = await client.get_historical_data('BTCUSDT', '5m', limit=10)
+        return failed, renewed, retried, client.auth.logins
+
+    failed, renewed, retried, logins = _run(broker, scenario)
+    # الطلب المرفوض يفشل فوراً إلا إذا سبقه التجديد في الخلفية
+    assert failed is None or len(failed) == 10
+    assert renewed
+    assert len(retried) == 10
+    assert logins == 2
+
+
+def test_rate_limited_requests_are_retried(broker):
+    broker.settings.rate_limit = 5
+
+    async def scenario(client):
+        return await client.get_historical_data_many(
+            ['BTCUSDT', 'EURUSD', 'XAUUSD', 'ETHUSDT', 'GBPUSD', 'USDJPY', 'AUDUSD', 'BNBUSDT'], '5m', limit=5
+        )
+
+    frames = _run(broker, scenario)
+    assert broker.stats['rate_limited'] > 0
+    assert all(frame is not None and len(frame) == 5 for frame in frames.values())
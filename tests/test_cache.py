@@ -0,0 +1,43 @@
+from src.utils.cache import TTLCache
+
+
+def test_evicts_least_recently_used_over_byte_limit():
+    """تجاوز حد الذاكرة يحذف الأقدم استخداماً ويستدعي on_evict"""
+    evicted = []
+    cache = TTLCache(max_bytes=300, on_evict=lambda key, value: evicted.append(key))
+    cache.set('a', 1, size=100)
+    cache.set('b', 2, size=100)
+    cache.set('c', 3, size=100)
+    assert cache.get('a') == 1  # a أصبح الأحدث استخداماً
+    cache.set('d', 4, size=150)
+
+    assert evicted == ['b', 'c']
+    assert 'a' in cache and 'd' in cache
+    assert cache.size_bytes == 250
+
+
+def test_evicts_over_entry_limit():
+    """تجاوز عدد العناصر يحذف الأقدم استخداماً"""
+    cache = TTLCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.set('c', 3)
+    assert 'a' not in cache
+    assert len(cache) == 2
+    assert cache.stats()['evictions'] == 1
+
+
+def test_keeps_single_oversized_entry():
+    """العنصر الجديد يبقى حتى لو تجاوز حجمه الحد وحده"""
+    cache = TTLCache(max_bytes=10)
+    cache.set('big', 'x', size=100)
+    assert cache.get('big') == 'x'
+
+
+def test_expired_entries_are_misses():
+    """العنصر المنتهي صلاحيته يُعامل كإخفاق ويُحذف"""
+    cache = TTLCache()
+    cache.set('a', 1, ttl=0)
+    assert cache.get('a', 'missing') == 'missing'
+    assert len(cache) == 0
+    assert cache.stats()['expirations'] == 1
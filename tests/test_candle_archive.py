@@ -0,0 +1,78 @@
+import time
+
+import numpy as np
+import pytest
+
+from src.qxbroker.candle_archive import CandleArchive, CandleArchiveFile
+from src.qxbroker.qx_client import QXClient
+from src.qxbroker.simulator import MarketSimulator
+
+
+def _candles(count):
+    return MarketSimulator(seed=6).generate('EURUSD', count, '5m', end=1_750_000_000)
+
+
+def _assert_same(actual, expected):
+    np.testing.assert_array_equal(actual.timestamp, expected.timestamp)
+    for column in ('open', 'high', 'low', 'close', 'volume'):
+        np.testing.assert_array_equal(getattr(actual, column), getattr(expected, column))
+
+
+def test_append_round_trip(tmp_path):
+    """الشموع المؤرشفة تُقرأ كما هي بعد إعادة فتح الملف، والمكررة لا تُضاف"""
+    data = _candles(3000)
+    path = str(tmp_path / 'EURUSD_5m.candles')
+    archive = CandleArchiveFile(path)
+    assert archive.append(data[:2000]) == 2000
+    assert archive.append(data[1500:]) == 1000
+
+    reopened = CandleArchiveFile(path)
+    assert len(reopened) == 3000
+    _assert_same(reopened.tail(3000), data)
+    _assert_same(reopened.tail(10), data[-10:])
+    _assert_same(reopened.range(data.timestamp[1234], data.timestamp[2345]), data[1234:2346])
+
+
+def test_append_prepends_older_history(tmp_path):
+    """الشموع الأقدم من بداية الأرشيف تُضاف في بدايته"""
+    data = _candles(3000)
+    archive = CandleArchiveFile(str(tmp_path / 'EURUSD_5m.candles'))
+    archive.append(data[2400:])
+    assert archive.append(data) == 2400
+    assert len(archive) == 3000
+    _assert_same(archive.range(), data)
+
+
+def test_archive_series(tmp_path):
+    """المجلد يحتفظ بملف لكل سلسلة"""
+    archive = CandleArchive(str(tmp_path))
+    archive.append('EURUSD', '5m', _candles(10))
+    archive.append('BTCUSDT', '1h', _candles(10))
+    assert sorted(archive.series()) == [('BTCUSDT', '1h'), ('EURUSD', '5m')]
+
+
+@pytest.fixture
+def archived_client(tmp_path, monkeypatch):
+    """عميل محاكاة يبدأ من أرشيف متأخر ثلاث ساعات عن آخر شمعة مغلقة"""
+    env = {'TELEGRAM_BOT_TOKEN': 'x', 'TELEGRAM_ADMIN_ID': '1', 'QX_USERNAME': 'u', 'QX_PASSWORD': 'p',
+           'QX_MODE': 'mock', 'CANDLE_ARCHIVE_DIR': str(tmp_path), 'SIMULATOR_SEED': '5'}
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+
+    stale = MarketSimulator(seed=5).generate('BTCUSDT', 3000, '5m', end=time.time() - 3 * 3600)
+    CandleArchive(str(tmp_path)).append('BTCUSDT', '5m', stale)
+
+    QXClient._instance = None
+    client = QXClient()
+    client.initialize()
+    yield client
+    QXClient._instance = None
+
+
+def test_warm_start_fetches_candles_missing_from_archive(archived_client):
+    """الأرشيف المتأخر يُكمل حتى آخر شمعة مغلقة قبل تسجيله حديثاً، والسعر من آخر إغلاق"""
+    client = archived_client
+    assert client._missing_candles('BTCUSDT', '5m') == 0
+    for timeframe in ('5m', '1h'):
+        assert client.cache.get(f"historical_BTCUSDT_{timeframe}") is not None
+    assert client.get_current_price('BTCUSDT') == client.candles.window('BTCUSDT', '5m', 1).close[-1]
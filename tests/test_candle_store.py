@@ -0,0 +1,45 @@
+import numpy as np
+
+from src.qxbroker.candle_store import CandleBuffer, CandleStore
+from src.qxbroker.simulator import MarketSimulator
+
+
+def _candles(count):
+    return MarketSimulator(seed=5).generate('BTCUSDT', count, '1h', end=1_750_000_000)
+
+
+def test_ring_wraparound_keeps_latest_candles():
+    """بعد تجاوز السعة تبقى آخر capacity شمعة بالترتيب"""
+    data = _candles(23)
+    buffer = CandleBuffer(capacity=5)
+    for i in range(len(data)):
+        row = data.row(i)
+        assert buffer.append(data.timestamp[i], row['Open'], row['High'], row['Low'], row['Close'], row['Volume'])
+
+    window = buffer.window()
+    assert len(window) == 5
+    np.testing.assert_array_equal(window.timestamp, data.timestamp[-5:])
+    np.testing.assert_array_equal(window.close, data.close[-5:])
+    np.testing.assert_array_equal(buffer.window(2).close, data.close[-2:])
+
+
+def test_load_wraps_and_ignores_older_candles():
+    """التحميل الدفعي يلف حول الحلقة ويتجاهل الشموع غير الأحدث من آخر شمعة"""
+    data = _candles(40)
+    store = CandleStore(capacity=8)
+    assert store.load('BTCUSDT', '1h', data[:13]) == 8  # لا فائدة من كتابة أكثر من السعة
+    assert store.load('BTCUSDT', '1h', data[10:17]) == 4
+    assert store.load('BTCUSDT', '1h', data[:5]) == 0
+
+    window = store.window('BTCUSDT', '1h')
+    assert store.length('BTCUSDT', '1h') == 8
+    np.testing.assert_array_equal(window.timestamp, data.timestamp[9:17])
+    np.testing.assert_array_equal(window.open, data.open[9:17])
+
+
+def test_window_is_read_only_view():
+    """النافذة تشير إلى ذاكرة المخزن دون نسخ ولا تقبل الكتابة"""
+    store = CandleStore(capacity=8)
+    store.load('BTCUSDT', '1h', _candles(6))
+    window = store.window('BTCUSDT', '1h', 3)
+    assert not window.close.flags.writeable
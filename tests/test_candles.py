@@ -0,0 +1,40 @@
+import numpy as np
+
+from src.analysis.candles import scan_candlestick_patterns
+from src.analysis.codes import PatternCode
+from src.analysis.ohlcv import OHLCV
+
+
+def _ohlcv(rows):
+    open_, high, low, close = (np.array(column, dtype=float) for column in zip(*rows))
+    return OHLCV(open_, high, low, close, np.ones(len(rows)))
+
+
+# شمعة بظل علوي طويل وجسم صغير قرب القاع
+LONG_UPPER_SHADOW = (10.0, 13.0, 9.95, 10.3)
+
+
+def test_shooting_star_requires_prior_uptrend():
+    """الظل العلوي الطويل بعد صعود نجمة طلاق، وبدونه مطرقة مقلوبة"""
+    rising = _ohlcv([(9, 9.6, 8.9, 9.5), (9.5, 9.9, 9.4, 9.8), (9.8, 10.2, 9.7, 10.1), LONG_UPPER_SHADOW])
+    falling = _ohlcv([(11, 11.1, 10.4, 10.5), (10.5, 10.6, 10.1, 10.2), (10.2, 10.3, 9.9, 10.0), LONG_UPPER_SHADOW])
+
+    rising_masks = scan_candlestick_patterns(rising)
+    assert rising_masks[PatternCode.SHOOTING_STAR][-1]
+    assert not rising_masks[PatternCode.INVERTED_HAMMER][-1]
+
+    falling_masks = scan_candlestick_patterns(falling)
+    assert falling_masks[PatternCode.INVERTED_HAMMER][-1]
+    assert not falling_masks[PatternCode.SHOOTING_STAR][-1]
+
+
+def test_shooting_star_and_inverted_hammer_are_exclusive():
+    """لا تُصنف أي شمعة كالنمطين معاً"""
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.standard_normal(2000))
+    open_ = close + rng.standard_normal(2000) * 0.3
+    high = np.maximum(open_, close) + rng.standard_exponential(2000)
+    low = np.minimum(open_, close) - rng.standard_exponential(2000) * 0.2
+    masks = scan_candlestick_patterns(OHLCV(open_, high, low, close, np.ones(2000)))
+    assert not (masks[PatternCode.SHOOTING_STAR] & masks[PatternCode.INVERTED_HAMMER]).any()
+    assert masks[PatternCode.SHOOTING_STAR].any() and masks[PatternCode.INVERTED_HAMMER].any()
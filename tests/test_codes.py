@@ -0,0 +1,37 @@
+from src.analysis.codes import Direction, PatternCode, Signal, SignalCode, directional_score
+
+
+def test_every_code_has_direction_and_weight():
+    for code in list(PatternCode) + list(SignalCode):
+        assert code.direction in Direction
+        assert code.weight >= 1
+
+
+def test_pattern_directions():
+    assert PatternCode.DOUBLE_BOTTOM.direction == Direction.BULLISH
+    assert PatternCode.HEAD_AND_SHOULDERS.direction == Direction.BEARISH
+    assert PatternCode.DOJI.direction == Direction.NEUTRAL
+
+
+def test_signal_takes_code_direction():
+    signal = Signal(SignalCode.PATTERN_BULLISH, PatternCode.HAMMER)
+    assert signal.direction == Direction.BULLISH
+    assert signal.weight == SignalCode.PATTERN_BULLISH.weight
+    assert Signal(SignalCode.RSI_OVERBOUGHT).pattern is None
+
+
+def test_directional_score():
+    """يجمع أوزان العناصر ذات الاتجاه المطلوب فقط، سواء كانت إشارات أو أنماطاً"""
+    signals = [
+        Signal(SignalCode.RSI_OVERSOLD),
+        Signal(SignalCode.MACD_BULLISH_CROSS),
+        Signal(SignalCode.STOCH_OVERBOUGHT),
+        Signal(SignalCode.BB_ABOVE_UPPER),
+    ]
+    assert directional_score(signals, Direction.BULLISH) == 2
+    assert directional_score(signals, Direction.BEARISH) == 1
+    assert directional_score(signals, Direction.NEUTRAL) == 1
+
+    patterns = [PatternCode.DOUBLE_TOP, PatternCode.EVENING_STAR, PatternCode.HAMMER]
+    assert directional_score(patterns, Direction.BEARISH) == 2
+    assert directional_score([], Direction.BULLISH) == 0
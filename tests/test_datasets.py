@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.qxbroker.datasets import read_candles, read_signals, write_candles, write_signals
+from src.qxbroker.simulator import MarketSimulator
+
+pytest.importorskip('pyarrow')
+
+END = 1_750_000_000
+
+
+def _series():
+    simulator = MarketSimulator(seed=8)
+    return {
+        ('EURUSD', '5m'): simulator.generate('EURUSD', 500, '5m', end=END),
+        ('EURUSD', '1h'): simulator.generate('EURUSD', 200, '1h', end=END),
+        ('BTCUSDT', '5m'): simulator.generate('BTCUSDT', 300, '5m', end=END),
+    }
+
+
+def _assert_same(actual, expected):
+    np.testing.assert_array_equal(actual.timestamp, expected.timestamp)
+    for column in ('open', 'high', 'low', 'close', 'volume'):
+        np.testing.assert_array_equal(getattr(actual, column), getattr(expected, column))
+
+
+@pytest.mark.parametrize('name', ['candles.parquet', 'candles.arrow'])
+def test_candles_round_trip(tmp_path, name):
+    series = _series()
+    path = str(tmp_path / name)
+    assert write_candles(series, path, row_group_size=128) == 1000
+
+    result = read_candles(path)
+    assert sorted(result) == sorted(series)
+    for key, data in series.items():
+        _assert_same(result[key], data)
+
+
+def test_read_candles_filters(tmp_path):
+    """الشروط تُطبق عند القراءة على الزوج والإطار والفترة الزمنية"""
+    series = _series()
+    path = str(tmp_path / 'candles.parquet')
+    write_candles(series, path, row_group_size=128)
+
+    expected = series[('EURUSD', '5m')][-100:]
+    result = read_candles(path, symbols=['EURUSD'], timeframes=['5m'], start=expected.timestamp[0])
+    assert list(result) == [('EURUSD', '5m')]
+    _assert_same(result[('EURUSD', '5m')], expected)
+
+    assert read_candles(path, symbols=['XAUUSD']) == {}
+
+
+def test_signals_round_trip(tmp_path):
+    signals = [
+        {"id": f"s{i}", "الزوج": symbol, "الإطار_الزمني": '1h', "نوع": "شراء", "الاتجاه": "صاعد قوي",
+         "نقطة_الدخول": 1.0 + i, "وقف_الخسارة": 0.9 + i, "الهدف": 1.1 + i, "الهدف_الثاني": 1.2 + i,
+         "نسبة_الثقة": 70 + i, "المؤشرات": "RSI = 55.0", "الأنماط": "نمط المطرقة (Hammer)",
+         "التحليل": "...", "الوقت": f"2025-06-15 1{i}:00:00"}
+        for i, symbol in enumerate(['EURUSD', 'BTCUSDT', 'EURUSD'])
+    ]
+    path = str(tmp_path / 'signals.parquet')
+    assert write_signals(signals, path) == 3
+
+    frame = read_signals(path)
+    assert frame['id'].tolist() == ['s0', 's1', 's2']
+    assert frame['confidence'].tolist() == [70, 71, 72]
+    assert frame['patterns'][0] == "نمط المطرقة (Hammer)"
+
+    frame = read_signals(path, symbols=['EURUSD'], start='2025-06-15 11:00:00')
+    assert frame['id'].tolist() == ['s2']
+    assert frame['time'][0] == pd.Timestamp('2025-06-15 12:00:00')
@@ -0,0 +1,56 @@
+import numpy as np
+
+from src.analysis.codes import PatternCode
+from src.analysis.ohlcv import OHLCV
+from src.analysis.patterns import PatternRecognizer
+from src.analysis.swings import SWING_MIN_THRESHOLD, SwingIndex, SwingIndexStore
+from src.qxbroker.simulator import MarketSimulator
+
+
+def _zigzag(*prices, steps=10):
+    """شموع بمدى ضيق تمر خطياً بالأسعار المحددة بالترتيب"""
+    path = np.concatenate(
+        [np.linspace(a, b, steps, endpoint=False) for a, b in zip(prices[:-1], prices[1:])] + [[prices[-1]]]
+    )
+    return OHLCV(path, path * (1 + 1e-4), path * (1 - 1e-4), path, np.ones(len(path)))
+
+
+def _swings(data):
+    return [(p.kind, round(p.price, 4)) for p in SwingIndex.for_data(data).points]
+
+
+def test_swing_points_alternate_at_threshold():
+    data = _zigzag(110, 100, 106, 100.05, 104)
+    assert SwingIndex.for_data(data).threshold == SWING_MIN_THRESHOLD
+    assert _swings(data) == [(1, 110.011), (-1, 99.99), (1, 106.0106), (-1, 100.04)]
+
+
+def test_incremental_index_matches_full_pass():
+    """تغذية الشموع الجديدة فقط تعطي نفس النقاط كبناء الفهرس من البداية بنفس العتبة"""
+    data = MarketSimulator(seed=9).generate('BTCUSDT', 600, '5m', end=1_750_000_000)
+    store = SwingIndexStore()
+    store.get(data[:400], 'BTCUSDT', '5m')
+    incremental = store.get(data[:600], 'BTCUSDT', '5m')
+
+    full = SwingIndex(incremental.threshold)
+    full.extend(data.high, data.low)
+    assert [(p.index, p.price, p.kind) for p in incremental.points] == \
+           [(p.index, p.price, p.kind) for p in full.points]
+
+
+def test_chart_patterns():
+    recognizer = PatternRecognizer()
+    cases = {
+        PatternCode.DOUBLE_BOTTOM: _zigzag(110, 100, 106, 100.05, 104),
+        PatternCode.DOUBLE_TOP: _zigzag(90, 100, 94, 99.95, 96),
+        PatternCode.HEAD_AND_SHOULDERS: _zigzag(90, 100, 95, 105, 95.05, 100.05, 96),
+        PatternCode.INVERSE_HEAD_AND_SHOULDERS: _zigzag(110, 100, 105, 95, 104.95, 99.95, 104),
+        PatternCode.ASCENDING_TRIANGLE: _zigzag(92, 100, 95, 100.02, 97, 99),
+        PatternCode.DESCENDING_TRIANGLE: _zigzag(108, 95, 100, 95.02, 98, 96),
+    }
+    for expected, data in cases.items():
+        assert expected in recognizer.identify_all_patterns(data), expected.name
+
+
+def test_chart_patterns_need_enough_candles():
+    assert PatternRecognizer().identify_reversal_patterns(_zigzag(110, 100, steps=5)) == []
@@ -0,0 +1,57 @@
+import threading
+
+import numpy as np
+
+from src.qxbroker.price_snapshot import PriceBook
+
+
+def test_update_keeps_positions_and_adds_new_symbols():
+    book = PriceBook()
+    book.update({'BTCUSDT': 65000.0, 'EURUSD': 1.08}, now=10.0)
+    snapshot = book.update({'EURUSD': 1.09, 'XAUUSD': 2300.0}, now=20.0)
+
+    assert snapshot.symbols == ('BTCUSDT', 'EURUSD', 'XAUUSD')
+    assert snapshot.as_dict() == {'BTCUSDT': 65000.0, 'EURUSD': 1.09, 'XAUUSD': 2300.0}
+    np.testing.assert_array_equal(snapshot.updated_at, [10.0, 20.0, 20.0])
+    assert book.get('EURUSD') == 1.09
+    assert book.get('GBPUSD') is None
+
+
+def test_old_snapshot_is_not_modified():
+    """اللقطة السابقة تبقى كما هي بعد التحديث، ولا يمكن الكتابة فيها"""
+    book = PriceBook()
+    before = book.update({'BTCUSDT': 65000.0})
+    book.update({'BTCUSDT': 66000.0})
+
+    assert before.as_dict() == {'BTCUSDT': 65000.0}
+    assert not before.prices.flags.writeable
+
+
+def test_lookup_marks_missing_and_stale_prices():
+    book = PriceBook()
+    book.update({'BTCUSDT': 65000.0}, now=100.0)
+    snapshot = book.update({'EURUSD': 1.08}, now=130.0)
+
+    prices, valid = snapshot.lookup(['EURUSD', 'GBPUSD', 'BTCUSDT'])
+    np.testing.assert_array_equal(valid, [True, False, True])
+    assert np.isnan(prices[1])
+
+    prices, valid = snapshot.lookup(['EURUSD', 'GBPUSD', 'BTCUSDT'], max_age=20.0, now=140.0)
+    np.testing.assert_array_equal(valid, [True, False, False])
+    assert prices[0] == 1.08
+    assert np.isnan(prices[1:]).all()
+
+
+def test_concurrent_updates_keep_every_symbol():
+    book = PriceBook()
+
+    def writer(offset):
+        for i in range(200):
+            book.update({f'S{offset}_{i}': float(i)})
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(book.snapshot()) == 800
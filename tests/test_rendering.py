@@ -0,0 +1,64 @@
+from src.analysis.codes import AnalysisSummary, Direction, PatternCode, Signal, SignalCode, TrendStrength
+from src.analysis.rendering import (
+    NO_PATTERNS_TEXT, SIGNAL_SUMMARY_KEY, render_patterns, render_signal, render_signal_fields, render_trend
+)
+from src.utils.cache import TTLCache
+
+
+def _summary(patterns=(), rsi=55.0, stamp=(1_750_000_000, 300)):
+    return AnalysisSummary(
+        symbol='BTCUSDT',
+        timeframe='1h',
+        candle_stamp=stamp,
+        trend_direction=Direction.BULLISH,
+        trend_level=TrendStrength.STRONG,
+        support_levels=(100.0, 98.5),
+        resistance_levels=(104.0,),
+        pattern_codes=(PatternCode.HAMMER,),
+        detected_patterns=tuple(patterns),
+        signal_codes=(Signal(SignalCode.MACD_BULLISH_CROSS), Signal(SignalCode.PATTERN_BULLISH, PatternCode.HAMMER)),
+        indicators={'rsi': rsi, 'macd': 0.5, 'macd_signal': 0.2, 'macd_hist': 0.3, 'sma_20': 101.0, 'sma_50': 99.0},
+    )
+
+
+def _signal(summary):
+    return {"الزوج": 'BTCUSDT', "نوع": "شراء", SIGNAL_SUMMARY_KEY: summary, "الوقت": "2025-06-15 12:00:00"}
+
+
+def test_summary_is_replaced_in_place():
+    """الملخص يُستبدل بالنصوص في موضعه دون تعديل الإشارة المخزنة"""
+    signal = _signal(_summary([PatternCode.DOUBLE_BOTTOM, PatternCode.HAMMER]))
+    fields = render_signal_fields(signal)
+
+    assert list(fields) == ["الزوج", "نوع", "المؤشرات", "الأنماط", "التحليل", "الوقت"]
+    assert SIGNAL_SUMMARY_KEY in signal
+    assert fields["الأنماط"] == ", ".join(render_patterns([PatternCode.DOUBLE_BOTTOM, PatternCode.HAMMER]))
+    assert fields["المؤشرات"].startswith("RSI = 55.0")
+    assert render_trend(Direction.BULLISH, TrendStrength.STRONG) in fields["التحليل"]
+    assert render_signal(Signal(SignalCode.PATTERN_BULLISH, PatternCode.HAMMER)) in fields["التحليل"]
+
+
+def test_no_patterns_text():
+    assert render_signal_fields(_signal(_summary()))["الأنماط"] == NO_PATTERNS_TEXT
+
+
+def test_signal_without_summary_is_unchanged():
+    signal = {"الزوج": 'BTCUSDT'}
+    assert render_signal_fields(signal) is signal
+    assert render_signal_fields(None) is None
+
+
+def test_texts_are_cached_per_candle():
+    """النصوص تُولد مرة واحدة لكل شمعة، والشمعة الجديدة تولد نصوصاً جديدة"""
+    cache = TTLCache(max_entries=16)
+    first = render_signal_fields(_signal(_summary(rsi=55.0)), cache)
+    same_candle = render_signal_fields(_signal(_summary(rsi=80.0)), cache)
+    next_candle = render_signal_fields(_signal(_summary(rsi=80.0, stamp=(1_750_003_600, 301))), cache)
+
+    assert same_candle["المؤشرات"] == first["المؤشرات"]
+    assert cache.hits == 2
+    assert next_candle["المؤشرات"].startswith("RSI = 80.0 (تشبع شرائي)")
+
+    # بدون وقت الشمعة لا يُحفظ شيء
+    render_signal_fields(_signal(_summary(stamp=None)), cache)
+    assert len(cache) == 4
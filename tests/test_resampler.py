@@ -0,0 +1,60 @@
+import numpy as np
+
+from src.qxbroker.candle_store import CandleStore
+from src.qxbroker.resampler import TimeframeResampler, resample
+from src.qxbroker.simulator import MarketSimulator
+
+END = 1_750_000_123
+
+
+def _pandas_resample(data, rule):
+    frame = data.to_dataframe().set_index('Date')
+    return frame.resample(rule).agg(
+        {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+    ).dropna()
+
+
+def test_resample_matches_pandas():
+    """التجميع المتجه يطابق pandas resample().agg() للفترات المكتملة"""
+    data = MarketSimulator(seed=1).generate('BTCUSDT', 5000, '5m', end=END)
+    result = resample(data, 3600, 300)
+    expected = _pandas_resample(data, '1h')
+    expected = expected.loc[result.timestamp[0]:result.timestamp[-1]]
+
+    assert len(result) == len(expected)
+    np.testing.assert_array_equal(result.timestamp, expected.index.to_numpy().astype('datetime64[ns]'))
+    np.testing.assert_allclose(result.open, expected['Open'])
+    np.testing.assert_allclose(result.high, expected['High'])
+    np.testing.assert_allclose(result.low, expected['Low'])
+    np.testing.assert_allclose(result.close, expected['Close'])
+    np.testing.assert_allclose(result.volume, expected['Volume'])
+
+
+def test_resample_drops_incomplete_periods():
+    """الفترة الأولى والأخيرة تُستبعدان إذا لم تغطهما الشموع الأساسية بالكامل"""
+    # من 997:55 إلى 1000:20 (بالساعات منذ 1970)، فالساعتان 998 و 999 فقط مكتملتان
+    data = MarketSimulator(seed=1).generate('BTCUSDT', 30, '5m', end=3600 * 1000 + 1500)
+    result = resample(data, 3600, 300)
+    np.testing.assert_array_equal(result.timestamp, np.array([3600 * 998, 3600 * 999], dtype='datetime64[s]'))
+
+
+def test_incremental_update_matches_full_derive():
+    """الاشتقاق التدريجي بعد كل شمعة أساسية يطابق الاشتقاق من كامل التاريخ"""
+    data = MarketSimulator(seed=2).generate('EURUSD', 400, '5m', end=END)
+    full = TimeframeResampler(CandleStore(), '5m', ['5m', '15m', '1h'])
+    full.derive('EURUSD', data)
+
+    store = CandleStore()
+    incremental = TimeframeResampler(store, '5m', ['5m', '15m', '1h'])
+    store.load('EURUSD', '5m', data[:100])
+    incremental.derive('EURUSD', data[:100])
+    for i in range(100, len(data)):
+        store.load('EURUSD', '5m', data[i:i + 1])
+        incremental.update('EURUSD')
+
+    for timeframe in ('15m', '1h'):
+        expected = full.store.window('EURUSD', timeframe)
+        actual = store.window('EURUSD', timeframe, len(expected))
+        np.testing.assert_array_equal(actual.timestamp, expected.timestamp)
+        np.testing.assert_allclose(actual.close, expected.close)
+        np.testing.assert_allclose(actual.high, expected.high)
@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+from src.analysis.scheduler import SignalScheduler
+
+
+class _Generator:
+    def __init__(self):
+        self.config = SimpleNamespace(SUPPORTED_PAIRS=['BTCUSDT', 'EURUSD'],
+                                      SUPPORTED_TIMEFRAMES=['5m', '15m', '1h', '4h', '1d'])
+        self.calls = []
+
+    def generate_signal(self, symbol, timeframe, refresh=False, render=True):
+        self.calls.append((symbol, timeframe, refresh))
+
+
+def _scheduler(**kwargs):
+    return SignalScheduler(_Generator(), delay=2.0, **kwargs)
+
+
+def test_due_timeframes_at_shared_boundaries():
+    """الأطر الأعلى تستحق مع الأدنى عند الحدود المشتركة فقط"""
+    scheduler = _scheduler()
+    day = 1_750_000_000 // 86400 * 86400
+    assert scheduler.due_timeframes(day + 300 + 2) == ['5m']
+    assert scheduler.due_timeframes(day + 900 + 2) == ['5m', '15m']
+    assert scheduler.due_timeframes(day + 4 * 3600 + 2) == ['5m', '15m', '1h', '4h']
+    assert scheduler.due_timeframes(day + 2) == ['5m', '15m', '1h', '4h', '1d']
+
+
+def test_next_run_is_next_close_plus_delay():
+    """التشغيل التالي عند أقرب إغلاق شمعة مضافاً إليه التأخير"""
+    scheduler = _scheduler()
+    day = 1_750_000_000 // 86400 * 86400
+    assert scheduler.next_run(day + 10) == day + 300 + 2
+    assert scheduler.next_run(day + 1) == day + 2
+    assert scheduler.next_run(day + 2) == day + 300 + 2
+
+
+def test_run_once_refreshes_due_timeframes_lowest_first():
+    """إعادة الحساب تشمل جميع الأزواج للأطر المحددة، والقائمة الفارغة لا تفعل شيئاً"""
+    scheduler = _scheduler(workers=1)
+    scheduler.run_once(['1h', '5m'])
+    calls = scheduler.signal_generator.calls
+    assert calls == [('BTCUSDT', '5m', True), ('EURUSD', '5m', True),
+                     ('BTCUSDT', '1h', True), ('EURUSD', '1h', True)]
+
+    scheduler.run_once([])
+    assert len(calls) == 4
@@ -0,0 +1,78 @@
+import time
+
+import pytest
+import requests
+
+from src.qxbroker.fake_server import FakeBroker, FakeBrokerSettings
+from src.qxbroker.session import BrokerSession, SessionManager
+
+
+@pytest.fixture
+def broker():
+    broker = FakeBroker(FakeBrokerSettings(latency=0.0, username='user', password='secret', seed=2))
+    broker.run_in_thread()
+    yield broker
+    broker.stop_thread()
+
+
+@pytest.fixture
+def manager(broker):
+    manager = SessionManager(requests.Session(), broker.base_url, 'user', 'secret')
+    yield manager
+    manager.stop()
+
+
+def test_refresh_margin():
+    """التجديد يسبق الانتهاء بعُشر الصلاحية، وبخمس ثوانٍ على الأقل ما لم تكن الصلاحية أقصر من عشر ثوانٍ"""
+    assert BrokerSession('t', 3600, now=0).refresh_at == 3240
+    assert BrokerSession('t', 20, now=0).refresh_at == 15
+    assert BrokerSession('t', 4, now=0).refresh_at == 2
+
+    session = BrokerSession('t', 10, now=100)
+    assert session.headers == {"Authorization": "Bearer t"}
+    assert session.valid(now=109.9)
+    assert not session.valid(now=110)
+
+
+def test_login_in_background(manager):
+    assert manager.current() is None
+    assert manager.headers() == {}
+    assert manager.wait(timeout=5)
+    assert manager.headers()["Authorization"].startswith("Bearer ")
+    assert manager.logins == 1
+    assert manager.stats()['expires_in'] > 3000
+
+
+def test_invalidate_renews_only_the_rejected_token(manager):
+    """رفض رمز قديم لا يُسقط الجلسة الحالية، ورفض الرمز الحالي يجدده في الخلفية"""
+    assert manager.wait(timeout=5)
+    token = manager.current().token
+
+    manager.invalidate('older-token')
+    assert manager.current().token == token
+
+    manager.invalidate(token)
+    assert manager.wait(timeout=5)
+    assert manager.current().token != token
+    assert manager.logins == 2
+
+
+def test_short_tokens_are_renewed_before_expiry(broker, manager):
+    broker.settings.token_ttl = 0.6
+    assert manager.wait(timeout=5)
+
+    deadline = time.monotonic() + 1.5
+    while time.monotonic() < deadline:
+        assert manager.current() is not None
+        time.sleep(0.05)
+    assert manager.logins >= 3
+
+
+def test_failed_login_keeps_retrying(broker):
+    manager = SessionManager(requests.Session(), broker.base_url, 'user', 'wrong')
+    try:
+        assert not manager.wait(timeout=0.3)
+        assert manager.failures >= 1
+        assert manager.current() is None
+    finally:
+        manager.stop()
@@ -0,0 +1,49 @@
+import numpy as np
+
+from src.qxbroker.simulator import SECONDS_PER_YEAR, MarketSimulator, symbol_profile
+
+END = 1_750_000_123
+
+
+def test_candle_at_fixed_time_does_not_depend_on_request():
+    """الشمعة في وقت محدد هي نفسها مهما كان وقت الطلب أو عدد الشموع"""
+    simulator = MarketSimulator(seed=7)
+    for symbol, timeframe in (('BTCUSDT', '5m'), ('EURUSD', '1h')):
+        first = simulator.generate(symbol, 500, timeframe, end=END)
+        later = simulator.generate(symbol, 2000, timeframe, end=END + 300)
+        _, i, j = np.intersect1d(first.timestamp, later.timestamp, return_indices=True)
+        assert len(i) == len(first)
+        for column in ('open', 'high', 'low', 'close', 'volume'):
+            np.testing.assert_array_equal(getattr(first, column)[i], getattr(later, column)[j])
+
+
+def test_realized_volatility_matches_profile():
+    """تقلب الشمعة الواحدة المحقق قريب من التقلب السنوي للزوج"""
+    data = MarketSimulator(seed=7).generate('BTCUSDT', 100000, '1h', end=END)
+    sigma = symbol_profile('BTCUSDT').annual_volatility * np.sqrt(3600 / SECONDS_PER_YEAR)
+    realized = np.diff(np.log(data.close)).std()
+    assert 0.9 < realized / sigma < 1.1
+
+
+def test_candles_are_consistent():
+    """الأعلى والأدنى يحيطان بالافتتاح والإغلاق، والأوقات بلا عطلات للفوركس"""
+    data = MarketSimulator(seed=7).generate('EURUSD', 3000, '1h', end=END)
+    assert (data.high >= np.maximum(data.open, data.close)).all()
+    assert (data.low <= np.minimum(data.open, data.close)).all()
+    weekday = (data.timestamp.astype('datetime64[D]').astype(np.int64) + 3) % 7
+    assert (weekday < 5).all()
+
+
+def test_weekend_blocks_stay_finite(recwarn):
+    """كتل الدقيقة الواقعة كلها في عطلة الأسبوع لا تنتج قسمة على صفر"""
+    data = MarketSimulator(seed=7).generate('EURUSD', 20000, '1m', end=END)
+    assert np.isfinite(data.close).all()
+    assert not [w for w in recwarn if issubclass(w.category, RuntimeWarning)]
+
+
+def test_unseeded_simulator_keeps_one_path():
+    """بدون بذرة تُسحب بذرة واحدة، فتبقى الشموع ثابتة طوال عمر المحاكي"""
+    simulator = MarketSimulator()
+    first = simulator.generate('BTCUSDT', 100, '5m', end=END)
+    again = simulator.generate('BTCUSDT', 100, '5m', end=END)
+    np.testing.assert_array_equal(first.close, again.close)
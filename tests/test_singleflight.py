@@ -0,0 +1,66 @@
+import threading
+import time
+
+from src.utils.singleflight import SingleFlight
+
+
+def _call_concurrently(flights, fn, waiters=4):
+    """
+    طلب أول يبدأ العملية ثم طلبات متزامنة تنتظرها، والعملية تنتهي بعد انضمام الجميع
+
+    Returns:
+        Tuple: النتائج والاستثناءات لكل طلب
+    """
+    started, release = threading.Event(), threading.Event()
+    results, errors = [], []
+
+    def blocking():
+        started.set()
+        release.wait(5)
+        return fn()
+
+    def call():
+        try:
+            results.append(flights.do('key', blocking))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(waiters + 1)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+
+    deadline = time.monotonic() + 5
+    while flights.stats()['shared'] < waiters and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    return results, errors
+
+
+def test_concurrent_calls_share_one_execution():
+    """الطلبات المتزامنة لنفس المفتاح تنفذ العملية مرة واحدة وتتشارك النتيجة"""
+    flights = SingleFlight()
+    calls = []
+    results, errors = _call_concurrently(flights, lambda: calls.append(1) or 42)
+
+    assert calls == [1]
+    assert results == [42] * 5 and not errors
+    assert flights.stats() == {'calls': 1, 'shared': 4, 'in_flight': 0}
+
+
+def test_error_propagates_to_all_waiters():
+    """استثناء العملية يُرفع لدى المنفذ وجميع المنتظرين، ثم يُسمح بتنفيذ جديد"""
+    flights = SingleFlight()
+
+    def fail():
+        raise ValueError("فشل")
+
+    results, errors = _call_concurrently(flights, fail)
+
+    assert not results
+    assert len(errors) == 5 and all(isinstance(e, ValueError) for e in errors)
+    assert not flights.in_flight('key')
+    assert flights.do('key', lambda: 'retry') == 'retry'
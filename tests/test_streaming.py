@@ -0,0 +1,40 @@
+import numpy as np
+
+from src.analysis.streaming import RollingWindow, StreamingIndicatorEngine, StreamingIndicatorSet
+from src.analysis.vectorized import compute_indicator_panel
+from src.qxbroker.simulator import MarketSimulator
+
+
+def test_streaming_matches_panel():
+    """المؤشرات المتدفقة تطابق الحساب المتجه على كامل السلسلة"""
+    data = MarketSimulator(seed=3).generate('XAUUSD', 3000, '5m', end=1_750_000_000)
+    indicators = StreamingIndicatorSet(history=50)
+    for high, low, close in zip(data.high, data.low, data.close):
+        indicators.update(float(high), float(low), float(close))
+
+    panel = compute_indicator_panel(data.high[None], data.low[None], data.close[None])
+    for key, values in indicators.series.items():
+        expected = panel[key][0, -len(values):]
+        np.testing.assert_allclose(list(values), expected, rtol=1e-9, atol=1e-9, err_msg=key)
+
+
+def test_engine_feeds_only_new_candles():
+    """التحديث المتتالي بنوافذ متداخلة يعطي نفس نتيجة التحديث مرة واحدة"""
+    data = MarketSimulator(seed=4).generate('BTCUSDT', 600, '1h', end=1_750_000_000)
+    incremental = StreamingIndicatorEngine()
+    for end in range(300, 601, 50):
+        snapshot = incremental.update('BTCUSDT', '1h', data[end - 300:end])
+    full = StreamingIndicatorEngine().update('BTCUSDT', '1h', data)
+    assert snapshot['RSI']['current'] == full['RSI']['current']
+    assert snapshot['MACD']['current'] == full['MACD']['current']
+
+
+def test_rolling_window_std_with_large_offset():
+    """الانحراف المعياري المتدفق يبقى دقيقاً للأسعار الكبيرة بعد عدد كبير من الإضافات"""
+    values = MarketSimulator(seed=3).generate('BTCUSDT', 20000, '5m', end=1_750_000_000).close + 1e6
+    window = RollingWindow(20)
+    for value in values:
+        window.push(float(value))
+    expected = values[-20:]
+    assert abs(window.mean - expected.mean()) < 1e-6
+    assert abs(window.std - expected.std()) / expected.std() < 1e-9
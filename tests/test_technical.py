@@ -0,0 +1,18 @@
+from src.analysis.technical import TechnicalAnalyzer
+from src.qxbroker.simulator import MarketSimulator
+
+
+def test_streaming_history_counts_for_indicator_warmup():
+    """نافذة قصيرة تكفي إذا غذّت الشموع السابقة الحالة المتدفقة بما يتجاوز فترة الإحماء"""
+    data = MarketSimulator(seed=2).generate('BTCUSDT', 400, '1h', end=1_750_000_000)
+    analyzer = TechnicalAnalyzer()
+
+    first = analyzer.analyze(data[:60], 'BTCUSDT', '1h')
+    assert 'SMA_200' in first.missing_indicators
+
+    for end in range(80, 401, 20):
+        result = analyzer.analyze(data[end - 60:end], 'BTCUSDT', '1h')
+    assert result.missing_indicators == []
+
+    # بدون الزوج والإطار لا توجد حالة متدفقة، فيُحسب الإحماء من طول البيانات
+    assert TechnicalAnalyzer().analyze(data[-60:], 'BTCUSDT', None).missing_indicators == first.missing_indicators
@@ -0,0 +1,95 @@
+import json
+import time
+
+import pytest
+import requests
+
+from src.qxbroker.fake_server import FakeBroker, FakeBrokerSettings
+from src.qxbroker.price_snapshot import PriceBook
+from src.qxbroker.session import SessionManager
+from src.qxbroker.tick_feed import CandleAggregator, ClosedCandle, Tick, TickFeed
+
+START = 1_750_000_200  # بداية شمعة 5 دقائق
+
+
+class _Resampler:
+    base_timeframe = '5m'
+
+
+class _Client:
+    """ما يستخدمه المشترك من QXClient: لقطة الأسعار وإضافة الشموع والجلسة"""
+
+    def __init__(self, base_url='http://127.0.0.1:0', auth=None):
+        self.base_url = base_url
+        self.resampler = _Resampler()
+        self.prices = PriceBook()
+        self.session = requests.Session()
+        self.auth = auth
+        self.added = []
+
+    def add_candle(self, *args):
+        self.added.append(args)
+        return True
+
+
+def test_aggregator_builds_ohlcv_in_place():
+    aggregator = CandleAggregator(300)
+    for offset, price, volume in [(1, 10.0, 1.0), (60, 12.0, 2.0), (120, 9.0, 0.5), (299, 11.0, 1.5)]:
+        assert aggregator.add(Tick('EURUSD', price, START + offset, volume)) == []
+
+    closed = aggregator.add(Tick('EURUSD', 11.5, START + 300))
+    assert closed == [ClosedCandle('EURUSD', START, 10.0, 12.0, 9.0, 11.0, 5.0)]
+
+
+def test_new_period_closes_every_symbol():
+    """أول تحديث من فترة جديدة يُغلق شموع جميع الأزواج، والتحديث المتأخر يُتجاهل"""
+    aggregator = CandleAggregator(300)
+    aggregator.add(Tick('EURUSD', 1.08, START + 10))
+    aggregator.add(Tick('BTCUSDT', 65000.0, START + 20))
+
+    closed = aggregator.add(Tick('EURUSD', 1.09, START + 310))
+    assert sorted(candle.symbol for candle in closed) == ['BTCUSDT', 'EURUSD']
+
+    aggregator.add(Tick('EURUSD', 5.0, START + 100))
+    assert aggregator.add(Tick('EURUSD', 1.1, START + 600))[0].high == 1.09
+
+
+def test_ingest_updates_prices_and_adds_closed_candles():
+    client = _Client()
+    feed = TickFeed(client, symbols=['EURUSD'])
+
+    feed.ingest_line(json.dumps({'symbol': 'EURUSD', 'price': 1.08, 'time': START + 5, 'volume': 2}))
+    feed.ingest_line(json.dumps({'symbol': 'BTCUSDT', 'price': 65000.0, 'time': START + 6}))
+    feed.ingest_line(b'{"symbol": "EURUSD"}')
+    feed.ingest_line(b'')
+    assert client.prices.get('EURUSD') == 1.08
+    assert client.prices.get('BTCUSDT') is None
+    assert feed.ticks == 1
+
+    feed.ingest(Tick('EURUSD', 1.09, START + 300))
+    assert client.added == [('EURUSD', '5m', START * 10 ** 9, 1.08, 1.08, 1.08, 1.08, 2.0)]
+
+
+@pytest.fixture
+def broker():
+    broker = FakeBroker(FakeBrokerSettings(latency=0.0, tick_interval=0.02, seed=3))
+    broker.run_in_thread()
+    yield broker
+    broker.stop_thread()
+
+
+def test_feed_streams_from_broker(broker):
+    auth = SessionManager(requests.Session(), broker.base_url, 'user', 'secret')
+    feed = TickFeed(_Client(broker.base_url, auth), symbols=['EURUSD', 'BTCUSDT'])
+    feed.start()
+    try:
+        deadline = time.monotonic() + 5
+        while feed.ticks < 10 and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        feed.stop()
+        auth.stop()
+
+    assert feed.ticks >= 10
+    assert not feed.running
+    assert set(feed.client.prices.snapshot().symbols) == {'EURUSD', 'BTCUSDT'}
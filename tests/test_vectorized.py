@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from src.analysis.indicators import SERIES_KEYS
+from src.analysis.vectorized import compute_indicator_panel, stack_panel
+from src.qxbroker.simulator import MarketSimulator
+
+END = 1_750_000_000
+
+
+def _series(*symbols, count=400):
+    simulator = MarketSimulator(seed=4)
+    return {(symbol, '1h'): simulator.generate(symbol, count, '1h', end=END) for symbol in symbols}
+
+
+def test_panel_rows_match_single_series():
+    """كل صف في اللوحة يطابق حساب السلسلة وحدها"""
+    frames = _series('BTCUSDT', 'EURUSD', 'XAUUSD')
+    panel, keys = stack_panel(frames)
+    batch = compute_indicator_panel(panel['High'], panel['Low'], panel['Close'])
+    assert set(batch) == set(SERIES_KEYS)
+
+    for row, key in enumerate(keys):
+        data = frames[key]
+        single = compute_indicator_panel(data.high[None], data.low[None], data.close[None])
+        for name, values in batch.items():
+            np.testing.assert_allclose(values[row], single[name][0], rtol=1e-12, err_msg=name)
+
+
+def test_moving_averages_match_pandas():
+    data = _series('BTCUSDT')[('BTCUSDT', '1h')]
+    panel = compute_indicator_panel(data.high[None], data.low[None], data.close[None])
+    close = pd.Series(data.close)
+
+    np.testing.assert_allclose(panel['sma_50'][0, 49:], close.rolling(50).mean().to_numpy()[49:], rtol=1e-10)
+    # المتوسط الأسي مُهيأ بالمتوسط البسيط لأول 20 شمعة
+    seeded = pd.concat([pd.Series([close[:20].mean()]), close[20:]], ignore_index=True)
+    expected = seeded.ewm(span=20, adjust=False).mean().to_numpy()
+    np.testing.assert_allclose(panel['ema_20'][0, 19:], expected, rtol=1e-10)
+
+
+def test_stack_panel_trims_to_shortest_and_skips_missing():
+    frames = _series('BTCUSDT', 'EURUSD')
+    frames[('BTCUSDT', '1h')] = frames[('BTCUSDT', '1h')].tail(300)
+    frames[('XAUUSD', '1h')] = None
+    panel, keys = stack_panel(frames)
+    assert keys == [('BTCUSDT', '1h'), ('EURUSD', '1h')]
+    assert panel['Close'].shape == (2, 300)
+    assert panel['Date'].shape == (2, 300)
+
+
+def test_stack_panel_without_valid_series_is_empty():
+    assert stack_panel({}) == ({}, [])
+    assert stack_panel({('BTCUSDT', '1h'): None, ('EURUSD', '1h'): None}) == ({}, [])